@@ -1,9 +1,40 @@
-import pdfplumber
-from fastapi import FastAPI, UploadFile, File
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
-from fastapi.responses import FileResponse
+import asyncio
+import json
+import os
+from collections import defaultdict
+from typing import AsyncIterator, Dict, List, Literal, Optional, Tuple
+
+from fastapi import FastAPI, UploadFile, File, Query, HTTPException
+from fastapi.responses import Response, StreamingResponse
 from starlette.middleware.cors import CORSMiddleware
-from resume_filter import is_relevant_chunk
+from pdf_extraction import shutdown_pool
+from pipeline import (
+    Enhancement,
+    count_verdict,
+    enhance_lines,
+    extract_candidate_lines,
+    format_output,
+    format_statistics,
+    new_stats,
+    record_result,
+    route_candidates,
+)
+from sections import PASS
+from validation import select_enhancement
+from batch_scheduler import DynamicBatcher
+from jobs import Job, JobManager, JobQueueFull, JobStore, ProgressCallback
+from enhancement_cache import EnhancementCache
+from inference_backends import DECODING_TIERS, INFERENCE_BACKEND, create_backend
+from executors import (
+    INFERENCE_WORKERS,
+    configure_torch_threads,
+    cache_executor,
+    inference_executor,
+    pdf_executor,
+    run_in_executor,
+    shutdown_executors,
+)
+from instrumentation import CACHE_LOOKUPS, CONTENT_TYPE_LATEST, configure_logging, logger, metrics_payload, stage_timer
 
 app = FastAPI()
 
@@ -16,196 +47,329 @@ app.add_middleware(
 )
 
 
-MODEL_DIR = "gramformer_lora"
-tokenizer = AutoTokenizer.from_pretrained(MODEL_DIR)
-model = AutoModelForSeq2SeqLM.from_pretrained(MODEL_DIR)
+configure_logging()
+configure_torch_threads()
+# Engine selected at startup by INFERENCE_BACKEND ("torch" or "onnx")
+backend = create_backend(INFERENCE_BACKEND)
+
+# Cross-request batching: lines queued by concurrent uploads are merged into one batch
+# until BATCH_MAX_SIZE lines are waiting or BATCH_MAX_WAIT_MS has passed
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "16"))
+BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", "10"))
+
+# Enhancement cache: in-memory LRU backed by SQLite (set ENHANCEMENT_CACHE_PATH="" for memory only,
+# ENHANCEMENT_CACHE=0 to disable)
+ENHANCEMENT_CACHE = os.getenv("ENHANCEMENT_CACHE", "1") != "0"
+ENHANCEMENT_CACHE_PATH = os.getenv("ENHANCEMENT_CACHE_PATH", "enhancement_cache.sqlite3")
+CACHE_MEMORY_ENTRIES = int(os.getenv("CACHE_MEMORY_ENTRIES", "4096"))
+CACHE_DISK_ENTRIES = int(os.getenv("CACHE_DISK_ENTRIES", "100000"))
+
+# Job API: resumes processed concurrently, jobs allowed to wait (429 beyond that),
+# and how long finished results stay available
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "32"))
+JOB_RESULT_TTL = float(os.getenv("JOB_RESULT_TTL", "3600"))
+# Job status and results are kept in this SQLite file so that, with several uvicorn
+# workers, a poll reaching any worker finds the job. "" keeps them in process memory,
+# which is only correct with a single worker
+JOB_STORE_PATH = os.getenv("JOB_STORE_PATH", "jobs.sqlite3")
+# Seconds shutdown waits for queued and running jobs before cancelling them
+JOB_DRAIN_TIMEOUT = float(os.getenv("JOB_DRAIN_TIMEOUT", "30"))
+
+
+def run_decoding_batch(items: List[Tuple[str, int]]) -> List[List[str]]:
+    """Runs a scheduler batch of (line, tier) items, one enhance_lines() call per decoding tier."""
+    by_tier = defaultdict(list)
+    for i, (_, tier) in enumerate(items):
+        by_tier[tier].append(i)
+
+    results: List[List[str]] = [[] for _ in items]
+    for tier, indices in by_tier.items():
+        outputs = enhance_lines(backend, [items[i][0] for i in indices], DECODING_TIERS[tier])
+        for i, enhanced in zip(indices, outputs):
+            results[i] = enhanced
+    return results
+
+
+# Shared scheduler in front of the inference backend; every request submits its
+# (line, decoding tier) items here instead of calling generate() itself
+batcher = DynamicBatcher(
+    run_decoding_batch,
+    max_batch_size=BATCH_MAX_SIZE,
+    max_wait_ms=BATCH_MAX_WAIT_MS,
+    executor=inference_executor,
+    max_in_flight=INFERENCE_WORKERS,
+)
+
 
-OUTPUT_TXT = "enhanced_resume_output.txt"
+enhancement_cache = EnhancementCache(
+    ENHANCEMENT_CACHE_PATH or None,
+    fingerprint=backend.fingerprint,
+    generation_params={"tiers": DECODING_TIERS},
+    max_memory_entries=CACHE_MEMORY_ENTRIES,
+    max_disk_entries=CACHE_DISK_ENTRIES,
+) if ENHANCEMENT_CACHE else None
 
 
-def is_valid_enhancement(original: str, enhanced: str) -> bool:
+async def enhance_uncached(line: str) -> Enhancement:
     """
-    Validates if the enhanced text is actually an improvement.
-    Returns False if:
-    - Enhanced is identical or too similar to original
-    - Enhanced contains repetitive patterns
-    - Enhanced is suspiciously short or long
+    Decodes one line with the cheapest tier in DECODING_TIERS first. Every
+    candidate a tier returns is validated and the best valid one is kept; only
+    lines with no valid candidate are re-generated with the next tier. The
+    generate() calls themselves are shared with other lines via the batcher.
+    """
+    result = Enhancement("", False, None, False)
+    for tier in range(len(DECODING_TIERS)):
+        candidates = await asyncio.wrap_future(batcher.submit((line, tier)))
+        with stage_timer("validate"):
+            enhanced, verdict = select_enhancement(line, candidates)
+        result = Enhancement(enhanced, verdict.is_valid, tier, False, verdict.reason)
+        if verdict.is_valid:
+            break
+
+    count_verdict(line, result)
+    return result
+
+
+async def iter_enhancements(lines: List[str]) -> AsyncIterator[Tuple[int, Enhancement]]:
     """
-    original_clean = original.strip().lower()
-    enhanced_clean = enhanced.strip().lower()
-
-    # Check 1: No change or minimal change
-    if original_clean == enhanced_clean:
-        print(f"❌ REJECTED: No change from original")
-        return False
-
-    # Check 2: Enhanced text is just a substring or slightly modified
-    if original_clean in enhanced_clean and len(enhanced_clean) < len(original_clean) * 1.2:
-        print(f"❌ REJECTED: Minimal modification")
-        return False
-
-    # Check 3: Detect repetitive patterns (same phrase repeated)
-    # Split into words and check for consecutive repeated segments
-    words = enhanced_clean.split()
-    if len(words) > 6:
-        # Check for repeated 4+ word phrases (more reliable than 3-word)
-        for i in range(len(words) - 7):
-            phrase = ' '.join(words[i:i+4])
-            rest = ' '.join(words[i+4:])
-            if phrase in rest and len(phrase) > 15:  # Only check substantial phrases
-                print(f"❌ REJECTED: Contains repetition - '{phrase}' appears multiple times")
-                return False
-
-    # Check 4: Detect comma-separated list repetitions (like "CSS, HTML, CSS, HTML")
-    if ',' in enhanced:
-        items = [item.strip().lower() for item in enhanced.split(',')]
-        # Remove "and" from last item if present
-        items = [item.replace(' and ', '').strip() for item in items]
-        # Check for duplicates
-        unique_items = set(items)
-        if len(items) != len(unique_items):
-            # Find the duplicates
-            duplicates = [item for item in items if items.count(item) > 1]
-            if duplicates:
-                print(f"❌ REJECTED: Duplicate items in list: {duplicates[0]}")
-                return False
-
-    # Check 4b: Detect repeated technical terms (words before parentheses)
-    # Look for patterns like "Python (...)" appearing multiple times
-    import re
-    words_split = enhanced_clean.split()
-    words_before_paren = []
-    for i, word in enumerate(words_split):
-        if '(' in word or (i < len(words_split)-1 and words_split[i+1].startswith('(')):
-            clean = word.replace(':', '').replace(',', '').replace('-', '').strip()
-            if clean and not clean.startswith('('):
-                words_before_paren.append(clean)
-    if words_before_paren and len(words_before_paren) != len(set(words_before_paren)):
-        print(f"❌ REJECTED: Repeated technical term before parentheses")
-        return False
-
-    # Check 5: Too short (less than 10 chars) or suspiciously long (>5x original, not 3x)
-    if len(enhanced.strip()) < 10:
-        print(f"❌ REJECTED: Enhanced text too short")
-        return False
-
-    # Be more lenient with length - training data shows good enhancements can be 5-6x longer
-    if len(enhanced) > len(original) * 6:
-        print(f"❌ REJECTED: Enhanced text suspiciously long ({len(enhanced)} vs {len(original)} chars)")
-        return False
-
-    # All checks passed
-    print(f"✅ ACCEPTED: Valid enhancement")
-    return True
-
-
-def enhance_line(text: str):
-    text = text.strip()
-    if not text or len(text) < 15:  # Skip very short lines
-        return ""
-
-    inp = "enhance: " + text
-
-    # Count tokens to detect truncation
-    token_count = len(tokenizer.encode(inp))
-
-    print(f"\n{'='*60}")
-    print(f"INPUT TO MODEL ({token_count} tokens): {inp}")
-    if token_count > 128:
-        print(f"⚠️  WARNING: Input truncated from {token_count} to 128 tokens!")
-    print(f"{'='*60}\n")
-
-    inputs = tokenizer(inp, return_tensors="pt", truncation=True, max_length=128)
-    outputs = model.generate(
-        **inputs,
-        max_length=256,  # Increased to allow longer outputs
-        num_beams=4,
-        early_stopping=True
+    Yields (index, Enhancement) for every line as soon as it is resolved.
+
+    Cache hits come first and skip tokenization and generation; the remaining
+    unique lines are all queued at once so they still share batches, and are
+    yielded in completion order. An empty `enhanced` means the model produced
+    nothing. The new results are written to the cache once, when the request's
+    lines are done (or the client went away), without waiting for the write.
+    """
+    if enhancement_cache is not None:
+        cached = await run_in_executor(cache_executor, enhancement_cache.get_many, lines)
+    else:
+        cached = [None] * len(lines)
+
+    hits = sum(hit is not None for hit in cached)
+    CACHE_LOOKUPS.labels("hit").inc(hits)
+    CACHE_LOOKUPS.labels("miss").inc(len(lines) - hits)
+
+    waiting: Dict[str, List[int]] = defaultdict(list)
+    for index, (line, hit) in enumerate(zip(lines, cached)):
+        if hit is not None:
+            yield index, Enhancement(hit.enhanced, hit.is_valid, None, True)
+        else:
+            waiting[line].append(index)
+
+    async def tagged(line: str):
+        return line, await enhance_uncached(line)
+
+    tasks = [asyncio.ensure_future(tagged(line)) for line in waiting]
+    generated = []
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            line, result = await next_done
+            if result.enhanced:
+                generated.append((line, result.enhanced, result.is_valid))
+            for index in waiting[line]:
+                yield index, result
+    finally:
+        # Client went away mid-stream: stop escalating the remaining lines
+        for task in tasks:
+            task.cancel()
+        if enhancement_cache is not None and generated:
+            cache_executor.submit(enhancement_cache.put_many, generated)
+
+
+def log_statistics(stats: Dict):
+    """One INFO record per resume with the counters of `stats` as fields."""
+    fields = dict(stats)
+    if enhancement_cache is not None:
+        fields["cache_hit_rate"] = round(enhancement_cache.hit_rate(), 3)
+    logger.info("resume statistics", extra=fields)
+
+
+async def process_resume(pdf_bytes: bytes, progress: Optional[ProgressCallback] = None) -> Tuple[List[str], Dict]:
+    """
+    Runs one PDF through extraction -> relevance filter -> section routing ->
+    enhancement -> validation.
+
+    Returns the ORIGINAL/ENHANCED text output (as chunks, statistics last) and the
+    statistics dict. `progress(done, total)` is called as lines are resolved.
+    """
+    stats = new_stats()
+
+    # Extract lines from PDF off the event loop, collecting every relevant line before generating
+    candidates = await run_in_executor(pdf_executor, extract_candidate_lines, pdf_bytes)
+    kept, to_enhance = route_candidates(stats, candidates)
+
+    # Enhance the routed lines of the resume through the cache and the shared batching scheduler
+    results: List[Optional[Enhancement]] = [None] * len(kept)
+    if progress:
+        progress(0, len(to_enhance))
+    done = 0
+    async for index, result in iter_enhancements([kept[i].text for i in to_enhance]):
+        results[to_enhance[index]] = result
+        done += 1
+        if progress:
+            progress(done, len(to_enhance))
+
+    chunks = format_output(stats, kept, results)
+    log_statistics(stats)
+    return chunks, stats
+
+
+def text_attachment(chunks) -> StreamingResponse:
+    return StreamingResponse(
+        iter(chunks),
+        media_type="text/plain",
+        headers={"Content-Disposition": 'attachment; filename="enhanced_resume.txt"'},
     )
-    enhanced = tokenizer.decode(outputs[0], skip_special_tokens=True)
-    print(f"OUTPUT FROM MODEL: {enhanced}\n")
-    return enhanced
 
 
 @app.post("/upload_pdf/")
 async def upload_pdf(file: UploadFile = File(...)):
-    # Save the uploaded file temporarily
-    temp_path = "temp_resume.pdf"
-    with open(temp_path, "wb") as f:
-        f.write(await file.read())
-
-    original_texts = []
-    enhanced_texts = []
-    stats = {"processed": 0, "accepted": 0, "rejected": 0}
-
-    # Extract lines from PDF
-    with pdfplumber.open(temp_path) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text()
-            if text:
-                # Process each line individually from the original text
-                lines = text.splitlines()
-
-                print(f"\n🔍 DEBUG: Found {len(lines)} raw lines from PDF")
-
-                for idx, line in enumerate(lines):
-                    line = line.strip()
-
-                    # Skip empty lines
-                    if not line:
-                        continue
-
-                    # Skip very short lines (likely headers or artifacts)
-                    if len(line) < 15:
-                        continue
-
-                    # Apply relevance filtering
-                    if not is_relevant_chunk(line):
-                        print(f"⏭️  Line {idx+1}: SKIPPED (filtered) - {line[:60]}...")
-                        continue
-
-                    # Now enhance this individual line
-                    enhanced = enhance_line(line)
-                    if enhanced:
-                        stats["processed"] += 1
-                        if is_valid_enhancement(line, enhanced):
-                            stats["accepted"] += 1
-                            original_texts.append(line)
-                            enhanced_texts.append(enhanced)
-                        else:
-                            # Enhancement was rejected, keep original
-                            stats["rejected"] += 1
-                            print(f"⚠️  Keeping original text instead\n")
-                            original_texts.append(line)
-                            enhanced_texts.append(line)  # Use original as fallback
-
-    # Write to TXT file
-    with open(OUTPUT_TXT, "w", encoding="utf-8") as out:
-        for orig, enh in zip(original_texts, enhanced_texts):
-            out.write(f"ORIGINAL: {orig}\n")
-            out.write(f"ENHANCED: {enh}\n\n")
-
-        # Add statistics at the end
-        out.write("\n" + "="*60 + "\n")
-        out.write("ENHANCEMENT STATISTICS\n")
-        out.write("="*60 + "\n")
-        out.write(f"Total lines processed: {stats['processed']}\n")
-        if stats['processed'] > 0:
-            out.write(f"Valid enhancements:    {stats['accepted']} ({stats['accepted']/stats['processed']*100:.1f}%)\n")
-            out.write(f"Rejected (kept orig):  {stats['rejected']} ({stats['rejected']/stats['processed']*100:.1f}%)\n")
-        out.write("="*60 + "\n")
-
-    print("\n" + "="*60)
-    print("ENHANCEMENT STATISTICS")
-    print("="*60)
-    print(f"Total lines processed: {stats['processed']}")
-    if stats['processed'] > 0:
-        print(f"Valid enhancements:    {stats['accepted']} ({stats['accepted']/stats['processed']*100:.1f}%)")
-        print(f"Rejected (kept orig):  {stats['rejected']} ({stats['rejected']/stats['processed']*100:.1f}%)")
-    print("="*60)
-
-    return FileResponse(
-        OUTPUT_TXT,
-        media_type="text/plain",
-        filename="enhanced_resume.txt"
-    )
+    # Everything stays in this request's memory: no shared temp/output files
+    pdf_bytes = await file.read()
+    chunks, _ = await process_resume(pdf_bytes)
+    return text_attachment(chunks)
+
+
+@app.post("/upload_pdf/stream")
+async def upload_pdf_stream(file: UploadFile = File(...),
+                            fmt: Literal["ndjson", "sse"] = Query("ndjson", alias="format")):
+    """
+    Streaming variant of /upload_pdf/: emits one event per ORIGINAL/ENHANCED pair
+    as soon as it is generated, then a final statistics event.
+
+    Events are JSON objects, newline-delimited (`format=ndjson`, default) or as
+    Server-Sent Events (`format=sse`):
+        {"type": "line", "index", "page", "line", "section", "route", "original", "enhanced",
+         "accepted", "tier", "cached"}
+        {"type": "stats", "processed", "accepted", "rejected", "cache_hits", "accepted_by_tier",
+         "passed_through", "dropped", "generations_saved", "lines_merged", "summary"}
+    Lines passed through by the section policy (route "pass") come first.
+    """
+    pdf_bytes = await file.read()
+    candidates = await run_in_executor(pdf_executor, extract_candidate_lines, pdf_bytes)
+
+    def encode(event: Dict) -> str:
+        payload = json.dumps(event, ensure_ascii=False)
+        return f"data: {payload}\n\n" if fmt == "sse" else payload + "\n"
+
+    async def events():
+        stats = new_stats()
+        kept, to_enhance = route_candidates(stats, candidates)
+        for index, candidate in enumerate(kept):
+            if candidate.route == PASS:
+                yield encode({
+                    "type": "line",
+                    "index": index,
+                    "page": candidate.page,
+                    "line": candidate.line,
+                    "section": candidate.section,
+                    "route": candidate.route,
+                    "original": candidate.text,
+                    "enhanced": candidate.text,
+                    "accepted": False,
+                    "tier": None,
+                    "cached": False,
+                })
+
+        async for position, result in iter_enhancements([kept[i].text for i in to_enhance]):
+            if not result.enhanced:
+                continue
+            index = to_enhance[position]
+            candidate = kept[index]
+            enhanced = record_result(stats, result)
+            yield encode({
+                "type": "line",
+                "index": index,
+                "page": candidate.page,
+                "line": candidate.line,
+                "section": candidate.section,
+                "route": candidate.route,
+                "original": candidate.text,
+                "enhanced": enhanced or candidate.text,
+                "accepted": bool(enhanced),
+                "tier": result.tier,
+                "cached": result.from_cache,
+            })
+        log_statistics(stats)
+        yield encode({"type": "stats", **stats, "summary": "\n".join(format_statistics(stats))})
+
+    media_type = "text/event-stream" if fmt == "sse" else "application/x-ndjson"
+    return StreamingResponse(events(), media_type=media_type)
+
+
+async def run_job(pdf_bytes: bytes, progress: ProgressCallback) -> Tuple[str, Dict]:
+    chunks, stats = await process_resume(pdf_bytes, progress)
+    return "".join(chunks), stats
+
+
+job_manager = JobManager(
+    run_job,
+    workers=JOB_WORKERS,
+    max_queued=JOB_QUEUE_SIZE,
+    result_ttl=JOB_RESULT_TTL,
+    store=JobStore(JOB_STORE_PATH) if JOB_STORE_PATH else None,
+)
+
+
+@app.on_event("startup")
+async def start_job_manager():
+    await job_manager.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    # Jobs first: they submit to the batcher, which fails every call once closed
+    await job_manager.stop(drain_timeout=JOB_DRAIN_TIMEOUT)
+    batcher.close()
+    shutdown_executors()
+    shutdown_pool()
+    if enhancement_cache is not None:
+        enhancement_cache.close()
+    if job_manager.store is not None:
+        job_manager.store.close()
+
+
+@app.post("/jobs", status_code=202)
+async def submit_job(file: UploadFile = File(...)):
+    """
+    Queues a PDF for enhancement and returns its job id immediately.
+    Answers 429 when JOB_QUEUE_SIZE jobs are already waiting.
+    """
+    pdf_bytes = await file.read()
+    try:
+        job = job_manager.submit(pdf_bytes)
+    except JobQueueFull:
+        raise HTTPException(status_code=429, detail="Too many queued jobs, retry later",
+                            headers={"Retry-After": "5"})
+    return {"job_id": job.id, "status": job.status,
+            "status_url": f"/jobs/{job.id}", "result_url": f"/jobs/{job.id}/result"}
+
+
+def get_job_or_404(job_id: str) -> Job:
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+    return job
+
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    """Status, progress (lines done/total) and, once finished, the statistics of a job."""
+    return get_job_or_404(job_id).to_dict()
+
+
+@app.get("/jobs/{job_id}/result")
+async def job_result(job_id: str):
+    job = get_job_or_404(job_id)
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=job.error)
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    return text_attachment([job.result])
+
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus scrape endpoint: stage latencies, token counts, cache and validation outcomes."""
+    return Response(metrics_payload(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,153 @@
+import queue
+import threading
+import time
+from concurrent.futures import Executor, Future
+from typing import Callable, Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_STOP = object()
+
+
+class DynamicBatcher(Generic[T, R]):
+    """
+    Collects items submitted from any thread/request into shared batches.
+
+    A single background thread waits for the first queued item, then keeps
+    collecting until either `max_batch_size` items are queued or `max_wait_ms`
+    has elapsed, and hands the whole batch to `run_batch` in one call. Each
+    caller gets a Future resolved with its own result, so lines from several
+    concurrent uploads share one model invocation.
+
+    Args:
+        run_batch: Called with a list of items, must return one result per item (same order).
+        max_batch_size: Upper bound on items passed to a single `run_batch` call.
+        max_wait_ms: How long to hold an incomplete batch open for more items.
+        executor: Optional pool to run batches on. A new batch is only collected once
+            one of `max_in_flight` slots is free, so items keep accumulating while
+            every worker is busy instead of being split into tiny batches.
+        max_in_flight: Number of batches allowed to run on `executor` at once.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[T]], List[R]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 10.0,
+        executor: Optional[Executor] = None,
+        max_in_flight: int = 1,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.run_batch = run_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.executor = executor
+        self.batches_run = 0
+        self.items_run = 0
+
+        self._slots = threading.Semaphore(max(1, max_in_flight))
+        self._stats_lock = threading.Lock()
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._loop, name="dynamic-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, item: T) -> "Future[R]":
+        """Queues a single item and returns a Future for its result."""
+        if self._closed:
+            raise RuntimeError("DynamicBatcher is closed")
+        fut: "Future[R]" = Future()
+        self._queue.put((item, fut))
+        return fut
+
+    def submit_many(self, items: List[T]) -> List["Future[R]"]:
+        """Queues several items, keeping their order within the queue."""
+        return [self.submit(item) for item in items]
+
+    def close(self, timeout: Optional[float] = None):
+        """Stops accepting work, finishes queued items and joins the worker thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _collect(self) -> Tuple[List[Tuple[T, Future]], bool]:
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+
+        batch = [first]
+        stop = False
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                stop = True
+                break
+            batch.append(entry)
+        return batch, stop
+
+    def _loop(self):
+        while True:
+            if self.executor is not None:
+                self._slots.acquire()
+            batch, stop = self._collect()
+            # Skip items whose caller already gave up
+            batch = [(item, fut) for item, fut in batch if fut.set_running_or_notify_cancel()]
+            if batch:
+                self._dispatch(batch)
+            elif self.executor is not None:
+                self._slots.release()
+            if stop:
+                # Drain anything queued before close() so no caller waits forever
+                leftover = []
+                while not self._queue.empty():
+                    entry = self._queue.get_nowait()
+                    if entry is not _STOP and entry[1].set_running_or_notify_cancel():
+                        leftover.append(entry)
+                for start in range(0, len(leftover), self.max_batch_size):
+                    if self.executor is not None:
+                        self._slots.acquire()
+                    self._dispatch(leftover[start:start + self.max_batch_size])
+                return
+
+    def _dispatch(self, batch: List[Tuple[T, Future]]):
+        if self.executor is None:
+            self._run(batch)
+            return
+
+        def run_and_release():
+            try:
+                self._run(batch)
+            finally:
+                self._slots.release()
+
+        self.executor.submit(run_and_release)
+
+    def _run(self, batch: List[Tuple[T, Future]]):
+        items = [item for item, _ in batch]
+        try:
+            results = self.run_batch(items)
+            if len(results) != len(items):
+                raise RuntimeError(f"run_batch returned {len(results)} results for {len(items)} items")
+        except BaseException as exc:
+            for _, fut in batch:
+                fut.set_exception(exc)
+            return
+
+        with self._stats_lock:
+            self.batches_run += 1
+            self.items_run += len(items)
+        for (_, fut), result in zip(batch, results):
+            fut.set_result(result)
+
+
+__all__ = ["DynamicBatcher"]
@@ -0,0 +1,67 @@
+# benchmark_backends.py
+"""
+CPU latency/throughput of each inference backend on data/train.csv sentences.
+
+Latency is measured one line per generate() call (what a single short upload
+sees); throughput with batches of --batch-size lines (what the batching
+scheduler achieves under load).
+
+Usage:
+    python benchmark_backends.py --lines 64
+    python benchmark_backends.py --backends torch onnx --batch-size 16
+"""
+import argparse
+import json
+import time
+
+from inference_backends import BACKENDS, create_backend
+from measurement import percentile
+from training_data import read_sources
+
+
+def bench(name: str, lines, batch_size: int):
+    start = time.perf_counter()
+    backend = create_backend(name)
+    load = time.perf_counter() - start
+
+    backend.enhance(lines[:2], batch_size=2)  # warm-up (graph/session initialisation)
+
+    latencies = []
+    for line in lines:
+        start = time.perf_counter()
+        backend.enhance([line], batch_size=1)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    backend.enhance(lines, batch_size=batch_size)
+    batched = time.perf_counter() - start
+
+    return {
+        "backend": name,
+        "load_seconds": load,
+        "latency_ms_mean": sum(latencies) / len(latencies) * 1000,
+        "latency_ms_p50": percentile(latencies, 50) * 1000,
+        "latency_ms_p95": percentile(latencies, 95) * 1000,
+        "throughput_lines_per_s": len(lines) / batched,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=sorted(BACKENDS), choices=sorted(BACKENDS))
+    parser.add_argument("--lines", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--out", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    lines = read_sources(limit=args.lines)
+    results = [bench(name, lines, args.batch_size) for name in args.backends]
+
+    print(f"\n{'backend':10}{'load s':>10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'lines/s':>12}")
+    for r in results:
+        print(f"{r['backend']:10}{r['load_seconds']:>10.2f}{r['latency_ms_mean']:>10.1f}"
+              f"{r['latency_ms_p50']:>10.1f}{r['latency_ms_p95']:>10.1f}{r['throughput_lines_per_s']:>12.2f}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
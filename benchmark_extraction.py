@@ -0,0 +1,105 @@
+# benchmark_extraction.py
+"""
+Pages/sec of the PDF text-extraction modes (layout, pdfplumber, pdfminer),
+serial and with the page process pool, plus a check that pdfplumber and
+pdfminer yield the same lines, and how many model calls the layout mode's
+merged bullets avoid compared with one call per physical line.
+
+Usage:
+    python benchmark_extraction.py temp_resume.pdf other.pdf --repeat 5
+    python benchmark_extraction.py big_portfolio.pdf --processes 1 4
+"""
+import argparse
+import json
+import time
+
+from pdf_extraction import count_pages, extract_lines, shutdown_pool
+from resume_filter import relevant_chunk_flags
+
+MODES = ("layout", "pdfplumber", "pdfminer")
+
+
+def bench(pdfs, mode: str, processes: int, repeat: int):
+    pages = sum(count_pages(pdf) for pdf in pdfs)
+    # Warm-up: imports, and process start-up when a pool is used
+    for pdf in pdfs:
+        extract_lines(pdf, mode, processes)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for pdf in pdfs:
+            extract_lines(pdf, mode, processes)
+    elapsed = time.perf_counter() - start
+    return {"mode": mode, "processes": processes, "pages": pages * repeat,
+            "seconds": elapsed, "pages_per_s": pages * repeat / elapsed}
+
+
+def compare_lines(pdfs):
+    """Line-level agreement between the modes, per document."""
+    report = []
+    for pdf in pdfs:
+        reference = [(l.page, l.text) for l in extract_lines(pdf, "pdfplumber", processes=1)]
+        candidate = [(l.page, l.text) for l in extract_lines(pdf, "pdfminer", processes=1)]
+        matching = len(set(reference) & set(candidate))
+        report.append({
+            "pdf": pdf,
+            "pdfplumber_lines": len(reference),
+            "pdfminer_lines": len(candidate),
+            "identical": reference == candidate,
+            "matching_lines": matching,
+            "only_pdfplumber": [t for t in reference if t not in set(candidate)][:5],
+            "only_pdfminer": [t for t in candidate if t not in set(reference)][:5],
+        })
+    return report
+
+
+def model_inputs(pdf, mode: str):
+    """Lines that would be sent to the model: the app's length and relevance filters."""
+    lines = [l.text for l in extract_lines(pdf, mode, processes=1) if len(l.text) >= 15]
+    return [text for text, relevant in zip(lines, relevant_chunk_flags(lines)) if relevant]
+
+
+def compare_model_calls(pdfs):
+    """Model calls per document with wrapped lines rebuilt (layout) vs one per physical line (pdfplumber)."""
+    report = []
+    for pdf in pdfs:
+        line_split, layout = len(model_inputs(pdf, "pdfplumber")), len(model_inputs(pdf, "layout"))
+        report.append({"pdf": pdf, "pdfplumber_calls": line_split, "layout_calls": layout,
+                       "calls_avoided": line_split - layout})
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pdfs", nargs="*", default=["temp_resume.pdf"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--out", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    results = [bench(args.pdfs, mode, n, args.repeat) for mode in MODES for n in args.processes]
+    shutdown_pool()
+    agreement = compare_lines(args.pdfs)
+    model_calls = compare_model_calls(args.pdfs)
+
+    print(f"\n{'mode':12}{'processes':>10}{'pages':>8}{'seconds':>10}{'pages/s':>10}")
+    for r in results:
+        print(f"{r['mode']:12}{r['processes']:>10}{r['pages']:>8}{r['seconds']:>10.2f}{r['pages_per_s']:>10.1f}")
+
+    print("\nLine agreement (pdfminer vs pdfplumber):")
+    for a in agreement:
+        status = "identical" if a["identical"] else f"{a['matching_lines']}/{a['pdfplumber_lines']} lines match"
+        print(f"  {a['pdf']}: {status}")
+        for page, text in a["only_pdfplumber"]:
+            print(f"    - pdfplumber only (p{page}): {text[:70]}")
+        for page, text in a["only_pdfminer"]:
+            print(f"    + pdfminer only   (p{page}): {text[:70]}")
+
+    print("\nModel calls (layout items vs physical lines):")
+    for c in model_calls:
+        print(f"  {c['pdf']}: {c['layout_calls']} instead of {c['pdfplumber_calls']} "
+              f"({c['calls_avoided']} avoided)")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"throughput": results, "agreement": agreement, "model_calls": model_calls}, f, indent=2)
@@ -0,0 +1,69 @@
+# benchmark_filtering.py
+"""
+Throughput of the relevance filter: the original per-line is_relevant_chunk
+(reference copy in legacy_reference.py), the precompiled is_relevant_chunk
+and the document-level relevant_chunk_flags, on synthetic resume lines built
+from data/train.csv. Also checks that all three agree line for line.
+
+Usage:
+    python benchmark_filtering.py
+    python benchmark_filtering.py --lines 20000 --repeat 5 --out filtering_bench.json
+"""
+import argparse
+import json
+import time
+
+from resume_filter import filter_resume_text, is_relevant_chunk, relevant_chunk_flags
+from legacy_reference import legacy_filter_resume_text, legacy_is_relevant_chunk, synthetic_resume_lines
+
+
+def bench(name: str, fn, repeat: int, lines):
+    fn(lines)  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(lines)
+    elapsed = (time.perf_counter() - start) / repeat
+    return {"name": name, "seconds": elapsed, "lines_per_s": len(lines) / elapsed}, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    lines = synthetic_resume_lines(args.lines, args.seed)
+    document = "\n".join(lines)
+
+    candidates = [
+        ("legacy is_relevant_chunk", lambda ls: [legacy_is_relevant_chunk(l) for l in ls]),
+        ("is_relevant_chunk", lambda ls: [is_relevant_chunk(l) for l in ls]),
+        ("relevant_chunk_flags", relevant_chunk_flags),
+        ("legacy filter_resume_text", lambda ls: legacy_filter_resume_text(document)),
+        ("filter_resume_text", lambda ls: filter_resume_text(document)),
+    ]
+    rows, outputs = [], {}
+    for name, fn in candidates:
+        row, outputs[name] = bench(name, fn, args.repeat, lines)
+        rows.append(row)
+
+    baseline = {"is_relevant_chunk": rows[0]["seconds"], "filter_resume_text": rows[3]["seconds"]}
+    print(f"{len(lines)} lines, {sum(outputs['relevant_chunk_flags'])} relevant\n")
+    print(f"{'':28}{'lines/s':>14}{'speedup':>10}")
+    for row in rows:
+        base = baseline["filter_resume_text" if "filter_resume_text" in row["name"] else "is_relevant_chunk"]
+        row["speedup"] = base / row["seconds"]
+        print(f"{row['name']:28}{row['lines_per_s']:>14,.0f}{row['speedup']:>9.1f}x")
+
+    matches = {
+        "is_relevant_chunk": outputs["is_relevant_chunk"] == outputs["legacy is_relevant_chunk"],
+        "relevant_chunk_flags": outputs["relevant_chunk_flags"] == outputs["legacy is_relevant_chunk"],
+        "filter_resume_text": outputs["filter_resume_text"] == outputs["legacy filter_resume_text"],
+    }
+    print("\nMatches original behaviour: " + ", ".join(f"{k}={v}" for k, v in matches.items()))
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"lines": len(lines), "results": rows, "matches": matches}, f, indent=2)
@@ -0,0 +1,226 @@
+# benchmark_suite.py
+"""
+Per-stage timings of the enhancement pipeline on synthetic resume PDFs
+(synthetic_resume.py, built from data/train.csv) of several sizes:
+
+    extraction   extract_lines (EXTRACTION_MODE, serial)
+    filtering    filter_resume_text + length/relevance filter + section routing
+    tokenization one tokenizer pass with offsets + segmentation
+    generation   generate() on the tokenized lines (first --generate-lines of them)
+    validation   validate_batch on (line, output) pairs
+    output       ORIGINAL/ENHANCED text written to a file
+
+Tokenization and generation need the model (skipped with --no-model or when
+transformers is not installed); validation then uses data/train.csv targets as
+stand-in outputs. Results are JSON; --compare flags stages that got slower
+than a stored baseline.
+
+Usage:
+    python benchmark_suite.py --out bench.json
+    python benchmark_suite.py --pages 1 4 --no-model --save-baseline bench_baseline.json
+    python benchmark_suite.py --compare bench_baseline.json --tolerance 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from pdf_extraction import EXTRACTION_MODE, extract_lines, extract_page_texts
+from pipeline import MAX_INPUT_TOKENS, TASK_PREFIX
+from resume_filter import filter_resume_text, relevant_chunk_flags
+from sections import ENHANCE, label_sections, route_for
+from synthetic_resume import make_resume_pdf
+from training_data import TRAIN_CSV, read_pairs
+from validation import validate_batch
+
+STAGES = ("extraction", "filtering", "tokenization", "generation", "validation", "output")
+
+
+def timed(fn, repeat: int):
+    """Median wall time of `repeat` calls, and the result of the last one."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def record(results, stage: str, pages: int, items: int, seconds: float):
+    results.append({
+        "stage": stage,
+        "pages": pages,
+        "items": items,
+        "seconds": seconds,
+        "per_item_ms": seconds / items * 1000 if items else 0.0,
+    })
+
+
+def filter_lines(pdf_bytes: bytes, lines):
+    """Mirrors the app: filter_resume_text per page, then length, relevance and section routing."""
+    for text in extract_page_texts(pdf_bytes, processes=1):
+        filter_resume_text(text)
+    texts = [l.text for l in lines]
+    sections = label_sections(texts)
+    kept = [(t, s) for t, s in zip(texts, sections) if len(t) >= 15]
+    flags = relevant_chunk_flags(t for t, _ in kept)
+    return [t for (t, s), relevant in zip(kept, flags) if relevant and route_for(s) == ENHANCE]
+
+
+def load_backend():
+    from inference_backends import INFERENCE_BACKEND, create_backend
+
+    return create_backend(INFERENCE_BACKEND)
+
+
+def tokenize(backend, candidates):
+    from segmentation import segment_line
+
+    inputs = [TASK_PREFIX + c for c in candidates]
+    encoded, offsets = backend.tokenize_with_offsets(inputs)
+    return [
+        segment.input_ids
+        for inp, ids, spans in zip(inputs, encoded, offsets)
+        for segment in segment_line(inp, ids, spans, len(TASK_PREFIX), MAX_INPUT_TOKENS,
+                                    backend.tokenizer.eos_token_id)
+    ]
+
+
+def generate(backend, input_ids, batch_size: int = 8):
+    from inference_backends import GENERATION_KWARGS
+
+    outputs = []
+    for start in range(0, len(input_ids), batch_size):
+        sequences = backend.generate(input_ids[start:start + batch_size], **GENERATION_KWARGS)
+        outputs.extend(backend.decode(sequences))
+    return outputs
+
+
+def write_output(path: str, pairs):
+    with open(path, "w", encoding="utf-8") as out:
+        for orig, enh in pairs:
+            out.write(f"ORIGINAL: {orig}\n")
+            out.write(f"ENHANCED: {enh}\n\n")
+
+
+def run_suite(pages_list, repeat: int, use_model: bool, generate_lines: int, data: str):
+    training_pairs = read_pairs(data)
+    targets = [target for _, target in training_pairs]
+    backend = None
+    skipped = {}
+    if use_model:
+        try:
+            backend = load_backend()
+        except (ImportError, OSError) as exc:
+            skipped = {"tokenization": str(exc), "generation": str(exc)}
+    else:
+        skipped = {"tokenization": "--no-model", "generation": "--no-model"}
+
+    results = []
+    rng = random.Random(0)
+    for pages in pages_list:
+        pdf_bytes = make_resume_pdf(pages, seed=pages, pairs=training_pairs)
+
+        seconds, lines = timed(lambda: extract_lines(pdf_bytes, processes=1), repeat)
+        record(results, "extraction", pages, pages, seconds)
+
+        seconds, candidates = timed(lambda: filter_lines(pdf_bytes, lines), repeat)
+        record(results, "filtering", pages, len(lines), seconds)
+
+        outputs = [rng.choice(targets) for _ in candidates]
+        if backend is not None:
+            seconds, input_ids = timed(lambda: tokenize(backend, candidates), repeat)
+            record(results, "tokenization", pages, len(candidates), seconds)
+
+            sample = input_ids[:generate_lines]
+            seconds, generated = timed(lambda: generate(backend, sample), 1)
+            record(results, "generation", pages, len(sample), seconds)
+            outputs[:len(generated)] = generated
+
+        pairs = list(zip(candidates, outputs))
+        seconds, _ = timed(lambda: validate_batch(pairs), repeat)
+        record(results, "validation", pages, len(pairs), seconds)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "enhanced_resume_output.txt")
+            seconds, _ = timed(lambda: write_output(path, pairs), repeat)
+        record(results, "output", pages, len(pairs), seconds)
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "extraction_mode": EXTRACTION_MODE,
+            "pages": list(pages_list),
+            "repeat": repeat,
+            "skipped": skipped,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerance: float):
+    """Rows (stage, pages, baseline_s, current_s, ratio, regressed) for results present in both runs."""
+    base = {(r["stage"], r["pages"]): r for r in baseline["results"]}
+    rows = []
+    for r in current["results"]:
+        b = base.get((r["stage"], r["pages"]))
+        if b is None:
+            continue
+        # Compare per item so runs over a different number of lines stay comparable
+        key = "per_item_ms" if r["items"] and b["items"] else "seconds"
+        ratio = r[key] / b[key] if b[key] else 1.0
+        rows.append({"stage": r["stage"], "pages": r["pages"], "baseline": b[key], "current": r[key],
+                     "metric": key, "ratio": ratio, "regressed": ratio > 1 + tolerance})
+    return rows
+
+
+def print_results(report):
+    print(f"{'stage':14}{'pages':>6}{'items':>7}{'seconds':>11}{'ms/item':>10}")
+    for r in report["results"]:
+        print(f"{r['stage']:14}{r['pages']:>6}{r['items']:>7}{r['seconds']:>11.4f}{r['per_item_ms']:>10.3f}")
+    for stage, reason in report["meta"]["skipped"].items():
+        print(f"{stage:14} skipped ({reason})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 3, 8], help="synthetic resume sizes")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--no-model", action="store_true", help="skip tokenization and generation")
+    parser.add_argument("--generate-lines", type=int, default=16, help="lines per size sent to generate()")
+    parser.add_argument("--data", default=TRAIN_CSV)
+    parser.add_argument("--out", help="write the results as JSON")
+    parser.add_argument("--save-baseline", help="write the results as a baseline for --compare")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before flagging (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    report = run_suite(args.pages, args.repeat, not args.no_model, args.generate_lines, args.data)
+    print_results(report)
+
+    for path in filter(None, (args.out, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.tolerance)
+        report["comparison"] = rows
+        print(f"\nAgainst {args.compare} (tolerance {args.tolerance:.0%}):")
+        for row in rows:
+            flag = "REGRESSION" if row["regressed"] else "ok"
+            print(f"  {row['stage']:14}{row['pages']:>4}p  {row['ratio']:>6.2f}x  {flag}")
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+        if any(row["regressed"] for row in rows):
+            sys.exit(1)
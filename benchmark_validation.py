@@ -0,0 +1,84 @@
+# benchmark_validation.py
+"""
+How validation time scales with output length: validation.py against the
+original quadratic validator (the reference copy in legacy_reference.py).
+
+Inputs are repetition-free outputs of N words (no early rejection), i.e. the
+worst case for the old check 3, which rebuilt and searched the rest of the
+text for every word. Also times validate_batch over data/train.csv targets.
+
+Usage:
+    python benchmark_validation.py
+    python benchmark_validation.py --words 50 200 800 3200 --repeat 5 --out validation_bench.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import time
+
+from legacy_reference import legacy_is_valid_enhancement
+from training_data import TRAIN_CSV, read_pairs
+from validation import is_valid_enhancement, validate_batch
+
+
+def make_output(num_words: int) -> str:
+    # Distinct words, no commas or parentheses: every check runs to completion
+    return " ".join(f"achievement{i}" for i in range(num_words))
+
+
+def time_per_call(fn, original: str, enhanced: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(original, enhanced)
+    return (time.perf_counter() - start) / repeat
+
+
+def bench_scaling(word_counts, repeat: int):
+    rows = []
+    for n in word_counts:
+        enhanced = make_output(n)
+        original = enhanced[: len(enhanced) // 2]  # keeps the length check from rejecting
+        # The legacy validator prints a verdict per call; don't time the terminal
+        with contextlib.redirect_stdout(io.StringIO()):
+            legacy = time_per_call(legacy_is_valid_enhancement, original, enhanced, repeat)
+        current = time_per_call(is_valid_enhancement, original, enhanced, repeat)
+        rows.append({"words": n, "legacy_ms": legacy * 1000, "current_ms": current * 1000,
+                     "speedup": legacy / max(current, 1e-12)})
+    return rows
+
+
+def bench_dataset(data: str, limit: int):
+    pairs = read_pairs(data, limit)
+    start = time.perf_counter()
+    results = validate_batch(pairs)
+    elapsed = time.perf_counter() - start
+    return {"pairs": len(pairs), "seconds": elapsed,
+            "pairs_per_s": len(pairs) / elapsed if elapsed else 0.0,
+            "accepted": sum(r.is_valid for r in results)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, nargs="+", default=[25, 50, 100, 200, 400, 800, 1600])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--data", default=TRAIN_CSV)
+    parser.add_argument("--limit", type=int, default=0, help="only use the first N training pairs (0 = all)")
+    parser.add_argument("--out", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    results = {"scaling": bench_scaling(args.words, args.repeat)}
+    print(f"{'words':>8}{'legacy (ms)':>14}{'current (ms)':>14}{'speedup':>10}")
+    for row in results["scaling"]:
+        print(f"{row['words']:>8}{row['legacy_ms']:>14.3f}{row['current_ms']:>14.3f}{row['speedup']:>9.1f}x")
+
+    if os.path.exists(args.data):
+        results["dataset"] = bench_dataset(args.data, args.limit)
+        d = results["dataset"]
+        print(f"\nvalidate_batch on {args.data}: {d['pairs']} pairs in {d['seconds'] * 1000:.1f} ms "
+              f"({d['pairs_per_s']:.0f} pairs/s, {d['accepted']} accepted)")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
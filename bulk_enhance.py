@@ -0,0 +1,238 @@
+# bulk_enhance.py
+"""
+Offline enhancement of many resumes across worker processes.
+
+Takes PDF files, directories (searched recursively) or list files (one PDF
+path per line, relative to the list file) and runs each resume through the
+same pipeline as the API (extraction -> relevance filter -> section routing
+-> tiered generation -> validation). Every worker process loads the model
+once and handles one resume at a time.
+
+Each resume's ORIGINAL/ENHANCED output is written under OUT/results/,
+mirroring the input tree, and one JSON record per resume is appended to
+OUT/manifest.jsonl as soon as it finishes. Running the same command again
+skips the resumes the manifest already records as done (and whose output
+still exists), so an interrupted run picks up where it stopped; failed
+resumes are retried.
+
+Usage:
+    python bulk_enhance.py resumes/ --out enhanced/ --workers 4
+    python bulk_enhance.py batch1.txt batch2.txt --out enhanced/ --workers 2 --threads 4
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from multiprocessing import get_context
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+MANIFEST_NAME = "manifest.jsonl"
+RESULTS_DIR = "results"
+
+
+class Task(NamedTuple):
+    pdf: str  # absolute path of the resume
+    output: str  # where its ORIGINAL/ENHANCED text goes
+
+
+def discover_pdfs(sources: Iterable[str]) -> List[str]:
+    """Absolute paths of every PDF named by `sources`, deduplicated, in a stable order."""
+    found = []
+    for source in sources:
+        if os.path.isdir(source):
+            for root, dirs, files in os.walk(source):
+                dirs.sort()
+                found.extend(os.path.join(root, f) for f in sorted(files) if f.lower().endswith(".pdf"))
+        elif source.lower().endswith(".pdf"):
+            found.append(source)
+        else:
+            base = os.path.dirname(os.path.abspath(source))
+            with open(source, encoding="utf-8") as listing:
+                for line in listing:
+                    line = line.strip()
+                    if line and not line.startswith("#"):
+                        found.append(os.path.join(base, line))
+    return list(dict.fromkeys(os.path.abspath(path) for path in found))
+
+
+def plan_tasks(pdfs: Sequence[str], out_dir: str) -> List[Task]:
+    """Output paths mirror the PDFs' layout below their common directory."""
+    if not pdfs:
+        return []
+    root = os.path.commonpath([os.path.dirname(path) for path in pdfs])
+    results = os.path.join(os.path.abspath(out_dir), RESULTS_DIR)
+    return [
+        Task(path, os.path.join(results, os.path.splitext(os.path.relpath(path, root))[0] + ".txt"))
+        for path in pdfs
+    ]
+
+
+def load_manifest(path: str) -> Dict[str, Dict]:
+    """Latest record per PDF path; a line cut short by an interrupted write is ignored."""
+    records = {}
+    if not os.path.exists(path):
+        return records
+    with open(path, encoding="utf-8") as manifest:
+        for line in manifest:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records[record["path"]] = record
+    return records
+
+
+def pending_tasks(tasks: Sequence[Task], records: Dict[str, Dict]) -> List[Task]:
+    """Tasks not yet recorded as done, or whose output has since gone missing."""
+    return [
+        task for task in tasks
+        if records.get(task.pdf, {}).get("status") != "done" or not os.path.exists(task.output)
+    ]
+
+
+# --- worker side ---
+
+_backend = None
+
+
+def init_worker(threads: int):
+    """Loads the model once per worker process, with `threads` intra-op threads."""
+    global _backend
+    from inference_backends import INFERENCE_BACKEND, create_backend
+    from instrumentation import configure_logging
+
+    configure_logging()
+    if INFERENCE_BACKEND == "onnx":
+        _backend = create_backend(INFERENCE_BACKEND, num_threads=threads)
+    else:
+        import torch
+
+        torch.set_num_threads(threads)
+        _backend = create_backend(INFERENCE_BACKEND)
+
+
+def write_atomically(path: str, text: str):
+    """Writes via a temporary file so an interrupted run never leaves a partial result behind."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as out:
+        out.write(text)
+    os.replace(tmp, path)
+
+
+def process_task(task: Task) -> Dict:
+    """Enhances one resume and returns its manifest record; failures are recorded, not raised."""
+    from pipeline import process_resume
+
+    start = time.perf_counter()
+    try:
+        # Pages are extracted serially: the resumes themselves are already spread over processes
+        chunks, stats = process_resume(_backend, task.pdf, processes=1)
+        write_atomically(task.output, "".join(chunks))
+    except Exception as exc:  # noqa: BLE001 - one bad PDF must not stop the run
+        return {"path": task.pdf, "output": task.output, "status": "failed",
+                "error": f"{type(exc).__name__}: {exc}", "seconds": time.perf_counter() - start}
+    return {"path": task.pdf, "output": task.output, "status": "done",
+            "lines": stats["processed"] + stats["passed_through"], "stats": stats,
+            "seconds": time.perf_counter() - start}
+
+
+# --- driver side ---
+
+def run_bulk(
+    tasks: Sequence[Task],
+    manifest_path: str,
+    workers: int,
+    threads: int,
+    process: Callable[[Task], Dict] = process_task,
+    initializer: Optional[Callable] = init_worker,
+    progress: Optional[Callable[[int, int, Dict], None]] = None,
+) -> List[Dict]:
+    """
+    Runs `process` over `tasks` on `workers` spawned processes (inline when
+    workers == 1), appending each record to the manifest as it arrives.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(manifest_path)), exist_ok=True)
+    records = []
+    with open(manifest_path, "a+", encoding="utf-8") as manifest:
+        # Start on a fresh line if the previous run was killed mid-record
+        if manifest.tell():
+            manifest.seek(manifest.tell() - 1)
+            if manifest.read(1) != "\n":
+                manifest.write("\n")
+
+        def save(record: Dict):
+            manifest.write(json.dumps(record, ensure_ascii=False) + "\n")
+            manifest.flush()
+            records.append(record)
+            if progress:
+                progress(len(records), len(tasks), record)
+
+        if workers == 1:
+            if initializer is not None:
+                initializer(threads)
+            for task in tasks:
+                save(process(task))
+        else:
+            init_args = (initializer, (threads,)) if initializer is not None else (None, ())
+            with get_context("spawn").Pool(workers, *init_args) as pool:
+                for record in pool.imap_unordered(process, tasks):
+                    save(record)
+    return records
+
+
+def summarize(records: Sequence[Dict], elapsed: float, skipped: int) -> Dict:
+    done = [r for r in records if r["status"] == "done"]
+    lines = sum(r["lines"] for r in done)
+    return {
+        "files": len(records),
+        "done": len(done),
+        "failed": len(records) - len(done),
+        "skipped": skipped,
+        "lines": lines,
+        "seconds": elapsed,
+        "files_per_second": len(done) / elapsed if elapsed else 0.0,
+        "lines_per_second": lines / elapsed if elapsed else 0.0,
+        "mean_seconds_per_file": sum(r["seconds"] for r in done) / len(done) if done else 0.0,
+    }
+
+
+def print_progress(count: int, total: int, record: Dict):
+    name = os.path.basename(record["path"])
+    if record["status"] == "done":
+        detail = f"{record['lines']} lines, {record['seconds']:.1f}s"
+    else:
+        detail = f"FAILED {record['error']}"
+    print(f"[{count}/{total}] {name}: {detail}", flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sources", nargs="+", help="PDF files, directories or list files of PDF paths")
+    parser.add_argument("--out", required=True, help="output directory (results/ and manifest.jsonl)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes, each with its own model")
+    parser.add_argument("--threads", type=int, help="intra-op threads per worker (default: cores / workers)")
+    parser.add_argument("--manifest", help=f"progress manifest (default: OUT/{MANIFEST_NAME})")
+    args = parser.parse_args()
+
+    threads = args.threads or max(1, (os.cpu_count() or 1) // args.workers)
+    manifest_path = args.manifest or os.path.join(args.out, MANIFEST_NAME)
+
+    tasks = plan_tasks(discover_pdfs(args.sources), args.out)
+    todo = pending_tasks(tasks, load_manifest(manifest_path))
+    skipped = len(tasks) - len(todo)
+    print(f"{len(tasks)} resumes, {skipped} already done, {len(todo)} to process "
+          f"on {args.workers} worker(s) x {threads} thread(s)")
+
+    start = time.perf_counter()
+    records = run_bulk(todo, manifest_path, args.workers, threads, progress=print_progress)
+    summary = summarize(records, time.perf_counter() - start, skipped)
+
+    print(f"\nProcessed {summary['done']} resumes ({summary['failed']} failed, {summary['skipped']} skipped) "
+          f"in {summary['seconds']:.1f}s")
+    print(f"Throughput: {summary['files_per_second']:.2f} resumes/s, {summary['lines_per_second']:.1f} lines/s "
+          f"({summary['mean_seconds_per_file']:.1f}s per resume per worker)")
+    print(f"Manifest: {manifest_path}")
+    if summary["failed"]:
+        sys.exit(1)
@@ -0,0 +1,123 @@
+# compare_quantization.py
+"""
+Compares fp32 and dynamic-int8 inference of the enhancement model on the
+`source` column of data/train.csv.
+
+Each mode runs in its own subprocess so peak RSS is measured independently.
+Reported per mode: model load time, latency per line (mean/p50/p95), peak RSS
+and the is_valid_enhancement acceptance rate; plus how often both modes
+produced exactly the same text.
+
+Usage:
+    python compare_quantization.py                 # all lines
+    python compare_quantization.py --limit 200 --out quantization_report.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from measurement import peak_rss_mb, percentile
+from training_data import TRAIN_CSV, read_sources
+
+MODES = ("fp32", "int8")
+
+
+def run_worker(mode: str, data: str, limit: int, out_path: str):
+    import torch
+
+    from model_loading import MODEL_DIR, load_model, load_tokenizer
+    from validation import is_valid_enhancement
+
+    lines = read_sources(data, limit)
+
+    start = time.perf_counter()
+    tokenizer = load_tokenizer(MODEL_DIR)
+    model = load_model(MODEL_DIR, quantize=(mode == "int8"))
+    load_time = time.perf_counter() - start
+
+    latencies, outputs, accepted = [], [], 0
+    for line in lines:
+        inputs = tokenizer("enhance: " + line, return_tensors="pt", truncation=True, max_length=128)
+        start = time.perf_counter()
+        with torch.no_grad():
+            out = model.generate(**inputs, max_length=256, num_beams=4, early_stopping=True)
+        latencies.append(time.perf_counter() - start)
+        enhanced = tokenizer.decode(out[0], skip_special_tokens=True)
+        outputs.append(enhanced)
+        accepted += is_valid_enhancement(line, enhanced)
+
+    report = {
+        "mode": mode,
+        "lines": len(lines),
+        "load_seconds": load_time,
+        "latency_ms_mean": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+        "latency_ms_p50": percentile(latencies, 50) * 1000,
+        "latency_ms_p95": percentile(latencies, 95) * 1000,
+        "peak_rss_mb": peak_rss_mb(),
+        "acceptance_rate": accepted / len(lines) if lines else 0.0,
+        "outputs": outputs,
+    }
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(report, f)
+
+
+def compare(data: str, limit: int):
+    reports = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in MODES:
+            out_path = os.path.join(tmp, f"{mode}.json")
+            print(f"Running {mode} ...")
+            subprocess.run(
+                [sys.executable, __file__, "--worker", mode, "--data", data, "--limit", str(limit), "--worker-out", out_path],
+                check=True,
+            )
+            with open(out_path, encoding="utf-8") as f:
+                reports[mode] = json.load(f)
+
+    fp32, int8 = reports["fp32"]["outputs"], reports["int8"]["outputs"]
+    identical = sum(a == b for a, b in zip(fp32, int8))
+
+    print("\n" + "=" * 72)
+    print("FP32 vs INT8 DYNAMIC QUANTIZATION")
+    print("=" * 72)
+    print(f"{'':24}{'fp32':>16}{'int8':>16}")
+    rows = [
+        ("Load time (s)", "load_seconds", "{:.2f}"),
+        ("Latency mean (ms/line)", "latency_ms_mean", "{:.1f}"),
+        ("Latency p50 (ms/line)", "latency_ms_p50", "{:.1f}"),
+        ("Latency p95 (ms/line)", "latency_ms_p95", "{:.1f}"),
+        ("Peak RSS (MB)", "peak_rss_mb", "{:.0f}"),
+        ("Acceptance rate", "acceptance_rate", "{:.1%}"),
+    ]
+    for label, key, fmt in rows:
+        print(f"{label:24}{fmt.format(reports['fp32'][key]):>16}{fmt.format(reports['int8'][key]):>16}")
+    speedup = reports["fp32"]["latency_ms_mean"] / max(reports["int8"]["latency_ms_mean"], 1e-9)
+    print(f"\nSpeedup: {speedup:.2f}x   Identical outputs: {identical}/{len(fp32)}")
+    print("=" * 72)
+
+    summary = {mode: {k: v for k, v in r.items() if k != "outputs"} for mode, r in reports.items()}
+    summary["identical_outputs"] = identical
+    summary["speedup"] = speedup
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default=TRAIN_CSV)
+    parser.add_argument("--limit", type=int, default=0, help="only use the first N lines (0 = all)")
+    parser.add_argument("--out", help="also write the summary as JSON")
+    parser.add_argument("--worker", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--worker-out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.data, args.limit, args.worker_out)
+    else:
+        result = compare(args.data, args.limit)
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2)
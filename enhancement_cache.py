@@ -0,0 +1,216 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional
+
+from instrumentation import logger
+from validation import VALIDATOR_VERSION
+
+
+class CachedEnhancement(NamedTuple):
+    enhanced: str
+    is_valid: bool
+
+
+def normalize_line(text: str) -> str:
+    """Collapses whitespace so re-extracted copies of the same bullet share a cache entry."""
+    return " ".join(text.split())
+
+
+def model_fingerprint(model_dir: str) -> str:
+    """
+    Hashes the weights and configs at the top level of `model_dir` (checkpoint
+    sub-folders are ignored), so retraining or swapping the adapter
+    automatically invalidates every cached output.
+    """
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(model_dir)):
+        path = os.path.join(model_dir, name)
+        if not os.path.isfile(path) or not name.endswith((".json", ".safetensors", ".bin", ".model")):
+            continue
+        digest.update(name.encode("utf-8"))
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+class EnhancementCache:
+    """
+    Two-tier cache of model outputs: an in-memory LRU in front of a SQLite table.
+
+    Entries are keyed by the normalized input line together with the model
+    fingerprint, generation parameters and validator version, and store both
+    the decoded output and its `is_valid_enhancement` verdict, so a hit needs
+    neither the tokenizer nor the model. Both tiers evict least-recently-used
+    entries once they exceed their size limit; the SQLite tier is only checked
+    every max_disk_entries/100 writes, so it can briefly hold ~1% more rows.
+
+    Args:
+        db_path: SQLite file for the persistent tier, or None for memory only.
+        fingerprint: Identifies the model/adapter weights (see `model_fingerprint`).
+        generation_params: The kwargs passed to generate(); part of every key.
+        max_memory_entries: Size of the in-memory LRU.
+        max_disk_entries: Row limit of the SQLite tier.
+        validator_version: Version of the validation rules behind the stored
+            verdicts (see validation.VALIDATOR_VERSION); part of every key.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str],
+        fingerprint: str,
+        generation_params: Dict,
+        max_memory_entries: int = 4096,
+        max_disk_entries: int = 100_000,
+        validator_version: int = VALIDATOR_VERSION,
+    ):
+        self.namespace = f"{fingerprint}:{json.dumps(generation_params, sort_keys=True)}:v{validator_version}"
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        # Counting the table on every put is a full scan; trim it every so many writes instead
+        self._evict_every = max(1, max_disk_entries // 100)
+        self._writes_since_evict = 0
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "disk_errors": 0}
+
+        self._memory: "OrderedDict[str, CachedEnhancement]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            # Several uvicorn workers share the file: wait for each other's writes like JobStore does
+            self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS enhancements ("
+                "key TEXT PRIMARY KEY, enhanced TEXT NOT NULL, is_valid INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS enhancements_last_used ON enhancements(last_used)")
+            self._db.commit()
+
+    def key(self, line: str) -> str:
+        return hashlib.sha256((self.namespace + "\n" + normalize_line(line)).encode("utf-8")).hexdigest()
+
+    def get(self, line: str) -> Optional[CachedEnhancement]:
+        return self.get_many([line])[0]
+
+    def get_many(self, lines: List[str]) -> List[Optional[CachedEnhancement]]:
+        """
+        Looks up several lines at once; returns None for every miss. Blocking
+        (SQLite), so the app calls it on the cache executor. If the disk tier
+        fails (e.g. the file stays locked by another worker past the busy
+        timeout), the lines not found in memory are treated as misses.
+        """
+        keys = [self.key(line) for line in lines]
+        results: List[Optional[CachedEnhancement]] = [None] * len(keys)
+        with self._lock:
+            on_disk = []
+            for i, key in enumerate(keys):
+                entry = self._memory.get(key)
+                if entry is not None:
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    results[i] = entry
+                else:
+                    on_disk.append(i)
+
+            if self._db is not None and on_disk:
+                try:
+                    touched = []
+                    for i in on_disk:
+                        row = self._db.execute(
+                            "SELECT enhanced, is_valid FROM enhancements WHERE key = ?", (keys[i],)
+                        ).fetchone()
+                        if row is not None:
+                            results[i] = CachedEnhancement(row[0], bool(row[1]))
+                            touched.append(keys[i])
+                    now = time.time()
+                    self._db.executemany("UPDATE enhancements SET last_used = ? WHERE key = ?",
+                                         [(now, key) for key in touched])
+                    self._db.commit()
+                except sqlite3.Error as exc:
+                    self._disk_failed("read", exc)
+                    for i in on_disk:
+                        results[i] = None
+                for i in on_disk:
+                    if results[i] is not None:
+                        self._remember(keys[i], results[i])
+                        self.stats["disk_hits"] += 1
+
+            self.stats["misses"] += sum(entry is None for entry in results)
+        return results
+
+    def put(self, line: str, enhanced: str, is_valid: bool):
+        self.put_many([(line, enhanced, is_valid)])
+
+    def put_many(self, entries: List[tuple]):
+        """
+        Stores (line, enhanced, is_valid) tuples in both tiers, with one SQLite
+        transaction for all of them. Blocking, like get_many; a failed disk
+        write is logged and skipped, the entries stay in memory.
+        """
+        if not entries:
+            return
+        with self._lock:
+            rows = []
+            now = time.time()
+            for line, enhanced, is_valid in entries:
+                key = self.key(line)
+                self._remember(key, CachedEnhancement(enhanced, bool(is_valid)))
+                rows.append((key, enhanced, int(bool(is_valid)), now))
+            if self._db is None:
+                return
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO enhancements (key, enhanced, is_valid, last_used) VALUES (?, ?, ?, ?)", rows
+                )
+                self._writes_since_evict += len(rows)
+                if self._writes_since_evict >= self._evict_every:
+                    self._evict_disk()
+                    self._writes_since_evict = 0
+                self._db.commit()
+            except sqlite3.Error as exc:
+                self._disk_failed("write", exc)
+
+    def hit_rate(self) -> float:
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, key: str, entry: CachedEnhancement):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _disk_failed(self, operation: str, exc: sqlite3.Error):
+        self.stats["disk_errors"] += 1
+        logger.warning("enhancement cache disk %s failed", operation, extra={"error": str(exc)})
+        try:
+            self._db.rollback()
+        except sqlite3.Error:
+            pass
+
+    def _evict_disk(self):
+        (count,) = self._db.execute("SELECT COUNT(*) FROM enhancements").fetchone()
+        excess = count - self.max_disk_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM enhancements WHERE key IN "
+                "(SELECT key FROM enhancements ORDER BY last_used ASC LIMIT ?)",
+                (excess,),
+            )
+            self.stats["evictions"] += excess
+
+
+__all__ = ["CachedEnhancement", "EnhancementCache", "model_fingerprint", "normalize_line"]
@@ -0,0 +1,226 @@
+# evaluate_checkpoints.py
+"""
+Scores every checkpoint of the LoRA adapter on a held-out split of
+data/train.csv, to choose which one to serve.
+
+Checkpoints are the checkpoint-* folders train_gramformer.py leaves in
+MODEL_DIR plus the final adapter in MODEL_DIR itself. Each runs in its own
+subprocess (so load time, latency and peak RSS are measured independently)
+and generates for the split in fixed-size batches, loaded the way the server
+loads an adapter. Reported per checkpoint:
+
+    accept      is_valid_enhancement acceptance rate
+    rouge_l     ROUGE-L F1 of the output against the `target` column
+    out_words   mean output length in words
+    ms/line     CPU generation time per line, lines/s, p95 batch latency
+    rss_mb      peak resident memory, and the model load time
+
+Checkpoints whose adapter weights are byte-identical (the final adapter is
+usually a copy of the last checkpoint) are evaluated once.
+
+The split is chosen by a hash of each source sentence, so it is stable as the
+CSV grows. The table also counts how many of its sentences appear in the
+training CSV: scores on sentences the adapter was trained on are optimistic.
+
+Usage:
+    python evaluate_checkpoints.py
+    python evaluate_checkpoints.py --eval-fraction 0.2 --batch-size 16 --threads 4 --out checkpoint_eval.json
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Sequence, Tuple
+
+from measurement import peak_rss_mb, percentile
+from model_loading import MODEL_DIR
+from training_data import TRAIN_CSV, file_digest, read_pairs
+
+TRAINING_CSV = "data/overall_ds.csv"
+ADAPTER_WEIGHTS = "adapter_model.safetensors"
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def find_checkpoints(model_dir: str = MODEL_DIR) -> List[Tuple[str, str]]:
+    """(name, path) of each checkpoint-N folder by step, then the final adapter as "final"."""
+    found = []
+    for name in os.listdir(model_dir):
+        path = os.path.join(model_dir, name)
+        step = name[len("checkpoint-"):]
+        if name.startswith("checkpoint-") and step.isdigit() and os.path.isfile(os.path.join(path, ADAPTER_WEIGHTS)):
+            found.append((int(step), name, path))
+    checkpoints = [(name, path) for _, name, path in sorted(found)]
+    if os.path.isfile(os.path.join(model_dir, ADAPTER_WEIGHTS)):
+        checkpoints.append(("final", model_dir))
+    return checkpoints
+
+
+def in_eval_split(source: str, fraction: float) -> bool:
+    """Deterministic per-sentence split: the same sentence always lands on the same side."""
+    bucket = int(hashlib.sha1(source.strip().lower().encode("utf-8")).hexdigest()[:8], 16) % 10000
+    return bucket < fraction * 10000
+
+
+def eval_split(pairs: Sequence[Tuple[str, str]], fraction: float) -> List[Tuple[str, str]]:
+    return [(source, target) for source, target in pairs if in_eval_split(source, fraction)]
+
+
+def read_training_sources(path: str = TRAINING_CSV) -> set:
+    """Source sentences of the CSV train_gramformer.py trains on (empty if it is missing)."""
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="ISO-8859-1") as f:
+        return {row["Input (Raw Sentence)"].strip() for row in csv.DictReader(f) if row.get("Input (Raw Sentence)")}
+
+
+def rouge_l(candidate: str, reference: str) -> float:
+    """ROUGE-L F1 over lowercased words: longest common subsequence against both lengths."""
+    cand = _WORD_RE.findall(candidate.lower())
+    ref = _WORD_RE.findall(reference.lower())
+    if not cand or not ref:
+        return 0.0
+    prev = [0] * (len(ref) + 1)
+    for word in cand:
+        row = [0]
+        for j, ref_word in enumerate(ref):
+            row.append(prev[j] + 1 if word == ref_word else max(prev[j + 1], row[j]))
+        prev = row
+    lcs = prev[-1]
+    if lcs == 0:
+        return 0.0
+    precision, recall = lcs / len(cand), lcs / len(ref)
+    return 2 * precision * recall / (precision + recall)
+
+
+def score(pairs: Sequence[Tuple[str, str]], outputs: Sequence[str]) -> Dict:
+    """Quality columns of the table for `outputs` generated from the sources of `pairs`."""
+    from validation import is_valid_enhancement
+
+    n = len(outputs)
+    return {
+        "acceptance_rate": sum(is_valid_enhancement(s, o) for (s, _), o in zip(pairs, outputs)) / n if n else 0.0,
+        "rouge_l": sum(rouge_l(o, t) for (_, t), o in zip(pairs, outputs)) / n if n else 0.0,
+        "mean_output_words": sum(len(o.split()) for o in outputs) / n if n else 0.0,
+    }
+
+
+def run_worker(path: str, pairs: List[Tuple[str, str]], batch_size: int, threads: int, out_path: str):
+    import torch
+    from transformers import AutoModelForSeq2SeqLM
+
+    from inference_backends import GENERATION_KWARGS, InferenceBackend
+    from model_loading import load_tokenizer
+
+    torch.set_num_threads(threads)
+    start = time.perf_counter()
+    # This checkpoint's adapter as load_model serves one, never a merged export (of another checkpoint)
+    model = AutoModelForSeq2SeqLM.from_pretrained(path).eval()
+    backend = InferenceBackend(load_tokenizer(path), model, path)
+    load_time = time.perf_counter() - start
+
+    sources = [source for source, _ in pairs]
+    outputs, batch_seconds = [], []
+    for begin in range(0, len(sources), batch_size):
+        batch = sources[begin:begin + batch_size]
+        start = time.perf_counter()
+        with torch.no_grad():
+            outputs.extend(backend.enhance(batch, batch_size=batch_size, **GENERATION_KWARGS))
+        batch_seconds.append(time.perf_counter() - start)
+
+    total = sum(batch_seconds)
+    report = {
+        "lines": len(sources),
+        "load_seconds": load_time,
+        "ms_per_line": total / len(sources) * 1000 if sources else 0.0,
+        "lines_per_second": len(sources) / total if total else 0.0,
+        "batch_ms_p95": percentile(batch_seconds, 95) * 1000,
+        "mean_output_tokens": sum(len(ids) for ids in backend.tokenize(outputs)) / len(outputs) if outputs else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+        **score(pairs, outputs),
+        "outputs": outputs,
+    }
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(report, f)
+
+
+def evaluate(checkpoints: Sequence[Tuple[str, str]], pairs: List[Tuple[str, str]], batch_size: int, threads: int,
+             data: str, fraction: float) -> Dict[str, Dict]:
+    reports: Dict[str, Dict] = {}
+    evaluated: Dict[str, str] = {}  # adapter weights digest -> checkpoint that was run
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, path in checkpoints:
+            digest = file_digest(os.path.join(path, ADAPTER_WEIGHTS))
+            if digest in evaluated:
+                print(f"{name}: same weights as {evaluated[digest]}, reusing its results")
+                reports[name] = {**reports[evaluated[digest]], "same_as": evaluated[digest]}
+                continue
+            out_path = os.path.join(tmp, f"{name}.json")
+            print(f"Evaluating {name} ({path}) on {len(pairs)} lines ...")
+            subprocess.run(
+                [sys.executable, __file__, "--worker", path, "--worker-out", out_path, "--data", data,
+                 "--eval-fraction", str(fraction), "--batch-size", str(batch_size), "--threads", str(threads)],
+                check=True,
+            )
+            with open(out_path, encoding="utf-8") as f:
+                reports[name] = json.load(f)
+            evaluated[digest] = name
+    return reports
+
+
+def print_table(reports: Dict[str, Dict], seen_in_training: int):
+    columns = [
+        ("accept", "acceptance_rate", "{:.1%}"),
+        ("rouge_l", "rouge_l", "{:.3f}"),
+        ("out_words", "mean_output_words", "{:.1f}"),
+        ("out_tok", "mean_output_tokens", "{:.1f}"),
+        ("ms/line", "ms_per_line", "{:.1f}"),
+        ("lines/s", "lines_per_second", "{:.2f}"),
+        ("p95 batch", "batch_ms_p95", "{:.0f}"),
+        ("rss_mb", "peak_rss_mb", "{:.0f}"),
+        ("load_s", "load_seconds", "{:.1f}"),
+    ]
+    lines = next(iter(reports.values()))["lines"] if reports else 0
+    print("\n" + "=" * 110)
+    print(f"CHECKPOINT EVALUATION ({lines} held-out lines, {seen_in_training} of them seen in training)")
+    print("=" * 110)
+    print(f"{'checkpoint':18}" + "".join(f"{label:>11}" for label, _, _ in columns))
+    for name, report in reports.items():
+        row = "".join(f"{fmt.format(report[key]):>11}" for _, key, fmt in columns)
+        note = f"  (= {report['same_as']})" if "same_as" in report else ""
+        print(f"{name:18}{row}{note}")
+    print("=" * 110)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-dir", default=MODEL_DIR, help="adapter directory holding the checkpoint-* folders")
+    parser.add_argument("--data", default=TRAIN_CSV)
+    parser.add_argument("--eval-fraction", type=float, default=0.1, help="share of sentences in the held-out split")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 1, help="torch intra-op threads")
+    parser.add_argument("--out", help="also write the per-checkpoint results as JSON")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    pairs = eval_split(read_pairs(args.data), args.eval_fraction)
+    if args.worker:
+        run_worker(args.worker, pairs, args.batch_size, args.threads, args.worker_out)
+    else:
+        training_sources = read_training_sources()
+        seen = sum(source in training_sources for source, _ in pairs)
+        reports = evaluate(find_checkpoints(args.model_dir), pairs, args.batch_size, args.threads,
+                           args.data, args.eval_fraction)
+        print_table(reports, seen)
+        if args.out:
+            summary = {name: {k: v for k, v in r.items() if k != "outputs"} for name, r in reports.items()}
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump({"eval_fraction": args.eval_fraction, "seen_in_training": seen, "checkpoints": summary},
+                          f, indent=2)
@@ -0,0 +1,58 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+R = TypeVar("R")
+
+# Threads that run model.generate; each running batch uses TORCH_NUM_THREADS intra-op threads
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "1"))
+# uvicorn worker processes sharing the machine. uvicorn takes its --workers default from
+# WEB_CONCURRENCY, so `WEB_CONCURRENCY=4 uvicorn app:app` gives each worker a quarter of the cores
+SERVER_WORKERS = int(os.getenv("WEB_CONCURRENCY", "1"))
+TORCH_NUM_THREADS = int(os.getenv(
+    "TORCH_NUM_THREADS", str(max(1, (os.cpu_count() or 1) // (INFERENCE_WORKERS * SERVER_WORKERS)))
+))
+
+# Threads for pdfplumber parsing, kept apart so uploads never queue behind inference
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "2"))
+
+inference_executor = ThreadPoolExecutor(max_workers=INFERENCE_WORKERS, thread_name_prefix="inference")
+pdf_executor = ThreadPoolExecutor(max_workers=PDF_WORKERS, thread_name_prefix="pdf")
+# One thread for enhancement cache I/O (SQLite), which must not block the event loop
+cache_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache")
+
+
+def configure_torch_threads():
+    """Bounds torch's intra-op pool so concurrent inference workers don't oversubscribe the cores."""
+    import torch
+
+    torch.set_num_threads(TORCH_NUM_THREADS)
+
+
+async def run_in_executor(executor: ThreadPoolExecutor, fn: Callable[..., R], *args, **kwargs) -> R:
+    """Awaits a blocking call on `executor` without stalling the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+
+def shutdown_executors():
+    inference_executor.shutdown(wait=True)
+    pdf_executor.shutdown(wait=True)
+    # Last: waits for the cache writes of the final requests
+    cache_executor.shutdown(wait=True)
+
+
+__all__ = [
+    "INFERENCE_WORKERS",
+    "SERVER_WORKERS",
+    "TORCH_NUM_THREADS",
+    "PDF_WORKERS",
+    "cache_executor",
+    "inference_executor",
+    "pdf_executor",
+    "configure_torch_threads",
+    "run_in_executor",
+    "shutdown_executors",
+]
@@ -0,0 +1,114 @@
+# export_merged_model.py
+"""
+Folds the LoRA adapter in gramformer_lora/ into the t5-small base weights and
+writes a self-contained artifact (config, tokenizer, model.safetensors) that
+model_loading.load_merged_model() memory-maps at startup.
+
+Usage:
+    python export_merged_model.py                      # float32, verify on 32 lines
+    python export_merged_model.py --dtype bfloat16     # half-size artifact
+    python export_merged_model.py --verify 0           # skip the parity check
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import torch
+from safetensors.torch import save_file
+
+from enhancement_cache import model_fingerprint
+from model_loading import (
+    ARTIFACT_INFO,
+    MERGED_MODEL_DIR,
+    MERGED_WEIGHTS,
+    MODEL_DIR,
+    load_adapter_model,
+    load_merged_model,
+    load_tokenizer,
+)
+from training_data import TRAIN_CSV, read_sources
+
+# Parameters that alias `shared.weight` in T5 and are re-tied after loading
+TIED_KEYS = ("encoder.embed_tokens.weight", "decoder.embed_tokens.weight", "lm_head.weight")
+
+
+def export(model_dir: str, out_dir: str, dtype: str):
+    model = load_adapter_model(model_dir).merge_and_unload()
+    model = model.to(getattr(torch, dtype))
+
+    state = model.state_dict()
+    if model.config.tie_word_embeddings:
+        drop = TIED_KEYS
+    else:
+        drop = TIED_KEYS[:2]
+    state = {k: v.contiguous() for k, v in state.items() if k not in drop}
+
+    os.makedirs(out_dir, exist_ok=True)
+    save_file(state, os.path.join(out_dir, MERGED_WEIGHTS), metadata={"format": "pt"})
+    model.config.save_pretrained(out_dir)
+    model.generation_config.save_pretrained(out_dir)
+    load_tokenizer(model_dir).save_pretrained(out_dir)
+
+    source = model_fingerprint(model_dir)
+    fingerprint = hashlib.sha256(f"{source}:merged:{dtype}".encode("utf-8")).hexdigest()[:16]
+    with open(os.path.join(out_dir, ARTIFACT_INFO), "w", encoding="utf-8") as f:
+        json.dump({"source": model_dir, "source_fingerprint": source, "dtype": dtype, "fingerprint": fingerprint}, f, indent=2)
+
+    size_mb = os.path.getsize(os.path.join(out_dir, MERGED_WEIGHTS)) / 1e6
+    print(f"Wrote {out_dir}/{MERGED_WEIGHTS} ({size_mb:.1f} MB, {dtype})")
+
+
+def generate_all(model, tokenizer, lines):
+    outputs = []
+    elapsed = 0.0
+    for line in lines:
+        inputs = tokenizer("enhance: " + line.strip(), return_tensors="pt", truncation=True, max_length=128)
+        start = time.perf_counter()
+        with torch.no_grad():
+            out = model.generate(**inputs, max_length=256, num_beams=4, early_stopping=True)
+        elapsed += time.perf_counter() - start
+        outputs.append(tokenizer.decode(out[0], skip_special_tokens=True))
+    return outputs, elapsed
+
+
+def verify(model_dir: str, out_dir: str, lines):
+    """Generates with the unmerged adapter and the merged artifact and compares outputs."""
+    tokenizer = load_tokenizer(model_dir)
+
+    start = time.perf_counter()
+    unmerged = load_adapter_model(model_dir)
+    unmerged_load = time.perf_counter() - start
+    start = time.perf_counter()
+    merged = load_merged_model(out_dir)
+    merged_load = time.perf_counter() - start
+
+    expected, unmerged_time = generate_all(unmerged, tokenizer, lines)
+    actual, merged_time = generate_all(merged, tokenizer, lines)
+
+    mismatches = [(line, e, a) for line, e, a in zip(lines, expected, actual) if e != a]
+    print(f"Load time:       unmerged {unmerged_load:.2f}s  merged {merged_load:.2f}s")
+    print(f"Generate time:   unmerged {unmerged_time / len(lines) * 1000:.1f} ms/line  "
+          f"merged {merged_time / len(lines) * 1000:.1f} ms/line")
+    print(f"Identical outputs: {len(lines) - len(mismatches)}/{len(lines)}")
+    for line, e, a in mismatches[:5]:
+        print(f"  INPUT:    {line}\n  UNMERGED: {e}\n  MERGED:   {a}")
+    return not mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-dir", default=MODEL_DIR)
+    parser.add_argument("--out-dir", default=MERGED_MODEL_DIR)
+    parser.add_argument("--dtype", default="float32", choices=["float32", "bfloat16", "float16"])
+    parser.add_argument("--verify", type=int, default=32, metavar="N",
+                        help="compare outputs on the first N lines of data/train.csv (0 to skip)")
+    parser.add_argument("--data", default=TRAIN_CSV)
+    args = parser.parse_args()
+
+    export(args.model_dir, args.out_dir, args.dtype)
+    if args.verify:
+        ok = verify(args.model_dir, args.out_dir, read_sources(args.data, args.verify))
+        if not ok and args.dtype == "float32":
+            raise SystemExit("Merged float32 artifact does not reproduce the adapter outputs")
@@ -0,0 +1,50 @@
+# export_onnx.py
+"""
+Exports the gramformer_lora model to ONNX for the "onnx" inference backend.
+
+The adapter is merged into t5-small first, then optimum writes the encoder and
+decoder graphs, with past key/value inputs for the decoder, plus config and
+tokenizer files to gramformer_onnx/.
+
+Usage:
+    python export_onnx.py
+    INFERENCE_BACKEND=onnx uvicorn app:app
+"""
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+
+from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+from enhancement_cache import model_fingerprint
+from inference_backends import ONNX_MODEL_DIR
+from model_loading import ARTIFACT_INFO, MODEL_DIR, load_adapter_model, load_tokenizer
+
+
+def export(model_dir: str, out_dir: str):
+    tokenizer = load_tokenizer(model_dir)
+    with tempfile.TemporaryDirectory() as merged_dir:
+        load_adapter_model(model_dir).merge_and_unload().save_pretrained(merged_dir)
+        tokenizer.save_pretrained(merged_dir)
+        ort_model = ORTModelForSeq2SeqLM.from_pretrained(merged_dir, export=True, use_cache=True)
+
+    ort_model.save_pretrained(out_dir)
+    tokenizer.save_pretrained(out_dir)
+
+    source = model_fingerprint(model_dir)
+    fingerprint = hashlib.sha256(f"{source}:onnx".encode("utf-8")).hexdigest()[:16]
+    with open(os.path.join(out_dir, ARTIFACT_INFO), "w", encoding="utf-8") as f:
+        json.dump({"source": model_dir, "source_fingerprint": source, "format": "onnx", "fingerprint": fingerprint}, f, indent=2)
+
+    graphs = sorted(name for name in os.listdir(out_dir) if name.endswith(".onnx"))
+    print(f"Wrote {out_dir}: {', '.join(graphs)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-dir", default=MODEL_DIR)
+    parser.add_argument("--out-dir", default=ONNX_MODEL_DIR)
+    args = parser.parse_args()
+    export(args.model_dir, args.out_dir)
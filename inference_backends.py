@@ -0,0 +1,148 @@
+import json
+import os
+from typing import List, Optional, Tuple
+
+from model_loading import ARTIFACT_INFO, MODEL_DIR, load_model, load_tokenizer, serving_fingerprint
+
+# Which engine runs generate(): "torch" (transformers) or "onnx" (ONNX Runtime)
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "torch")
+
+# Written by export_onnx.py: encoder + decoder graphs with past key/value inputs
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", "gramformer_onnx")
+
+# Full-quality decoding settings (the last decoding tier)
+GENERATION_KWARGS = {
+    "max_length": 256,  # Increased to allow longer outputs
+    "num_beams": 4,
+    "early_stopping": True,
+}
+
+# Adaptive decoding: every line starts on the first tier and only lines whose output
+# is rejected by is_valid_enhancement move on to the next, more expensive one.
+# Override with a JSON list of generate() kwargs, e.g. DECODING_TIERS='[{"max_length": 256, "num_beams": 4}]'
+# Beam tiers return every hypothesis (num_return_sequences) so the validator can pick
+# the best valid one instead of discarding the search when the top beam is rejected.
+DECODING_TIERS = json.loads(os.getenv("DECODING_TIERS", "null")) or [
+    {"max_length": 256, "num_beams": 1},
+    {**GENERATION_KWARGS, "num_return_sequences": GENERATION_KWARGS["num_beams"]},
+]
+
+
+class InferenceBackend:
+    """
+    The enhancement step as three calls: tokenize, generate, decode.
+
+    Subclasses only provide `self.model`, which must support the transformers
+    `generate()` API; batching, padding and decoding are shared so every engine
+    sees exactly the same inputs.
+    """
+
+    name = "base"
+
+    def __init__(self, tokenizer, model, fingerprint: str):
+        self.tokenizer = tokenizer
+        self.model = model
+        self.fingerprint = fingerprint
+
+    def tokenize(self, texts: List[str]) -> List[List[int]]:
+        """Token ids per text (with </s>, no padding or truncation)."""
+        return self.tokenizer(texts)["input_ids"]
+
+    def tokenize_with_offsets(self, texts: List[str]) -> Tuple[List[List[int]], List[List[Tuple[int, int]]]]:
+        """Token ids per text plus each token's (start, end) character span; needs a fast tokenizer."""
+        encoded = self.tokenizer(texts, return_offsets_mapping=True)
+        return encoded["input_ids"], encoded["offset_mapping"]
+
+    def generate(self, input_ids: List[List[int]], **generation_kwargs):
+        """Pads one batch of token id lists and runs generate() on it."""
+        batch = self.tokenizer.pad({"input_ids": input_ids}, return_tensors="pt")
+        return self.model.generate(**batch, **generation_kwargs)
+
+    def decode(self, sequences) -> List[str]:
+        return self.tokenizer.batch_decode(sequences, skip_special_tokens=True)
+
+    def count_tokens(self, sequences) -> List[int]:
+        """Non-padding tokens of each generated sequence."""
+        return (sequences != self.tokenizer.pad_token_id).sum(-1).tolist()
+
+    def enhance(self, texts: List[str], batch_size: int = 8, max_input_tokens: int = 128, **generation_kwargs) -> List[str]:
+        """Plain tokenize -> generate -> decode over `texts` in fixed-size batches (for tools and tests)."""
+        generation_kwargs = {**GENERATION_KWARGS, **generation_kwargs}
+        results = []
+        for start in range(0, len(texts), batch_size):
+            chunk = ["enhance: " + text.strip() for text in texts[start:start + batch_size]]
+            input_ids = self.tokenizer(chunk, truncation=True, max_length=max_input_tokens)["input_ids"]
+            results.extend(self.decode(self.generate(input_ids, **generation_kwargs)))
+        return results
+
+
+class TorchBackend(InferenceBackend):
+    """transformers/PyTorch generation, using whatever `load_model` resolves (merged, adapter, int8)."""
+
+    name = "torch"
+
+    def __init__(self, model_dir: str = MODEL_DIR, quantize: Optional[bool] = None):
+        super().__init__(
+            load_tokenizer(model_dir),
+            load_model(model_dir, quantize=quantize),
+            serving_fingerprint(model_dir, quantize=quantize),
+        )
+
+
+class OnnxBackend(InferenceBackend):
+    """
+    ONNX Runtime generation through optimum's ORTModelForSeq2SeqLM, which runs
+    the exported encoder and the KV-cached decoder graphs under the same
+    beam-search code as the torch backend.
+    """
+
+    name = "onnx"
+
+    def __init__(self, onnx_dir: str = ONNX_MODEL_DIR, num_threads: Optional[int] = None):
+        import onnxruntime
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+        if not os.path.isdir(onnx_dir):
+            raise FileNotFoundError(f"{onnx_dir} not found - run `python export_onnx.py` first")
+
+        if num_threads is None:
+            # Same per-worker intra-op budget the torch backend gets
+            from executors import TORCH_NUM_THREADS as num_threads
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = num_threads
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        model = ORTModelForSeq2SeqLM.from_pretrained(
+            onnx_dir, use_cache=True, provider="CPUExecutionProvider", session_options=options
+        )
+        with open(os.path.join(onnx_dir, ARTIFACT_INFO), encoding="utf-8") as f:
+            fingerprint = json.load(f)["fingerprint"]
+        super().__init__(load_tokenizer(onnx_dir), model, fingerprint)
+
+
+BACKENDS = {
+    TorchBackend.name: TorchBackend,
+    OnnxBackend.name: OnnxBackend,
+}
+
+
+def create_backend(name: str = INFERENCE_BACKEND, **kwargs) -> InferenceBackend:
+    """Instantiates the backend selected by name (see INFERENCE_BACKEND)."""
+    try:
+        backend_cls = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown inference backend {name!r}; choose one of {sorted(BACKENDS)}") from None
+    return backend_cls(**kwargs)
+
+
+__all__ = [
+    "DECODING_TIERS",
+    "GENERATION_KWARGS",
+    "INFERENCE_BACKEND",
+    "ONNX_MODEL_DIR",
+    "InferenceBackend",
+    "OnnxBackend",
+    "TorchBackend",
+    "create_backend",
+]
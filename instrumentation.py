@@ -0,0 +1,166 @@
+import json
+import logging
+import os
+import time
+
+try:
+    from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+except ImportError:  # tools and tests that import the pipeline without the server's dependencies
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+    REGISTRY = None
+
+    class _NullMetric:
+        """Accepts every Counter/Histogram call and records nothing."""
+
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def labels(self, *args, **kwargs):
+            return self
+
+        def inc(self, amount=1):
+            pass
+
+        def observe(self, amount):
+            pass
+
+    Counter = Histogram = _NullMetric
+
+# Per-line detail (model inputs/outputs, skipped lines, verdicts) is logged at DEBUG,
+# so it costs nothing unless LOG_LEVEL=DEBUG; one summary per resume is logged at INFO
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# "json" (one object per line, extra fields included) or "text"
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+
+logger = logging.getLogger("resume_enhancer")
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, event and any `extra` fields."""
+
+    _STANDARD = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+    def format(self, record: logging.LogRecord) -> str:
+        event = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+        }
+        event.update({k: v for k, v in vars(record).items() if k not in self._STANDARD})
+        if record.exc_info:
+            event["exc"] = self.formatException(record.exc_info)
+        return json.dumps(event, ensure_ascii=False, default=str)
+
+
+def configure_logging(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT):
+    handler = logging.StreamHandler()
+    if fmt == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logger.handlers[:] = [handler]
+    logger.setLevel(level.upper())
+    logger.propagate = False
+
+
+def debug_enabled() -> bool:
+    """Guard for per-line log calls whose arguments are costly to build."""
+    return logger.isEnabledFor(logging.DEBUG)
+
+
+# --- Prometheus metrics ---
+
+STAGES = ("extract", "filter", "tokenize", "generate", "validate")
+
+STAGE_SECONDS = Histogram(
+    "resume_stage_seconds",
+    "Wall time per call of a pipeline stage",
+    ["stage"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+INPUT_TOKENS = Histogram(
+    "resume_input_tokens",
+    "Tokens per model input (after segmentation)",
+    buckets=(8, 16, 32, 48, 64, 96, 128),
+)
+OUTPUT_TOKENS = Histogram(
+    "resume_output_tokens",
+    "Tokens per generated sequence",
+    buckets=(8, 16, 32, 64, 96, 128, 192, 256),
+)
+OVERLONG_INPUTS = Counter(
+    "resume_overlong_inputs",
+    "Lines over MAX_INPUT_TOKENS (formerly truncated, now segmented)",
+)
+CACHE_LOOKUPS = Counter(
+    "resume_cache_lookups",
+    "Enhancement cache lookups",
+    ["result"],  # hit / miss
+)
+LINES_PER_RESUME = Histogram(
+    "resume_lines_per_resume",
+    "Lines sent for enhancement per resume",
+    buckets=(0, 5, 10, 20, 40, 80, 160, 320),
+)
+LINES_MERGED = Counter(
+    "resume_lines_merged",
+    "Wrapped physical PDF lines folded into a line sent for enhancement (one generation each)",
+)
+VALIDATIONS = Counter(
+    "resume_validations",
+    "Final verdicts on newly generated lines",
+    ["outcome", "reason"],  # accepted/rejected; validation.REJECTION_REASONS or "none"
+)
+
+for _stage in STAGES:
+    STAGE_SECONDS.labels(_stage)  # export every stage from the start, even before its first call
+
+
+class stage_timer:
+    """Context manager observing the wall time of one stage call in STAGE_SECONDS."""
+
+    def __init__(self, stage: str):
+        self.histogram = STAGE_SECONDS.labels(stage)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+def metrics_payload() -> bytes:
+    """
+    The exposition text for /metrics. With several uvicorn workers, set
+    PROMETHEUS_MULTIPROC_DIR so every worker's samples are aggregated.
+    """
+    if REGISTRY is None:
+        return b"# prometheus_client is not installed; no metrics are recorded\n"
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+__all__ = [
+    "CACHE_LOOKUPS",
+    "CONTENT_TYPE_LATEST",
+    "INPUT_TOKENS",
+    "LINES_MERGED",
+    "LINES_PER_RESUME",
+    "OUTPUT_TOKENS",
+    "OVERLONG_INPUTS",
+    "STAGE_SECONDS",
+    "VALIDATIONS",
+    "configure_logging",
+    "debug_enabled",
+    "logger",
+    "metrics_payload",
+    "stage_timer",
+]
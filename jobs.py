@@ -0,0 +1,239 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+# process(pdf_bytes, progress) -> (result_text, stats); progress(done, total) reports lines
+ProgressCallback = Callable[[int, int], None]
+ProcessFn = Callable[[bytes, ProgressCallback], Awaitable[Tuple[str, Dict]]]
+
+
+class JobQueueFull(Exception):
+    """Raised by JobManager.submit when the bounded queue has no room."""
+
+
+@dataclass
+class Job:
+    id: str
+    pdf_bytes: Optional[bytes]
+    status: str = "queued"  # queued -> running -> done | failed
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    lines_done: int = 0
+    lines_total: int = 0
+    result: Optional[str] = None
+    stats: Optional[Dict] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "progress": {"done": self.lines_done, "total": self.lines_total},
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "stats": self.stats,
+            "error": self.error,
+        }
+
+
+_JOB_COLUMNS = ("id", "status", "created", "started", "finished", "lines_done", "lines_total", "result", "stats", "error")
+
+
+class JobStore:
+    """
+    Job status and results in a SQLite file, so every uvicorn worker process
+    can answer /jobs/{id} for a job accepted by any of them. The job itself
+    still runs in the process that accepted it.
+
+    Args:
+        db_path: SQLite file shared by the workers.
+    """
+
+    def __init__(self, db_path: str):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, status TEXT NOT NULL, created REAL NOT NULL, "
+            "started REAL, finished REAL, lines_done INTEGER NOT NULL, lines_total INTEGER NOT NULL, "
+            "result TEXT, stats TEXT, error TEXT)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_finished ON jobs(finished)")
+        self._db.commit()
+
+    def save(self, job: "Job"):
+        row = (job.id, job.status, job.created, job.started, job.finished, job.lines_done, job.lines_total,
+               job.result, json.dumps(job.stats) if job.stats is not None else None, job.error)
+        with self._lock:
+            self._db.execute(f"INSERT OR REPLACE INTO jobs ({', '.join(_JOB_COLUMNS)}) VALUES "
+                             f"({', '.join('?' * len(_JOB_COLUMNS))})", row)
+            self._db.commit()
+
+    def load(self, job_id: str) -> Optional["Job"]:
+        with self._lock:
+            row = self._db.execute(f"SELECT {', '.join(_JOB_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        fields = dict(zip(_JOB_COLUMNS, row))
+        fields["stats"] = json.loads(fields["stats"]) if fields["stats"] is not None else None
+        return Job(pdf_bytes=None, **fields)
+
+    def delete_finished_before(self, cutoff: float) -> int:
+        with self._lock:
+            deleted = self._db.execute("DELETE FROM jobs WHERE finished IS NOT NULL AND finished < ?", (cutoff,)).rowcount
+            self._db.commit()
+        return deleted
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class JobManager:
+    """
+    Runs submitted resumes through `process` on a fixed number of asyncio workers.
+
+    The queue is bounded: `submit` raises JobQueueFull instead of letting work pile
+    up, so the API can answer 429 and clients can retry later. Finished jobs
+    (and their results) are dropped `result_ttl` seconds after completion.
+
+    Without a `store`, jobs are only visible to this process, which is only
+    correct when the server runs a single worker. With one, every state change
+    is written to it and `get` falls back to it for jobs of other processes.
+
+    Args:
+        process: Coroutine running the whole pipeline for one PDF.
+        workers: Jobs processed concurrently.
+        max_queued: Jobs allowed to wait for a worker.
+        result_ttl: Seconds a finished job's status and result stay retrievable.
+        store: Shared JobStore for multi-process serving.
+        progress_interval: Minimum seconds between progress writes to the store.
+    """
+
+    def __init__(self, process: ProcessFn, workers: int = 2, max_queued: int = 32, result_ttl: float = 3600.0,
+                 store: Optional[JobStore] = None, progress_interval: float = 0.5):
+        self.process = process
+        self.store = store
+        self.progress_interval = progress_interval
+        self.workers = workers
+        self.max_queued = max_queued
+        self.result_ttl = result_ttl
+        self.jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+
+    async def start(self):
+        """Starts the workers and the expiry task; must be called from the serving event loop."""
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._expire_loop()))
+
+    async def stop(self, drain_timeout: float = 0.0):
+        """
+        Stops the workers. With `drain_timeout`, first waits up to that many
+        seconds for queued and running jobs to finish; whatever is left is
+        cancelled.
+        """
+        if drain_timeout > 0 and self._queue is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), drain_timeout)
+            except asyncio.TimeoutError:
+                pass
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Jobs that never reached a worker are failed too, so they get a finish time and expire
+        while self._queue is not None and not self._queue.empty():
+            job = self._queue.get_nowait()
+            self._cancelled(job)
+            self._save(job)
+            self._queue.task_done()
+
+    def submit(self, pdf_bytes: bytes) -> Job:
+        if self._queue is None:
+            raise RuntimeError("JobManager.start() has not been called")
+        job = Job(id=uuid.uuid4().hex, pdf_bytes=pdf_bytes)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise JobQueueFull(f"{self.max_queued} jobs already queued") from None
+        self.jobs[job.id] = job
+        self._save(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        job = self.jobs.get(job_id)
+        if job is None and self.store is not None:
+            job = self.store.load(job_id)
+        return job
+
+    def _save(self, job: Job):
+        if self.store is not None:
+            self.store.save(job)
+
+    def queued(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            job.started = time.time()
+            self._save(job)
+            last_saved = [job.started]
+
+            def progress(done: int, total: int, job=job):
+                job.lines_done, job.lines_total = done, total
+                now = time.time()
+                if now - last_saved[0] >= self.progress_interval:
+                    last_saved[0] = now
+                    self._save(job)
+
+            try:
+                job.result, job.stats = await self.process(job.pdf_bytes, progress)
+                job.status = "done"
+            except asyncio.CancelledError:
+                self._cancelled(job)
+                raise
+            except Exception as exc:
+                job.status = "failed"
+                job.error = f"{type(exc).__name__}: {exc}"
+            finally:
+                job.finished = time.time()
+                job.pdf_bytes = None  # the upload is no longer needed once processed
+                self._save(job)
+                self._queue.task_done()
+
+    @staticmethod
+    def _cancelled(job: Job):
+        job.status = "failed"
+        job.error = "cancelled: server shutting down"
+        job.finished = time.time()
+        job.pdf_bytes = None
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Drops finished jobs older than the TTL; returns how many were removed."""
+        now = time.time() if now is None else now
+        expired = [job_id for job_id, job in self.jobs.items()
+                   if job.finished is not None and now - job.finished > self.result_ttl]
+        for job_id in expired:
+            del self.jobs[job_id]
+        if self.store is not None:
+            return self.store.delete_finished_before(now - self.result_ttl)
+        return len(expired)
+
+    async def _expire_loop(self):
+        while True:
+            await asyncio.sleep(min(60.0, self.result_ttl))
+            self.expire()
+
+
+__all__ = ["Job", "JobManager", "JobQueueFull", "JobStore"]
@@ -0,0 +1,341 @@
+# load_test.py
+"""
+Local end-to-end load test of the FastAPI service.
+
+Starts `app:app` under uvicorn (with the given worker count and environment),
+replays a mix of synthetic resume PDFs against /upload_pdf/ either at a fixed
+concurrency (closed loop) or at a target arrival rate (open loop, Poisson
+arrivals), and reports throughput, p50/p95/p99 latency, error rate and the
+CPU time / RSS of every server process (read from /proc). Results are saved as
+JSON so runs with different workers, thread counts or decoding settings can be
+compared. Runs offline on one Linux box; only the standard library is used on
+the client side.
+
+Usage:
+    python load_test.py --concurrency 4 --requests 40 --label baseline
+    python load_test.py --workers 2 --env TORCH_NUM_THREADS=2 --rate 0.5 --duration 120 --label 2w-2t
+    python load_test.py --mix 1:0.7,3:0.3 --env DECODING_TIERS='[{"max_length": 256, "num_beams": 1}]'
+    python load_test.py --compare load_results/*.json
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from measurement import percentile, process_tree, read_process
+from synthetic_resume import make_resume_pdf
+from training_data import TRAIN_CSV, read_pairs
+
+RESULTS_DIR = "load_results"
+ENDPOINT = "/upload_pdf/"
+
+
+def parse_mix(spec: str) -> List[Tuple[int, float]]:
+    """"1:0.6,3:0.3,8:0.1" -> [(pages, weight), ...]"""
+    mix = []
+    for part in spec.split(","):
+        pages, _, weight = part.partition(":")
+        mix.append((int(pages), float(weight or 1)))
+    return mix
+
+
+def multipart_body(filename: str, payload: bytes) -> Tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        "Content-Type: application/pdf\r\n\r\n"
+    ).encode() + payload + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+# --- Server process monitoring (/proc) ---
+
+class ProcessMonitor(threading.Thread):
+    """Samples CPU time and RSS of a process tree until stopped."""
+
+    def __init__(self, root: int, interval: float = 0.5):
+        super().__init__(daemon=True)
+        self.root = root
+        self.interval = interval
+        self.samples: Dict[int, List[Tuple[float, float, int]]] = {}  # pid -> [(t, cpu_s, rss)]
+        self._stop_event = threading.Event()
+
+    def sample(self):
+        now = time.perf_counter()
+        for pid in process_tree(self.root):
+            try:
+                cpu, rss = read_process(pid)
+            except OSError:
+                continue
+            self.samples.setdefault(pid, []).append((now, cpu, rss))
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self.sample()
+            self._stop_event.wait(self.interval)
+
+    def stop(self) -> List[Dict]:
+        self._stop_event.set()
+        self.join()
+        self.sample()
+        report = []
+        for pid, samples in sorted(self.samples.items()):
+            (t0, cpu0, _), (t1, cpu1, _) = samples[0], samples[-1]
+            report.append({
+                "pid": pid,
+                "role": "master" if pid == self.root else "worker",
+                "cpu_seconds": cpu1 - cpu0,
+                "cpu_percent": (cpu1 - cpu0) / (t1 - t0) * 100 if t1 > t0 else 0.0,
+                "rss_mb_max": max(s[2] for s in samples) / 2**20,
+                "rss_mb_mean": sum(s[2] for s in samples) / len(samples) / 2**20,
+            })
+        return report
+
+
+# --- Server lifecycle ---
+
+def start_server(port: int, workers: int, env_overrides: Dict[str, str], log_path: str) -> subprocess.Popen:
+    # WEB_CONCURRENCY sizes each worker's torch thread budget (see executors.py)
+    env = {**os.environ, "WEB_CONCURRENCY": str(workers), **env_overrides}
+    cmd = [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(port),
+           "--workers", str(workers)]
+    log = open(log_path, "w", encoding="utf-8")
+    return subprocess.Popen(cmd, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+def wait_ready(port: int, server: subprocess.Popen, timeout: float):
+    """Polls /openapi.json until every worker has loaded the model and answers."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"server exited with status {server.returncode} during startup")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            conn.request("GET", "/openapi.json")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(1.0)
+    raise TimeoutError(f"server not ready after {timeout:.0f}s")
+
+
+def stop_server(server: subprocess.Popen):
+    server.terminate()
+    try:
+        server.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+# --- Load generation ---
+
+def send(port: int, name: str, pdf: bytes, timeout: float, scheduled: Optional[float] = None) -> Dict:
+    """
+    One upload. Latency runs from `scheduled` (the intended arrival time in
+    open-loop mode) when given, so time spent waiting for a free client is
+    counted instead of hidden (coordinated omission).
+    """
+    body, content_type = multipart_body(f"{name}.pdf", pdf)
+    start = time.perf_counter() if scheduled is None else scheduled
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+        conn.request("POST", ENDPOINT, body=body, headers={"Content-Type": content_type})
+        response = conn.getresponse()
+        response.read()
+        status = response.status
+        error = None if status == 200 else f"HTTP {status}"
+    except OSError as exc:
+        status, error = None, f"{type(exc).__name__}: {exc}"
+    return {"pdf": name, "start": start, "latency": time.perf_counter() - start, "status": status, "error": error}
+
+
+def run_load(port, pdfs, weights, concurrency, rate, requests, duration, timeout, seed):
+    """
+    Closed loop (rate is None): `concurrency` clients send back to back.
+    Open loop: requests arrive at `rate`/s (exponential gaps), at most `concurrency` in flight;
+    latency is measured from each request's scheduled arrival, including any wait for a free slot.
+    Stops after `requests` requests or `duration` seconds, whichever comes first.
+    """
+    rng = random.Random(seed)
+    names = list(pdfs)
+    results = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration if duration else None
+    issued = 0
+
+    def next_request():
+        nonlocal issued
+        with lock:
+            if (requests and issued >= requests) or (deadline and time.perf_counter() >= deadline):
+                return None
+            issued += 1
+            return rng.choices(names, weights)[0]
+
+    def finish(result):
+        with lock:
+            results.append(result)
+
+    if rate is None:
+        def client():
+            while True:
+                name = next_request()
+                if name is None:
+                    return
+                finish(send(port, name, pdfs[name], timeout))
+
+        threads = [threading.Thread(target=client) for _ in range(concurrency)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            next_at = time.perf_counter()
+            while True:
+                name = next_request()
+                if name is None:
+                    break
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(lambda n=name, at=next_at: finish(send(port, n, pdfs[n], timeout, at)))
+                next_at += rng.expovariate(rate)
+    return results
+
+
+def summarize(results, elapsed: float) -> Dict:
+    ok = [r["latency"] for r in results if r["error"] is None]
+    errors = [r for r in results if r["error"] is not None]
+    return {
+        "requests": len(results),
+        "succeeded": len(ok),
+        "errors": len(errors),
+        "error_rate": len(errors) / len(results) if results else 0.0,
+        "error_kinds": sorted({r["error"] for r in errors}),
+        "elapsed_s": elapsed,
+        "throughput_rps": len(ok) / elapsed if elapsed else 0.0,
+        "latency_s": {
+            "mean": sum(ok) / len(ok) if ok else 0.0,
+            "p50": percentile(ok, 50),
+            "p95": percentile(ok, 95),
+            "p99": percentile(ok, 99),
+            "max": max(ok, default=0.0),
+        },
+    }
+
+
+def print_report(report: Dict):
+    s = report["summary"]
+    lat = s["latency_s"]
+    print(f"\n{report['label']}: {s['requests']} requests in {s['elapsed_s']:.1f}s, "
+          f"{s['throughput_rps']:.2f} req/s, error rate {s['error_rate']:.1%}")
+    print(f"  latency  p50 {lat['p50']:.2f}s  p95 {lat['p95']:.2f}s  p99 {lat['p99']:.2f}s  max {lat['max']:.2f}s")
+    for p in report["processes"]:
+        print(f"  {p['role']:6} pid {p['pid']:>7}  cpu {p['cpu_percent']:6.1f}%  "
+              f"rss max {p['rss_mb_max']:7.0f} MB  mean {p['rss_mb_mean']:7.0f} MB")
+    if s["error_kinds"]:
+        print("  errors: " + "; ".join(s["error_kinds"]))
+
+
+def compare_runs(paths: List[str]):
+    print(f"{'label':24}{'workers':>8}{'req/s':>8}{'p50 s':>8}{'p95 s':>8}{'p99 s':>8}{'err':>7}{'RSS MB':>9}")
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            r = json.load(f)
+        s, lat = r["summary"], r["summary"]["latency_s"]
+        rss = sum(p["rss_mb_max"] for p in r["processes"])
+        print(f"{r['label'][:23]:24}{r['config']['workers']:>8}{s['throughput_rps']:>8.2f}{lat['p50']:>8.2f}"
+              f"{lat['p95']:>8.2f}{lat['p99']:>8.2f}{s['error_rate']:>7.1%}{rss:>9.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="server environment override, e.g. TORCH_NUM_THREADS=2 (repeatable)")
+    parser.add_argument("--mix", default="1:0.6,3:0.3,8:0.1", help="synthetic resume pages:weight list")
+    parser.add_argument("--pdf", action="append", default=[], help="also replay this PDF (weight 1)")
+    parser.add_argument("--concurrency", type=int, default=4, help="clients (closed loop) or max in flight")
+    parser.add_argument("--rate", type=float, help="open loop: mean arrivals per second")
+    parser.add_argument("--requests", type=int, default=40, help="stop after this many requests (0 = no limit)")
+    parser.add_argument("--duration", type=float, default=0, help="stop after this many seconds (0 = no limit)")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed requests per PDF before measuring")
+    parser.add_argument("--timeout", type=float, default=600, help="per-request timeout (s)")
+    parser.add_argument("--startup-timeout", type=float, default=600)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data", default=TRAIN_CSV)
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--out", help=f"results file (default: {RESULTS_DIR}/<time>-<label>.json)")
+    parser.add_argument("--compare", nargs="+", metavar="RESULT", help="print saved runs side by side and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare_runs(args.compare)
+        sys.exit(0)
+    if not args.requests and not args.duration:
+        parser.error("set --requests or --duration")
+
+    env_overrides = dict(item.split("=", 1) for item in args.env)
+    mix = parse_mix(args.mix)
+    training_pairs = read_pairs(args.data)
+    pdfs = {f"synthetic_{pages}p": make_resume_pdf(pages, seed=pages, pairs=training_pairs) for pages, _ in mix}
+    weights = [weight for _, weight in mix]
+    for path in args.pdf:
+        with open(path, "rb") as f:
+            pdfs[os.path.basename(path)] = f.read()
+        weights.append(1.0)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    log_path = os.path.join(RESULTS_DIR, f"{stamp}-{args.label}.server.log")
+    server = start_server(args.port, args.workers, env_overrides, log_path)
+    try:
+        print(f"Starting server ({args.workers} worker(s)), log: {log_path}")
+        wait_ready(args.port, server, args.startup_timeout)
+        for _ in range(args.warmup):
+            for name, pdf in pdfs.items():
+                send(args.port, name, pdf, args.timeout)
+
+        monitor = ProcessMonitor(server.pid)
+        monitor.start()
+        start = time.perf_counter()
+        results = run_load(args.port, pdfs, weights, args.concurrency, args.rate, args.requests,
+                           args.duration, args.timeout, args.seed)
+        elapsed = time.perf_counter() - start
+        processes = monitor.stop()
+    finally:
+        stop_server(server)
+
+    report = {
+        "label": args.label,
+        "timestamp": stamp,
+        "config": {
+            "workers": args.workers,
+            "env": env_overrides,
+            "mode": "open" if args.rate else "closed",
+            "concurrency": args.concurrency,
+            "rate": args.rate,
+            "mix": {name: weight for name, weight in zip(pdfs, weights)},
+            "cpu_count": os.cpu_count(),
+        },
+        "summary": summarize(results, elapsed),
+        "processes": processes,
+        "requests": [{k: v for k, v in r.items() if k != "start"} for r in results],
+    }
+    print_report(report)
+    out = args.out or os.path.join(RESULTS_DIR, f"{stamp}-{args.label}.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved {out}")
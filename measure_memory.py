@@ -0,0 +1,105 @@
+# measure_memory.py
+"""
+Total memory of the API under N uvicorn workers, per model loading mode:
+
+    private   USE_MERGED_MODEL=0: every worker loads t5-small + the PEFT adapter
+              into its own heap (the default when no merged artifact exists)
+    shared    USE_MERGED_MODEL=shared: the merged artifact is exported once and
+              every worker memory-maps the same file, sharing its pages
+
+For each mode and worker count the server is started, every worker serves a
+few uploads (so the mapped weights are actually paged in), and RSS, PSS and
+USS are summed over the master and its workers from /proc/<pid>/smaps_rollup.
+Summed RSS counts shared pages once per worker; PSS is the memory the
+workers really cost together.
+
+Usage:
+    python measure_memory.py --workers 1 2 4
+    python measure_memory.py --workers 4 --modes shared --out memory.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from load_test import send, start_server, stop_server, wait_ready
+from measurement import process_tree, read_memory
+from synthetic_resume import make_resume_pdf
+from training_data import TRAIN_CSV, read_pairs
+
+MODES = {
+    "private": {"USE_MERGED_MODEL": "0"},
+    "shared": {"USE_MERGED_MODEL": "shared"},
+}
+# Every upload must reach the model, not the enhancement cache
+BASE_ENV = {"ENHANCEMENT_CACHE": "0"}
+
+
+def tree_memory(root: int) -> Dict:
+    """Per-process and summed rss/pss/uss (MB) of `root` and its descendants."""
+    processes = []
+    for pid in process_tree(root):
+        try:
+            memory = read_memory(pid)
+        except OSError:
+            continue
+        processes.append({"pid": pid, "role": "master" if pid == root else "worker",
+                          **{k: v / 2**20 for k, v in memory.items()}})
+    totals = {f"{k}_mb": sum(p[k] for p in processes) for k in ("rss", "pss", "uss")}
+    return {**totals, "processes": processes}
+
+
+def measure(mode: str, workers: int, port: int, pdf: bytes, uploads: int, startup_timeout: float) -> Dict:
+    env = {**BASE_ENV, **MODES[mode]}
+    with tempfile.NamedTemporaryFile(prefix=f"memory-{mode}-{workers}w-", suffix=".log", delete=False) as log:
+        log_path = log.name
+    server = start_server(port, workers, env, log_path)
+    try:
+        wait_ready(port, server, startup_timeout)
+        # Concurrent uploads so requests spread over every worker
+        with ThreadPoolExecutor(max_workers=workers * 2) as pool:
+            results = list(pool.map(lambda i: send(port, f"r{i}", pdf, 600), range(uploads * workers)))
+        errors = [r["error"] for r in results if r["error"]]
+        time.sleep(1.0)
+        memory = tree_memory(server.pid)
+    finally:
+        stop_server(server)
+    return {"mode": mode, "workers": workers, "errors": errors, "log": log_path, **memory}
+
+
+def print_table(rows: List[Dict]):
+    print(f"\n{'mode':10}{'workers':>8}{'RSS sum MB':>12}{'PSS sum MB':>12}{'USS sum MB':>12}{'PSS/worker':>12}")
+    for r in rows:
+        per_worker = r["pss_mb"] / r["workers"]
+        print(f"{r['mode']:10}{r['workers']:>8}{r['rss_mb']:>12.0f}{r['pss_mb']:>12.0f}{r['uss_mb']:>12.0f}"
+              f"{per_worker:>12.0f}" + (f"  ({len(r['errors'])} errors)" if r["errors"] else ""))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--modes", nargs="+", choices=sorted(MODES), default=list(MODES))
+    parser.add_argument("--uploads", type=int, default=2, help="warm-up uploads per worker before measuring")
+    parser.add_argument("--pages", type=int, default=1, help="pages of the synthetic resume uploaded")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--startup-timeout", type=float, default=600)
+    parser.add_argument("--data", default=TRAIN_CSV)
+    parser.add_argument("--out", help="also write the measurements as JSON")
+    args = parser.parse_args()
+
+    if not os.path.isdir("/proc"):
+        sys.exit("needs Linux /proc")
+    pdf = make_resume_pdf(args.pages, seed=0, pairs=read_pairs(args.data))
+    rows = []
+    for mode in args.modes:
+        for workers in args.workers:
+            print(f"Measuring {mode} with {workers} worker(s) ...", flush=True)
+            rows.append(measure(mode, workers, args.port, pdf, args.uploads, args.startup_timeout))
+    print_table(rows)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
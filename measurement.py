@@ -0,0 +1,79 @@
+"""
+Measurement helpers shared by the benchmark scripts (load_test.py,
+measure_memory.py, evaluate_checkpoints.py, compare_quantization.py,
+benchmark_backends.py): percentiles, the peak RSS of the current process,
+and CPU time / memory of other processes read from /proc (Linux only).
+"""
+import os
+import resource
+from typing import Dict, List, Tuple
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    k = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of the current process so far, in MB."""
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def process_tree(root: int) -> List[int]:
+    """`root` and all its descendants (e.g. uvicorn's worker processes)."""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            children.setdefault(ppid, []).append(int(entry))
+    pids, stack = [], [root]
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        stack.extend(children.get(pid, []))
+    return pids
+
+
+def read_process(pid: int) -> Tuple[float, int]:
+    """(CPU seconds used so far, resident set size in bytes) of one process."""
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    cpu = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS  # utime + stime
+    with open(f"/proc/{pid}/statm") as f:
+        rss = int(f.read().split()[1]) * PAGE_SIZE
+    return cpu, rss
+
+
+def read_memory(pid: int) -> Dict[str, int]:
+    """
+    rss, pss and uss of one process in bytes, from /proc/<pid>/smaps_rollup.
+
+    RSS counts every shared page (e.g. memory-mapped weights) once per process,
+    so summing it over workers overstates the total; PSS splits each shared page
+    between the processes mapping it, and USS counts only private pages.
+    """
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if value.strip().endswith("kB"):
+                fields[key] = int(value.split()[0]) * 1024
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "uss": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+__all__ = ["percentile", "peak_rss_mb", "process_tree", "read_memory", "read_process"]
@@ -0,0 +1,246 @@
+import fcntl
+import json
+import mmap
+import os
+import shutil
+import struct
+from typing import Dict, Optional
+
+from enhancement_cache import model_fingerprint
+from instrumentation import logger
+
+# PEFT adapter produced by train_gramformer.py, and the self-contained artifact
+# written from it by export_merged_model.py
+MODEL_DIR = os.getenv("MODEL_DIR", "gramformer_lora")
+MERGED_MODEL_DIR = os.getenv("MERGED_MODEL_DIR", "gramformer_merged")
+
+# "auto" uses the merged artifact when it was exported from the current adapter (a stale
+# one is ignored with a warning), "0" always loads the adapter.
+# "shared" also exports it on startup when it is missing or older than the adapter, so
+# every uvicorn worker maps the same file and shares its pages instead of holding a copy
+USE_MERGED_MODEL = os.getenv("USE_MERGED_MODEL", "auto")
+
+# Opt-in dynamic int8 quantization of every nn.Linear for CPU inference
+QUANTIZE_INT8 = os.getenv("QUANTIZE_INT8", "0") == "1"
+
+MERGED_WEIGHTS = "model.safetensors"
+ARTIFACT_INFO = "artifact_info.json"
+
+_SAFETENSORS_DTYPES = {
+    "F32": "float32",
+    "F16": "float16",
+    "BF16": "bfloat16",
+    "I64": "int64",
+}
+
+
+def has_merged_model(merged_dir: str = MERGED_MODEL_DIR) -> bool:
+    return os.path.isfile(os.path.join(merged_dir, MERGED_WEIGHTS))
+
+
+def merged_model_current(model_dir: str = MODEL_DIR, merged_dir: str = MERGED_MODEL_DIR) -> bool:
+    """Whether the merged artifact exists and was exported from the adapter now in `model_dir`."""
+    info_path = os.path.join(merged_dir, ARTIFACT_INFO)
+    if not has_merged_model(merged_dir) or not os.path.isfile(info_path):
+        return False
+    with open(info_path, encoding="utf-8") as f:
+        return json.load(f).get("source_fingerprint") == model_fingerprint(model_dir)
+
+
+def ensure_merged_model(model_dir: str = MODEL_DIR, merged_dir: str = MERGED_MODEL_DIR):
+    """
+    Exports the merged artifact unless it is current. Workers starting together
+    serialize on a lock file so only the first one exports; the new artifact is
+    written to a temporary directory and swapped in, so processes still mapping
+    the previous files keep valid pages.
+    """
+    with open(merged_dir.rstrip("/") + ".lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if merged_model_current(model_dir, merged_dir):
+            return
+        from export_merged_model import export
+
+        staging = f"{merged_dir.rstrip('/')}.tmp-{os.getpid()}"
+        export(model_dir, staging, "float32")
+        if os.path.isdir(merged_dir):
+            retired = f"{merged_dir.rstrip('/')}.old-{os.getpid()}"
+            os.rename(merged_dir, retired)
+            os.rename(staging, merged_dir)
+            shutil.rmtree(retired)
+        else:
+            os.rename(staging, merged_dir)
+
+
+def active_model_dir(model_dir: str = MODEL_DIR, merged_dir: str = MERGED_MODEL_DIR) -> str:
+    """The directory `load_model` will actually read weights from."""
+    if USE_MERGED_MODEL == "shared":
+        ensure_merged_model(model_dir, merged_dir)
+        return merged_dir
+    if USE_MERGED_MODEL != "0" and has_merged_model(merged_dir):
+        # Without the adapter there is nothing to compare against: serve the artifact as shipped
+        if not os.path.isdir(model_dir) or merged_model_current(model_dir, merged_dir):
+            return merged_dir
+        logger.warning("merged model was not exported from the current adapter, loading the adapter instead "
+                       "(re-run export_merged_model.py)", extra={"path": merged_dir, "adapter": model_dir})
+    return model_dir
+
+
+def artifact_fingerprint(model_dir: str) -> str:
+    """
+    Fingerprint of the weights in `model_dir` for cache keys. Merged artifacts
+    record theirs at export time so startup doesn't re-hash the full weights.
+    """
+    info_path = os.path.join(model_dir, ARTIFACT_INFO)
+    if os.path.isfile(info_path):
+        with open(info_path, encoding="utf-8") as f:
+            return json.load(f)["fingerprint"]
+    return model_fingerprint(model_dir)
+
+
+def serving_fingerprint(model_dir: str = MODEL_DIR, merged_dir: str = MERGED_MODEL_DIR,
+                        quantize: Optional[bool] = None) -> str:
+    """Cache fingerprint for the model `load_model` returns with the same arguments."""
+    if quantize is None:
+        quantize = QUANTIZE_INT8
+    fingerprint = artifact_fingerprint(active_model_dir(model_dir, merged_dir))
+    return fingerprint + "-int8" if quantize else fingerprint
+
+
+def load_tokenizer(model_dir: str = MODEL_DIR):
+    from transformers import AutoTokenizer
+
+    return AutoTokenizer.from_pretrained(model_dir)
+
+
+def load_model(model_dir: str = MODEL_DIR, merged_dir: str = MERGED_MODEL_DIR, quantize: Optional[bool] = None):
+    """
+    Loads the enhancement model in eval mode.
+
+    Prefers the merged artifact (LoRA folded into the base weights, memory-mapped)
+    and falls back to resolving t5-small + the PEFT adapter from `model_dir`.
+    With `quantize` (default: QUANTIZE_INT8) the linear layers are replaced by
+    dynamically quantized int8 versions.
+    """
+    if quantize is None:
+        quantize = QUANTIZE_INT8
+
+    source = active_model_dir(model_dir, merged_dir)
+    if source == merged_dir:
+        logger.info("loading merged model (memory-mapped)", extra={"path": merged_dir})
+        model = load_merged_model(merged_dir, dtype="float32" if quantize else None)
+    elif quantize:
+        # Quantize the plain merged Linear layers rather than the PEFT wrappers
+        model = load_adapter_model(model_dir).merge_and_unload()
+    else:
+        from transformers import AutoModelForSeq2SeqLM
+
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_dir).eval()
+
+    return quantize_int8(model) if quantize else model
+
+
+def load_adapter_model(model_dir: str = MODEL_DIR):
+    """Loads the base model named in adapter_config.json wrapped in the PEFT adapter (unmerged)."""
+    from peft import PeftModel
+    from transformers import AutoModelForSeq2SeqLM
+
+    with open(os.path.join(model_dir, "adapter_config.json"), encoding="utf-8") as f:
+        base_name = json.load(f)["base_model_name_or_path"]
+    base = AutoModelForSeq2SeqLM.from_pretrained(base_name)
+    return PeftModel.from_pretrained(base, model_dir).eval()
+
+
+def quantize_int8(model):
+    """
+    Applies torch dynamic int8 quantization to every nn.Linear (weights int8,
+    activations quantized per batch). The modules are swapped in place, so no
+    deep copy of the float model is held alongside the quantized one.
+    """
+    import torch
+
+    return torch.quantization.quantize_dynamic(model.float().eval(), {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def mmap_safetensors(path: str) -> Dict[str, "torch.Tensor"]:
+    """
+    Maps a .safetensors file into memory and returns tensors that view the
+    mapping directly, so weights are paged in lazily and never copied.
+
+    The mapping is copy-on-write: pages stay shared with the page cache (and
+    with other processes mapping the same file) until something writes to them.
+    """
+    import torch
+
+    with open(path, "rb") as f:
+        (header_len,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_len))
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    data_start = 8 + header_len
+    tensors = {}
+    for name, meta in header.items():
+        if name == "__metadata__":
+            continue
+        dtype = getattr(torch, _SAFETENSORS_DTYPES[meta["dtype"]])
+        begin, end = meta["data_offsets"]
+        count = (end - begin) // torch.tensor([], dtype=dtype).element_size()
+        tensor = torch.frombuffer(buf, dtype=dtype, count=count, offset=data_start + begin)
+        tensors[name] = tensor.reshape(meta["shape"])
+    return tensors
+
+
+def load_merged_model(merged_dir: str = MERGED_MODEL_DIR, dtype: Optional[str] = None):
+    """
+    Builds the model skeleton on the meta device and assigns the memory-mapped
+    merged weights to it, skipping random initialisation and the PEFT wrapper.
+
+    Args:
+        merged_dir: Directory written by export_merged_model.py.
+        dtype: Optional compute dtype ("float32", "bfloat16"). Casting copies the
+            weights out of the mapping; float16 artifacts are upcast to float32
+            by default because most CPU kernels don't support half precision.
+    """
+    import torch
+    from transformers import AutoConfig, AutoModelForSeq2SeqLM, GenerationConfig
+
+    config = AutoConfig.from_pretrained(merged_dir)
+    state = mmap_safetensors(os.path.join(merged_dir, MERGED_WEIGHTS))
+
+    with torch.device("meta"):
+        model = AutoModelForSeq2SeqLM.from_config(config)
+    missing, unexpected = model.load_state_dict(state, strict=False, assign=True)
+    model.tie_weights()
+    if os.path.isfile(os.path.join(merged_dir, "generation_config.json")):
+        model.generation_config = GenerationConfig.from_pretrained(merged_dir)
+
+    still_meta = [name for name, t in list(model.named_parameters()) + list(model.named_buffers()) if t.is_meta]
+    if unexpected or still_meta:
+        raise RuntimeError(
+            f"Merged artifact in {merged_dir} does not match the model config "
+            f"(unexpected={unexpected}, missing={still_meta})"
+        )
+
+    stored = next(iter(state.values())).dtype
+    if dtype is None and stored == torch.float16:
+        dtype = "float32"
+    if dtype is not None and getattr(torch, dtype) != stored:
+        model = model.to(getattr(torch, dtype))
+    return model.eval()
+
+
+__all__ = [
+    "MODEL_DIR",
+    "MERGED_MODEL_DIR",
+    "active_model_dir",
+    "artifact_fingerprint",
+    "ensure_merged_model",
+    "has_merged_model",
+    "load_adapter_model",
+    "load_merged_model",
+    "load_model",
+    "load_tokenizer",
+    "merged_model_current",
+    "mmap_safetensors",
+    "quantize_int8",
+    "serving_fingerprint",
+]
@@ -0,0 +1,179 @@
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, NamedTuple, Optional, Sequence, Tuple, Union
+
+# "layout" (default: pdfplumber word positions, with wrapped bullets and paragraphs
+# rebuilt into one line each and columns read separately), "pdfplumber" (one line
+# per physical line of extract_text()) or "pdfminer" (lighter: skips pdfplumber's
+# object model and clusters pdfminer's own text lines directly)
+EXTRACTION_MODE = os.getenv("EXTRACTION_MODE", "layout")
+
+# Worker processes used to extract pages in parallel (0 or 1 = extract in the caller)
+EXTRACTION_PROCESSES = int(os.getenv("EXTRACTION_PROCESSES", str(min(4, os.cpu_count() or 1))))
+
+# Documents with fewer pages are extracted in the calling thread; shipping the PDF to
+# worker processes costs more than it saves on short resumes
+PARALLEL_MIN_PAGES = int(os.getenv("PARALLEL_MIN_PAGES", "3"))
+
+# Vertical distance (pt) under which pdfminer text lines are treated as one visual line
+LINE_TOLERANCE = 3.0
+
+PdfSource = Union[bytes, str]
+# The lines of one page as (text, merged) pairs; `merged` counts the extra physical
+# lines folded into the line (wrapped bullets and paragraphs, layout mode only)
+PageLines = List[Tuple[str, int]]
+
+
+class ExtractedLine(NamedTuple):
+    page: int  # 1-based page number
+    line: int  # 1-based line number within the page's extracted text (logical item in layout mode)
+    text: str
+    merged: int = 0  # extra physical lines folded into this one (layout mode)
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _open(pdf: PdfSource):
+    return io.BytesIO(pdf) if isinstance(pdf, bytes) else open(pdf, "rb")
+
+
+def count_pages(pdf: PdfSource) -> int:
+    from pdfminer.pdfpage import PDFPage
+
+    with _open(pdf) as fp:
+        return sum(1 for _ in PDFPage.get_pages(fp))
+
+
+def _pdfplumber_pages(pdf: PdfSource, page_numbers: Sequence[int]) -> List[PageLines]:
+    import pdfplumber
+
+    with pdfplumber.open(_open(pdf)) as doc:
+        return [[(line, 0) for line in (doc.pages[i].extract_text() or "").splitlines()] for i in page_numbers]
+
+
+def _pdfminer_pages(pdf: PdfSource, page_numbers: Sequence[int]) -> List[PageLines]:
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LAParams, LTTextContainer, LTTextLine
+
+    pages = []
+    with _open(pdf) as fp:
+        for layout in extract_pages(fp, page_numbers=page_numbers, laparams=LAParams()):
+            fragments = []
+            for element in layout:
+                if isinstance(element, LTTextContainer):
+                    for text_line in element:
+                        if isinstance(text_line, LTTextLine) and text_line.get_text().strip():
+                            fragments.append((text_line.y1, text_line.x0, text_line.get_text().strip()))
+
+            # Like pdfplumber, join fragments that share a baseline into one line, top to bottom
+            fragments.sort(key=lambda f: (-f[0], f[1]))
+            rows: List[List[tuple]] = []
+            for fragment in fragments:
+                if rows and abs(rows[-1][0][0] - fragment[0]) <= LINE_TOLERANCE:
+                    rows[-1].append(fragment)
+                else:
+                    rows.append([fragment])
+            pages.append([(" ".join(f[2] for f in sorted(row, key=lambda f: f[1])), 0) for row in rows])
+    return pages
+
+
+def _layout_pages(pdf: PdfSource, page_numbers: Sequence[int]) -> List[PageLines]:
+    import pdfplumber
+
+    from pdf_layout import reconstruct_items
+
+    with pdfplumber.open(_open(pdf)) as doc:
+        pages = []
+        for i in page_numbers:
+            page = doc.pages[i]
+            pages.append([(item.text, item.lines - 1) for item in reconstruct_items(page.extract_words(), page.width)])
+        return pages
+
+
+_EXTRACTORS = {
+    "layout": _layout_pages,
+    "pdfplumber": _pdfplumber_pages,
+    "pdfminer": _pdfminer_pages,
+}
+
+
+def _extract_chunk(pdf: PdfSource, page_numbers: Sequence[int], mode: str) -> List[PageLines]:
+    return _EXTRACTORS[mode](pdf, page_numbers)
+
+
+def _get_pool(processes: int) -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: the serving process has model/batcher threads that must not be forked
+            _pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+
+def extract_page_lines(pdf: PdfSource, mode: Optional[str] = None, processes: Optional[int] = None) -> List[PageLines]:
+    """
+    Returns the extracted lines of every page, with their merged line counts.
+
+    Pages are split into one contiguous chunk per worker process and extracted
+    in parallel when the document has at least PARALLEL_MIN_PAGES pages.
+    """
+    mode = mode or EXTRACTION_MODE
+    if mode not in _EXTRACTORS:
+        raise ValueError(f"Unknown extraction mode {mode!r}; choose one of {sorted(_EXTRACTORS)}")
+    processes = EXTRACTION_PROCESSES if processes is None else processes
+
+    num_pages = count_pages(pdf)
+    if processes <= 1 or num_pages < PARALLEL_MIN_PAGES:
+        return _extract_chunk(pdf, range(num_pages), mode)
+
+    if isinstance(pdf, str):
+        with open(pdf, "rb") as f:
+            pdf = f.read()
+
+    workers = min(processes, num_pages)
+    step = -(-num_pages // workers)
+    chunks = [list(range(start, min(start + step, num_pages))) for start in range(0, num_pages, step)]
+    pool = _get_pool(processes)
+    futures = [pool.submit(_extract_chunk, pdf, chunk, mode) for chunk in chunks]
+    return [page for future in futures for page in future.result()]
+
+
+def extract_page_texts(pdf: PdfSource, mode: Optional[str] = None, processes: Optional[int] = None) -> List[str]:
+    """Returns the extracted text of every page (see extract_page_lines)."""
+    return ["\n".join(text for text, _ in page) for page in extract_page_lines(pdf, mode, processes)]
+
+
+def extract_lines(pdf: PdfSource, mode: Optional[str] = None, processes: Optional[int] = None) -> List[ExtractedLine]:
+    """All non-empty, stripped lines of the PDF with their page and line indices."""
+    lines = []
+    for page_no, page in enumerate(extract_page_lines(pdf, mode, processes), start=1):
+        for idx, (line, merged) in enumerate(page):
+            line = line.strip()
+            if line:
+                lines.append(ExtractedLine(page_no, idx + 1, line, merged))
+    return lines
+
+
+__all__ = [
+    "EXTRACTION_MODE",
+    "EXTRACTION_PROCESSES",
+    "ExtractedLine",
+    "count_pages",
+    "extract_lines",
+    "extract_page_lines",
+    "extract_page_texts",
+    "shutdown_pool",
+]
@@ -0,0 +1,184 @@
+import re
+from statistics import median
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Words as returned by pdfplumber's page.extract_words(): dicts with at least
+# "text", "x0", "x1", "top" and "bottom" (points, origin top-left)
+Word = Dict
+
+# Vertical distance (pt) under which words are treated as one physical line
+LINE_TOLERANCE = 3.0
+
+# A line ending within this fraction of the column width from its right edge ran
+# out of room, so the next line may continue it
+WRAP_MARGIN = 0.15
+
+# Lines further apart than this (in median line heights) never belong to one item
+PARAGRAPH_GAP = 0.8
+
+# Horizontal slack (pt) when comparing indentation
+INDENT_TOLERANCE = 4.0
+
+# Minimum empty strip (pt) between two text columns, and how many lines must
+# have text on both sides of it before the page is read as two columns
+COLUMN_GAP = 18.0
+MIN_COLUMN_LINES = 3
+
+# Glyphs that open a bullet item, on their own or glued to the first word
+BULLET_GLYPHS = "•●▪◦‣∙○■□►▸➢✓"
+# Only count as bullets when they are a word of their own
+STANDALONE_BULLETS = {"-", "–", "—", "*", "o"}
+_NUMBERED_RE = re.compile(r"^(?:\d{1,2}|[a-zA-Z])[.)]$")
+
+
+class PhysicalLine(NamedTuple):
+    top: float
+    bottom: float
+    x0: float
+    x1: float
+    words: List[Word]
+
+    @property
+    def text(self) -> str:
+        return " ".join(w["text"] for w in self.words)
+
+
+class LayoutItem(NamedTuple):
+    text: str
+    lines: int  # physical lines merged into this item
+
+
+def group_lines(words: Sequence[Word], tolerance: float = LINE_TOLERANCE) -> List[PhysicalLine]:
+    """Clusters words sharing a baseline into physical lines, top to bottom, words left to right."""
+    rows: List[List[Word]] = []
+    for word in sorted(words, key=lambda w: (w["top"], w["x0"])):
+        if rows and abs(rows[-1][0]["top"] - word["top"]) <= tolerance:
+            rows[-1].append(word)
+        else:
+            rows.append([word])
+    lines = []
+    for row in rows:
+        row.sort(key=lambda w: w["x0"])
+        lines.append(PhysicalLine(
+            min(w["top"] for w in row), max(w["bottom"] for w in row), row[0]["x0"], max(w["x1"] for w in row), row
+        ))
+    return lines
+
+
+def _split_at(line: PhysicalLine, x: float) -> Optional[Tuple[List[Word], List[Word]]]:
+    """The line's words left and right of x, or None if the line runs across x (a word, or a normal word gap, spans it)."""
+    left = [w for w in line.words if w["x1"] <= x]
+    right = [w for w in line.words if w["x0"] >= x]
+    if len(left) + len(right) < len(line.words):
+        return None
+    if left and right and right[0]["x0"] - left[-1]["x1"] < COLUMN_GAP:
+        return None
+    return left, right
+
+
+def find_gutter(lines: Sequence[PhysicalLine], page_width: float) -> Optional[float]:
+    """
+    The x position of the empty strip between two columns, or None for a
+    single-column page. A gutter is crossed by (almost) no line and has text
+    on both sides, at least COLUMN_GAP apart, on MIN_COLUMN_LINES lines.
+    """
+    best, best_score = None, None
+    for x in range(int(page_width * 0.2), int(page_width * 0.8), 2):
+        crossing = both_sides = 0
+        for line in lines:
+            sides = _split_at(line, x)
+            if sides is None:
+                crossing += 1
+            elif sides[0] and sides[1]:
+                both_sides += 1
+        if both_sides < MIN_COLUMN_LINES or crossing > 0.1 * len(lines):
+            continue
+        score = (crossing, -both_sides)
+        if best_score is None or score < best_score:
+            best, best_score = x, score
+    return best
+
+
+def split_columns(words: Sequence[Word], page_width: float) -> List[List[Word]]:
+    """Words per column, in reading order. Lines crossing the gutter (e.g. a centred name) stay whole, in the first column."""
+    lines = group_lines(words)
+    gutter = find_gutter(lines, page_width)
+    if gutter is None:
+        return [list(words)]
+    left, right = [], []
+    for line in lines:
+        sides = _split_at(line, gutter)
+        if sides is None:
+            left.extend(line.words)
+        else:
+            left.extend(sides[0])
+            right.extend(sides[1])
+    return [column for column in (left, right) if column]
+
+
+def _bullet_text_x0(line: PhysicalLine) -> Optional[float]:
+    """Where the text of a bullet item starts, or None if the line does not open one."""
+    first = line.words[0]["text"]
+    if first in STANDALONE_BULLETS or _NUMBERED_RE.match(first) or all(c in BULLET_GLYPHS for c in first):
+        return line.words[1]["x0"] if len(line.words) > 1 else line.x1
+    if first[0] in BULLET_GLYPHS:
+        # Glyph glued to the first word: the text starts about one character in
+        word = line.words[0]
+        return word["x0"] + (word["x1"] - word["x0"]) / len(first)
+    return None
+
+
+def merge_wrapped(lines: Sequence[PhysicalLine]) -> List[LayoutItem]:
+    """
+    Joins physical lines of one column into logical items.
+
+    A line continues the current item when it does not open a bullet, follows
+    closely below, the previous line ran to the column's right edge (it
+    wrapped), and it is indented like the item's text (under the text of a
+    bullet, not under its glyph).
+    """
+    if not lines:
+        return []
+    col_x0 = min(line.x0 for line in lines)
+    col_x1 = max(line.x1 for line in lines)
+    wrap_edge = col_x1 - WRAP_MARGIN * (col_x1 - col_x0)
+    max_gap = PARAGRAPH_GAP * median(line.bottom - line.top for line in lines)
+
+    items: List[LayoutItem] = []
+    current: Optional[List[str]] = None
+    count = 0
+    text_x0 = prev = None
+    for line in lines:
+        bullet_x0 = _bullet_text_x0(line)
+        continues = (
+            current is not None
+            and bullet_x0 is None
+            and line.top - prev.bottom <= max_gap
+            and prev.x1 >= wrap_edge
+            and abs(line.x0 - text_x0) <= INDENT_TOLERANCE
+        )
+        if continues:
+            if current[-1].endswith("-") and current[-1][-2:-1].isalpha():
+                current[-1] += line.text  # hyphenated across the wrap
+            else:
+                current.append(line.text)
+            count += 1
+        else:
+            if current is not None:
+                items.append(LayoutItem(" ".join(current), count))
+            current, count = [line.text], 1
+            text_x0 = line.x0 if bullet_x0 is None else bullet_x0
+        prev = line
+    items.append(LayoutItem(" ".join(current), count))
+    return items
+
+
+def reconstruct_items(words: Sequence[Word], page_width: float) -> List[LayoutItem]:
+    """Logical items (bullets, paragraphs, headers) of one page, column by column, top to bottom."""
+    items: List[LayoutItem] = []
+    for column in split_columns(words, page_width):
+        items.extend(merge_wrapped(group_lines(column)))
+    return items
+
+
+__all__ = ["LayoutItem", "PhysicalLine", "group_lines", "merge_wrapped", "reconstruct_items", "split_columns"]
@@ -0,0 +1,313 @@
+"""
+The enhancement pipeline as plain blocking functions over an InferenceBackend:
+extraction -> relevance filter -> section routing -> segmentation ->
+generation -> validation -> ORIGINAL/ENHANCED output.
+
+app.py drives these from the event loop through the shared batcher and cache;
+bulk_enhance.py calls them directly, one resume at a time, in worker processes.
+"""
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from inference_backends import DECODING_TIERS, GENERATION_KWARGS
+from instrumentation import (
+    INPUT_TOKENS,
+    LINES_MERGED,
+    LINES_PER_RESUME,
+    OUTPUT_TOKENS,
+    OVERLONG_INPUTS,
+    VALIDATIONS,
+    debug_enabled,
+    logger,
+    stage_timer,
+)
+from pdf_extraction import PdfSource, extract_lines
+from resume_filter import relevant_chunk_flags
+from sections import DROP, ENHANCE, label_sections, route_for
+from segmentation import Segment, join_segments, segment_line
+from validation import select_enhancement
+
+# Generation batching: lines per generate() call and the model's trained input length
+# (longer lines are segmented to fit, see enhance_lines)
+GEN_BATCH_SIZE = 8
+MAX_INPUT_TOKENS = 128
+TASK_PREFIX = "enhance: "
+
+
+class Enhancement(NamedTuple):
+    enhanced: str
+    is_valid: bool
+    tier: Optional[int]  # decoding tier that produced `enhanced`, None for cache hits
+    from_cache: bool
+    reason: Optional[str] = None  # validation.REJECTION_REASONS entry when rejected, None for cache hits
+
+
+class Candidate(NamedTuple):
+    page: int
+    line: int
+    text: str
+    section: str  # see sections.label_sections
+    route: str  # ENHANCE, PASS or DROP, from the section routing policy
+    merged: int = 0  # wrapped physical lines folded into this one (see pdf_extraction.ExtractedLine)
+
+
+def enhance_lines(backend, texts: List[str], generation_kwargs: Optional[Dict] = None) -> List[List[str]]:
+    """
+    Enhances many lines at once using padded micro-batches.
+
+    Inputs are tokenized once. Lines longer than MAX_INPUT_TOKENS are split at
+    sentence/clause boundaries into pieces that fit (reusing that tokenization),
+    instead of being truncated. All pieces are sorted by token length and
+    generated in batches of GEN_BATCH_SIZE so short bullets are not padded up to
+    the longest line of the resume. Returns, in the same order as `texts`, the
+    list of candidates for each line (num_return_sequences of them, best first),
+    with the pieces of split lines joined back in order.
+    """
+    if generation_kwargs is None:
+        generation_kwargs = GENERATION_KWARGS
+    if not texts:
+        return []
+
+    tokenizer = backend.tokenizer
+    inputs = [TASK_PREFIX + text.strip() for text in texts]
+    debug = debug_enabled()
+
+    # (line index, piece) for every model input
+    pieces: List[Tuple[int, Segment]] = []
+    with stage_timer("tokenize"):
+        encoded, offsets = backend.tokenize_with_offsets(inputs)
+        for i, (inp, ids, spans) in enumerate(zip(inputs, encoded, offsets)):
+            segments = segment_line(inp, ids, spans, len(TASK_PREFIX), MAX_INPUT_TOKENS, tokenizer.eos_token_id)
+            if len(segments) > 1:
+                OVERLONG_INPUTS.inc()
+            if debug:
+                logger.debug("model input", extra={"text": inp, "tokens": len(ids), "segments": len(segments)})
+            for segment in segments:
+                INPUT_TOKENS.observe(len(segment.input_ids))
+            pieces.extend((i, segment) for segment in segments)
+
+    # Group similar lengths together so each batch pads as little as possible
+    order = sorted(range(len(pieces)), key=lambda p: len(pieces[p][1].input_ids))
+    per_line = generation_kwargs.get("num_return_sequences", 1)
+    piece_results: List[List[str]] = [[] for _ in pieces]
+
+    for start in range(0, len(order), GEN_BATCH_SIZE):
+        batch_idx = order[start:start + GEN_BATCH_SIZE]
+        with stage_timer("generate"):
+            outputs = backend.generate([pieces[p][1].input_ids for p in batch_idx], **generation_kwargs)
+            decoded = backend.decode(outputs)
+        for length in backend.count_tokens(outputs):
+            OUTPUT_TOKENS.observe(length)
+        # generate() returns the sequences of each input next to each other
+        for n, p in enumerate(batch_idx):
+            piece_results[p] = decoded[n * per_line:(n + 1) * per_line]
+
+    # Reassemble: candidate k of a split line joins candidate k of each of its pieces
+    by_line: List[List[List[str]]] = [[] for _ in texts]
+    for (i, _), candidates in zip(pieces, piece_results):
+        by_line[i].append(candidates)
+    results = [
+        [join_segments([c[min(k, len(c) - 1)] for c in line_pieces]) for k in range(per_line)]
+        for line_pieces in by_line
+    ]
+    if debug:
+        for candidates in results:
+            logger.debug("model output", extra={"text": candidates[0], "candidates": len(candidates)})
+
+    return results
+
+
+def count_verdict(line: str, result: Enhancement):
+    """Counts the final verdict on a newly generated line in VALIDATIONS."""
+    if result.is_valid:
+        VALIDATIONS.labels("accepted", "none").inc()
+    elif result.enhanced:
+        VALIDATIONS.labels("rejected", result.reason).inc()
+        if debug_enabled():
+            logger.debug("enhancement rejected",
+                         extra={"text": line, "enhanced": result.enhanced, "reason": result.reason})
+
+
+def enhance_tiered(backend, lines: Sequence[str]) -> List[Enhancement]:
+    """
+    Blocking counterpart of app.enhance_uncached for a whole list of lines:
+    every line is decoded with the first tier of DECODING_TIERS, and only the
+    lines left without a valid candidate move on to the next tier, all of them
+    in one enhance_lines() call per tier.
+    """
+    results = [Enhancement("", False, None, False) for _ in lines]
+    pending = list(range(len(lines)))
+    for tier, generation_kwargs in enumerate(DECODING_TIERS):
+        if not pending:
+            break
+        outputs = enhance_lines(backend, [lines[i] for i in pending], generation_kwargs)
+        still_pending = []
+        for i, candidates in zip(pending, outputs):
+            with stage_timer("validate"):
+                enhanced, verdict = select_enhancement(lines[i], candidates)
+            results[i] = Enhancement(enhanced, verdict.is_valid, tier, False, verdict.reason)
+            if not verdict.is_valid:
+                still_pending.append(i)
+        pending = still_pending
+
+    for line, result in zip(lines, results):
+        count_verdict(line, result)
+    return results
+
+
+def describe_tier(tier: int) -> str:
+    beams = DECODING_TIERS[tier].get("num_beams", 1)
+    return "greedy" if beams == 1 else f"{beams} beams"
+
+
+def new_stats() -> Dict:
+    # accepted_by_tier: accepted lines per decoding tier that produced them
+    # passed_through / dropped: lines kept as written / left out by the section policy
+    # lines_merged: wrapped physical lines folded into the lines sent for enhancement
+    return {"processed": 0, "accepted": 0, "rejected": 0, "cache_hits": 0,
+            "accepted_by_tier": [0] * len(DECODING_TIERS),
+            "passed_through": 0, "dropped": 0, "generations_saved": 0, "lines_merged": 0}
+
+
+def record_result(stats: Dict, result: Enhancement) -> str:
+    """Counts one enhanced line in `stats` and returns the text to ship for it ("" to drop it)."""
+    if not result.enhanced:
+        return ""
+    stats["processed"] += 1
+    stats["cache_hits"] += result.from_cache
+    if result.is_valid:
+        stats["accepted"] += 1
+        if result.tier is not None:
+            stats["accepted_by_tier"][result.tier] += 1
+        return result.enhanced
+    # Enhancement was rejected, keep original
+    stats["rejected"] += 1
+    return ""
+
+
+def format_statistics(stats: Dict) -> List[str]:
+    lines = ["=" * 60, "ENHANCEMENT STATISTICS", "=" * 60,
+             f"Total lines processed: {stats['processed']}"]
+    if stats['processed'] > 0:
+        lines.append(f"Valid enhancements:    {stats['accepted']} ({stats['accepted']/stats['processed']*100:.1f}%)")
+        lines.append(f"Rejected (kept orig):  {stats['rejected']} ({stats['rejected']/stats['processed']*100:.1f}%)")
+        lines.append(f"Served from cache:     {stats['cache_hits']}")
+        for tier, count in enumerate(stats["accepted_by_tier"]):
+            lines.append(f"Accepted at tier {tier + 1}:    {count} ({describe_tier(tier)})")
+    lines.append(f"Generations saved:     {stats['generations_saved']} "
+                 f"(passed through: {stats['passed_through']}, dropped: {stats['dropped']})")
+    lines.append(f"Wrapped lines merged:  {stats['lines_merged']}")
+    lines.append("=" * 60)
+    return lines
+
+
+def format_output(stats: Dict, kept: List[Candidate], results: List[Optional[Enhancement]]) -> List[str]:
+    """
+    The ORIGINAL/ENHANCED text output for the routed lines of one resume, as
+    chunks with the statistics last. `results` holds None for lines passed
+    through by their section; each enhanced line is counted in `stats`.
+    """
+    chunks = []
+    for candidate, result in zip(kept, results):
+        line = candidate.text
+        if result is None:
+            # Passed through by its section: kept as written
+            chunks.append(f"ORIGINAL: {line}\nENHANCED: {line}\n\n")
+        elif result.enhanced:
+            enhanced = record_result(stats, result) or line  # Use original as fallback
+            chunks.append(f"ORIGINAL: {line}\nENHANCED: {enhanced}\n\n")
+    chunks.append("\n" + "\n".join(format_statistics(stats)) + "\n")
+    return chunks
+
+
+def extract_candidate_lines(pdf: PdfSource, processes: Optional[int] = None) -> List[Candidate]:
+    """
+    Extracts the relevant lines of a PDF (path or bytes), each labelled with its
+    section and the route the section policy gives it.
+    Blocking (pages may be fanned out to extraction processes), so the endpoint
+    runs it on the PDF executor.
+    """
+    with stage_timer("extract"):
+        lines = extract_lines(pdf, processes=processes)
+    logger.debug("extracted lines", extra={"lines": len(lines)})
+
+    with stage_timer("filter"):
+        # Label sections before filtering, which drops the header lines themselves
+        sections = label_sections(extracted.text for extracted in lines)
+
+        # Skip very short lines (likely headers or artifacts)
+        labelled = [(extracted, section) for extracted, section in zip(lines, sections) if len(extracted.text) >= 15]
+
+        # Apply relevance filtering to the whole document at once
+        candidate_lines = []
+        flags = relevant_chunk_flags(extracted.text for extracted, _ in labelled)
+        debug = debug_enabled()
+        for (extracted, section), relevant in zip(labelled, flags):
+            if not relevant:
+                if debug:
+                    logger.debug("line filtered", extra={"page": extracted.page, "line": extracted.line,
+                                                         "text": extracted.text})
+                continue
+
+            candidate_lines.append(Candidate(extracted.page, extracted.line, extracted.text, section,
+                                             route_for(section), extracted.merged))
+
+    return candidate_lines
+
+
+def route_candidates(stats: Dict, candidates: List[Candidate]) -> Tuple[List[Candidate], List[int]]:
+    """
+    Applies the section routing policy. Returns the lines kept in the output and
+    the positions (in that list) of the ones to enhance; lines passed through or
+    dropped are counted in `stats` as generations saved, and the wrapped lines
+    merged into the ones to enhance as `lines_merged`.
+    """
+    kept = []
+    for candidate in candidates:
+        if candidate.route == DROP:
+            if debug_enabled():
+                logger.debug("line dropped", extra={"page": candidate.page, "line": candidate.line,
+                                                    "section": candidate.section, "text": candidate.text})
+            stats["dropped"] += 1
+        else:
+            kept.append(candidate)
+    to_enhance = [i for i, candidate in enumerate(kept) if candidate.route == ENHANCE]
+    stats["passed_through"] += len(kept) - len(to_enhance)
+    stats["generations_saved"] = stats["passed_through"] + stats["dropped"]
+    merged = sum(kept[i].merged for i in to_enhance)
+    stats["lines_merged"] += merged
+    LINES_MERGED.inc(merged)
+    LINES_PER_RESUME.observe(len(to_enhance))
+    return kept, to_enhance
+
+
+def process_resume(backend, pdf: PdfSource, processes: Optional[int] = None) -> Tuple[List[str], Dict]:
+    """
+    Blocking counterpart of app.process_resume without the cache or the shared
+    batcher: returns the ORIGINAL/ENHANCED output chunks and the statistics.
+    """
+    stats = new_stats()
+    kept, to_enhance = route_candidates(stats, extract_candidate_lines(pdf, processes))
+    results: List[Optional[Enhancement]] = [None] * len(kept)
+    for i, result in zip(to_enhance, enhance_tiered(backend, [kept[i].text for i in to_enhance])):
+        results[i] = result
+    return format_output(stats, kept, results), stats
+
+
+__all__ = [
+    "GEN_BATCH_SIZE",
+    "MAX_INPUT_TOKENS",
+    "TASK_PREFIX",
+    "Candidate",
+    "Enhancement",
+    "count_verdict",
+    "describe_tier",
+    "enhance_lines",
+    "enhance_tiered",
+    "extract_candidate_lines",
+    "format_output",
+    "format_statistics",
+    "new_stats",
+    "process_resume",
+    "record_result",
+    "route_candidates",
+]
@@ -1,5 +1,51 @@
 import re
-from typing import List
+from typing import Iterable, List, Optional
+
+# --- Shared patterns ---
+# Built once at import and used by both filter_resume_text and is_relevant_chunk /
+# relevant_chunk_flags. Each function's checks are merged into a single
+# alternation, so a line costs one regex match instead of one per pattern.
+
+# Common resume headers (section labels)
+SECTION_HEADERS = (
+    "Professional Summary", "Technical Skills", "Skills", "Work Experience", "Experience", "Major Projects",
+    "Projects", "Education", "Achievements", "Hobbies", "Career Objective", "Summary", "About", "Certifications",
+)
+
+# Labels that start contact information lines
+CONTACT_LABELS = (
+    "Email", "E-mail", "Phone", "Mobile", "Contact", "Location", "Address", "LinkedIn", "GitHub", "Website",
+    "Portfolio",
+)
+
+_HEADERS = "|".join(SECTION_HEADERS)
+_CONTACTS = "|".join(CONTACT_LABELS)
+
+# Single-line artifacts like separators or page numbers
+_ARTIFACT = r"^[-=_]{2,}$|^Page\s+\d+$"
+
+# filter_resume_text: any line starting with a contact label, a stand-alone header, or an artifact
+_STRUCTURAL_LINE_RE = re.compile(
+    rf"^\s*(?:{_CONTACTS})|^\s*(?:{_HEADERS})\s*[:\-]?\s*$|{_ARTIFACT}",
+    re.IGNORECASE,
+)
+
+# is_relevant_chunk: contact labels / headers as whole words at the start, artifacts,
+# and bullet-only or punctuation-only lines
+_IRRELEVANT_LINE_RE = re.compile(
+    rf"^\s*(?:{_CONTACTS})\b|^\s*(?:{_HEADERS})\b|{_ARTIFACT}|^[\-\u2022\*\s]+$",
+    re.IGNORECASE,
+)
+
+# A stand-alone section label, capturing which one
+_SECTION_HEADER_RE = re.compile(rf"^\s*({_HEADERS})\s*[:\-]?\s*$", re.IGNORECASE)
+
+# A Title Cased word, as in "John Doe"
+_TITLE_WORD_RE = re.compile(r"[A-Z][a-z]+")
+
+_is_structural_line = _STRUCTURAL_LINE_RE.match
+_is_irrelevant_line = _IRRELEVANT_LINE_RE.match
+_is_title_word = _TITLE_WORD_RE.fullmatch
 
 
 def filter_resume_text(extracted_text: str) -> str:
@@ -16,24 +62,7 @@ def filter_resume_text(extracted_text: str) -> str:
     if not extracted_text:
         return ""
 
-    # --- 1. Regex Patterns ---
-
-    # Pattern for common resume headers (stand-alone lines).
-    HEADER_PATTERN = re.compile(
-        r"^\s*(Professional Summary|Technical Skills|Skills|Work Experience|Experience|Major Projects|Projects|Education|Achievements|Hobbies|Career Objective|Summary|About|Certifications)\s*[:\-]?\s*$",
-        re.IGNORECASE,
-    )
-
-    # Pattern for contact information lines.
-    CONTACT_PATTERN = re.compile(
-        r"^\s*(Email|E-mail|Phone|Mobile|Contact|Location|Address|LinkedIn|GitHub|Website|Portfolio)[\s:-]*.*",
-        re.IGNORECASE,
-    )
-
-    # Also filter out common single-line artifacts like separators or page numbers
-    ARTIFACT_PATTERN = re.compile(r"^[-=_]{2,}$|^Page\s+\d+$", re.IGNORECASE)
-
-    # --- 2. Filtering Logic ---
+    # --- Filtering Logic ---
 
     lines = extracted_text.splitlines()
     filtered_lines: List[str] = []
@@ -46,16 +75,8 @@ def filter_resume_text(extracted_text: str) -> str:
         if not cleaned_line:
             continue
 
-        # Check for contact info
-        if CONTACT_PATTERN.search(cleaned_line):
-            continue
-
-        # Check for headers (stand-alone section labels)
-        if HEADER_PATTERN.match(cleaned_line):
-            continue
-
-        # Skip visual separators / page numbers
-        if ARTIFACT_PATTERN.match(cleaned_line):
+        # Skip contact info, stand-alone section labels and separators / page numbers
+        if _is_structural_line(cleaned_line):
             continue
 
         # If the line is not a header/contact/artifact, keep it
@@ -81,6 +102,12 @@ def filter_resume_text(extracted_text: str) -> str:
     return '\n\n'.join(paragraphs)
 
 
+def match_section_header(line: str) -> Optional[str]:
+    """The section label (as in SECTION_HEADERS, lower-cased) if `line` is a stand-alone header, else None."""
+    match = _SECTION_HEADER_RE.match(line)
+    return match.group(1).lower() if match else None
+
+
 # New helper to allow an extra safety check before sending text to the model
 def is_relevant_chunk(chunk: str, min_words: int = 3) -> bool:
     """
@@ -97,31 +124,49 @@ def is_relevant_chunk(chunk: str, min_words: int = 3) -> bool:
     if len(words) < min_words:
         return False
 
-    # Patterns reused from the main filter
-    header_re = re.compile(r"^\s*(Professional Summary|Technical Skills|Skills|Work Experience|Experience|Major Projects|Projects|Education|Achievements|Hobbies|Career Objective|Summary|About|Certifications)\b", re.IGNORECASE)
-    contact_re = re.compile(r"^\s*(Email|E-mail|Phone|Mobile|Contact|Location|Address|LinkedIn|GitHub|Website|Portfolio)\b", re.IGNORECASE)
-    artifact_re = re.compile(r"^[-=_]{2,}$|^Page\s+\d+$", re.IGNORECASE)
-
-    if contact_re.search(text):
-        return False
-    if header_re.search(text):
-        return False
-    if artifact_re.search(text):
-        return False
-
-    # Drop bullet-only lines or lines that are just punctuation
-    if re.match(r"^[\-\u2022\*\s]+$", text):
+    # Contact lines, headers, separators / page numbers, bullet-only lines
+    if _is_irrelevant_line(text):
         return False
 
     # Heuristic: drop name-only lines: short (<=3 words) and Title Cased words
-    if len(words) <= 3:
-        titlecased_words = sum(1 for w in words if re.match(r"^[A-Z][a-z]+$", w))
-        if titlecased_words == len(words):
-            # looks like a person's name or short title like "John Doe" or "Alex Carter"
-            return False
+    if len(words) <= 3 and all(_is_title_word(w) for w in words):
+        # looks like a person's name or short title like "John Doe" or "Alex Carter"
+        return False
 
     # If it passes all checks, consider it relevant
     return True
 
 
-__all__ = ["filter_resume_text", "is_relevant_chunk"]
+def relevant_chunk_flags(chunks: Iterable[str], min_words: int = 3) -> List[bool]:
+    """
+    Batch form of is_relevant_chunk: one relevance flag per chunk, in order.
+
+    Meant for whole documents (all extracted lines of a resume at once); the
+    result is identical to calling is_relevant_chunk on each chunk.
+    """
+    irrelevant = _is_irrelevant_line
+    title_word = _is_title_word
+    flags = []
+    append = flags.append
+    for chunk in chunks:
+        if not chunk:
+            append(False)
+            continue
+        words = chunk.split()
+        if not words or len(words) < min_words or irrelevant(chunk.strip()):
+            append(False)
+        elif len(words) <= 3 and all(title_word(w) for w in words):
+            append(False)
+        else:
+            append(True)
+    return flags
+
+
+__all__ = [
+    "CONTACT_LABELS",
+    "SECTION_HEADERS",
+    "filter_resume_text",
+    "is_relevant_chunk",
+    "match_section_header",
+    "relevant_chunk_flags",
+]
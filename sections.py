@@ -0,0 +1,100 @@
+import json
+import os
+from typing import Dict, Iterable, List, Optional
+
+from resume_filter import match_section_header
+
+# What happens to a line, by the section it belongs to
+ENHANCE = "enhance"  # sent to the model
+PASS = "pass"  # kept in the output unchanged, no generation
+DROP = "drop"  # left out of the output, no generation
+ROUTES = (ENHANCE, PASS, DROP)
+
+# Lines before the first recognised header: name and contact block, untitled summary
+PREAMBLE = "preamble"
+
+# Section each header label (resume_filter.SECTION_HEADERS, lower-cased) opens
+SECTION_OF_HEADER = {
+    "professional summary": "summary",
+    "summary": "summary",
+    "about": "summary",
+    "career objective": "summary",
+    "technical skills": "skills",
+    "skills": "skills",
+    "work experience": "experience",
+    "experience": "experience",
+    "major projects": "projects",
+    "projects": "projects",
+    "education": "education",
+    "achievements": "achievements",
+    "hobbies": "hobbies",
+    "certifications": "certifications",
+}
+
+# Narrative sections are enhanced; lists, entries and dates are kept as written, as is
+# the preamble (name, headline, contact details). Sections missing from the policy are enhanced.
+DEFAULT_SECTION_POLICY = {
+    PREAMBLE: PASS,
+    "summary": ENHANCE,
+    "experience": ENHANCE,
+    "projects": ENHANCE,
+    "achievements": ENHANCE,
+    "skills": PASS,
+    "education": PASS,
+    "certifications": PASS,
+    "hobbies": DROP,
+}
+
+
+def load_policy(overrides: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """DEFAULT_SECTION_POLICY updated with `overrides` ({section: route})."""
+    policy = {**DEFAULT_SECTION_POLICY, **(overrides or {})}
+    unknown = {section: route for section, route in policy.items() if route not in ROUTES}
+    if unknown:
+        raise ValueError(f"Unknown section routes {unknown}; choose from {list(ROUTES)}")
+    return policy
+
+
+# Override per section with JSON, e.g. SECTION_POLICY='{"education": "drop", "skills": "enhance"}'
+SECTION_POLICY = load_policy(json.loads(os.getenv("SECTION_POLICY", "null")))
+
+
+class SectionTracker:
+    """
+    Follows a resume line by line and reports the section each line is in.
+    A header line belongs to the section it opens.
+    """
+
+    def __init__(self):
+        self.section = PREAMBLE
+
+    def observe(self, line: str) -> str:
+        header = match_section_header(line)
+        if header is not None:
+            self.section = SECTION_OF_HEADER.get(header, header)
+        return self.section
+
+
+def label_sections(lines: Iterable[str]) -> List[str]:
+    """The section of every line of one document, in order."""
+    tracker = SectionTracker()
+    return [tracker.observe(line) for line in lines]
+
+
+def route_for(section: str, policy: Optional[Dict[str, str]] = None) -> str:
+    policy = SECTION_POLICY if policy is None else policy
+    return policy.get(section, ENHANCE)
+
+
+__all__ = [
+    "DEFAULT_SECTION_POLICY",
+    "DROP",
+    "ENHANCE",
+    "PASS",
+    "PREAMBLE",
+    "SECTION_POLICY",
+    "SectionTracker",
+    "label_sections",
+    "load_policy",
+    "route_for",
+]
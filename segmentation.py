@@ -0,0 +1,98 @@
+import re
+from typing import List, NamedTuple, Sequence, Tuple
+
+Offsets = Sequence[Tuple[int, int]]
+
+# Cut levels, tried in order: between sentences, between clauses, between words.
+# A line is only cut at a finer level where a coarser one leaves a piece too long.
+SENTENCE, CLAUSE, WORD = 0, 1, 2
+
+_SENTENCE_END_RE = re.compile(r"[.!?;]['\")\]]*$")
+_CLAUSE_END_RE = re.compile(r"[,:)]$")
+_CLAUSE_START_RE = re.compile(r"^(?:[-–—•(]|and\b|but\b|while\b|which\b|using\b|including\b)")
+
+
+class Segment(NamedTuple):
+    text: str
+    input_ids: List[int]  # model input for this piece: prefix + piece tokens + </s>
+
+
+def _cut_level(text: str, prev_end: int, start: int) -> int:
+    """
+    How good a place the start of the token at `start` is to cut, given the
+    previous token ended at `prev_end`. SentencePiece tokens carry the space
+    before a word ("▁word"), so a word starts either after a gap of whitespace
+    or at a token beginning with whitespace.
+    """
+    gap = text[prev_end:start]
+    if not (gap and gap.isspace()) and not text[start:start + 1].isspace():
+        return WORD + 1  # inside a word: never cut here
+    before = text[:prev_end].rstrip()
+    if _SENTENCE_END_RE.search(before):
+        return SENTENCE
+    if _CLAUSE_END_RE.search(before) or _CLAUSE_START_RE.match(text[start:start + 12].lstrip()):
+        return CLAUSE
+    return WORD
+
+
+def segment_line(
+    text: str, input_ids: List[int], offsets: Offsets, prefix_len: int, max_tokens: int, eos_token_id: int
+) -> List[Segment]:
+    """
+    Splits one tokenized model input into pieces of at most `max_tokens` tokens.
+
+    `text` is the full model input (task prefix + line), `input_ids` / `offsets`
+    its single tokenization (ending in </s>) and `prefix_len` the length of the
+    prefix in characters. Pieces are cut at sentence boundaries, then clause
+    boundaries, then between words, and their input ids are slices of
+    `input_ids` with the prefix tokens re-attached, so no piece is tokenized
+    again. Segment.text is the piece of the line, without the prefix.
+    """
+    if len(input_ids) <= max_tokens:
+        return [Segment(text[prefix_len:], list(input_ids))]
+
+    has_eos = input_ids and input_ids[-1] == eos_token_id
+    body_end = len(input_ids) - 1 if has_eos else len(input_ids)
+    first = next((i for i in range(body_end) if offsets[i][1] > prefix_len), body_end)
+    prefix_ids = list(input_ids[:first])
+    budget = max(1, max_tokens - len(prefix_ids) - 1)
+
+    levels = {i: _cut_level(text, offsets[i - 1][1], offsets[i][0]) for i in range(first + 1, body_end)}
+
+    def pack(lo: int, hi: int, level: int) -> List[Tuple[int, int]]:
+        if hi - lo <= budget:
+            return [(lo, hi)]
+        if level > WORD:
+            # A single "word" longer than the budget: cut it anyway rather than truncate
+            return [(s, min(s + budget, hi)) for s in range(lo, hi, budget)]
+        cuts = [i for i in range(lo + 1, hi) if levels[i] <= level]
+        pieces: List[Tuple[int, int]] = []
+        current = None
+        for a, b in zip([lo] + cuts, cuts + [hi]):
+            if b - a > budget:
+                if current:
+                    pieces.append(current)
+                    current = None
+                pieces.extend(pack(a, b, level + 1))
+            elif current and b - current[0] <= budget:
+                current = (current[0], b)
+            else:
+                if current:
+                    pieces.append(current)
+                current = (a, b)
+        if current:
+            pieces.append(current)
+        return pieces
+
+    return [
+        Segment(text[offsets[a][0]:offsets[b - 1][1]].strip(), prefix_ids + list(input_ids[a:b]) + [eos_token_id])
+        for a, b in pack(first, body_end, SENTENCE)
+    ]
+
+
+def join_segments(pieces: List[str]) -> str:
+    """Reassembles enhanced pieces of one line, in order."""
+    return " ".join(piece.strip() for piece in pieces if piece.strip())
+
+
+__all__ = ["Segment", "join_segments", "segment_line"]
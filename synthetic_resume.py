@@ -0,0 +1,186 @@
+# synthetic_resume.py
+"""
+Synthetic resume PDFs for benchmarks, built from the sentences of
+data/train.csv (raw `source` lines as bullets, enhanced `target` lines as
+summary text).
+
+Pages are written by a minimal PDF writer (Helvetica, WinAnsi encoding), so no
+PDF library is needed. Bullets are long enough to wrap, like real resumes.
+
+Usage:
+    python synthetic_resume.py --pages 1 3 8 --out-dir synthetic_pdfs
+"""
+import argparse
+import os
+import random
+from typing import List, Optional, Sequence, Tuple
+
+from training_data import TRAIN_CSV, read_pairs
+
+PAGE_WIDTH, PAGE_HEIGHT = 612.0, 792.0  # US Letter, points
+MARGIN = 50.0
+FONT_SIZE = 10.0
+LEADING = 13.0
+BULLET_INDENT = 12.0
+# Helvetica's average glyph width is about half the font size; used for wrapping
+CHAR_WIDTH = 0.5 * FONT_SIZE
+
+NAMES = ["Alex Carter", "Priya Sharma", "Jordan Lee", "Maria Garcia", "Wei Zhang", "Sam Okafor"]
+COMPANIES = ["Acme Analytics", "Northwind Labs", "Blue Harbor Tech", "Quantum Retail", "Helios Health"]
+TITLES = ["Software Engineer", "Data Analyst", "Backend Developer", "ML Engineer", "Product Analyst"]
+SKILLS = ["Python", "SQL", "FastAPI", "React", "Docker", "Kubernetes", "Pandas", "PyTorch", "AWS", "Git"]
+
+# (x, y, font, text) for every line of one page; font is "F1" (regular) or "F2" (bold)
+PageLines = List[Tuple[float, float, str, str]]
+
+
+def _escape(text: str) -> bytes:
+    raw = text.encode("cp1252", "replace")
+    out = bytearray()
+    for byte in raw:
+        if byte in b"()\\":
+            out += b"\\" + bytes([byte])
+        elif byte < 32 or byte > 126:
+            out += b"\\%03o" % byte
+        else:
+            out.append(byte)
+    return bytes(out)
+
+
+def render_pdf(pages: Sequence[PageLines]) -> bytes:
+    """Writes text-only pages as a PDF document."""
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # page tree, filled in once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+    ]
+    page_refs = []
+    for lines in pages:
+        content = b"".join(
+            b"BT /%s %.1f Tf 1 0 0 1 %.2f %.2f Tm (%s) Tj ET\n" % (font.encode(), FONT_SIZE, x, y, _escape(text))
+            for x, y, font, text in lines
+        )
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> >>" % (PAGE_WIDTH, PAGE_HEIGHT, content_ref)
+        )
+        page_refs.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % ref for ref in page_refs)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_refs))
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def _wrap(text: str, width: float) -> List[str]:
+    max_chars = max(10, int(width / CHAR_WIDTH))
+    lines, current = [], ""
+    for word in text.split():
+        if current and len(current) + 1 + len(word) > max_chars:
+            lines.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        lines.append(current)
+    return lines
+
+
+class _Layout:
+    """Places lines top to bottom, starting a new page when one is full."""
+
+    def __init__(self):
+        self.pages: List[PageLines] = [[]]
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def line(self, text: str, x: float = MARGIN, font: str = "F1", advance: bool = True):
+        if self.y < MARGIN:
+            self.pages.append([])
+            self.y = PAGE_HEIGHT - MARGIN
+        self.pages[-1].append((x, self.y, font, text))
+        if advance:
+            self.y -= LEADING
+
+    def gap(self):
+        self.y -= LEADING * 0.6
+
+    def heading(self, text: str):
+        self.gap()
+        self.line(text.upper(), font="F2")
+
+    def paragraph(self, text: str, x: float = MARGIN):
+        for wrapped in _wrap(text, PAGE_WIDTH - MARGIN - x):
+            self.line(wrapped, x)
+
+    def bullet(self, text: str):
+        text_x = MARGIN + BULLET_INDENT
+        for i, wrapped in enumerate(_wrap(text, PAGE_WIDTH - MARGIN - text_x)):
+            if i == 0:
+                self.line("•", MARGIN, advance=False)  # the glyph shares the first line's baseline
+            self.line(wrapped, text_x)
+
+
+def make_resume(pairs: Sequence[Tuple[str, str]], pages: int = 1, seed: int = 0) -> List[PageLines]:
+    """Lays out a resume of at least `pages` pages (the last one may be partly empty)."""
+    rng = random.Random(seed)
+    layout = _Layout()
+    name = rng.choice(NAMES)
+    layout.line(name, font="F2")
+    layout.line(f"Email: {name.lower().replace(' ', '.')}@example.com")
+    layout.line(f"Phone: +1 555 01{rng.randint(10, 99)} {rng.randint(1000, 9999)}")
+    layout.line("Location: Bengaluru, India")
+
+    layout.heading("Professional Summary")
+    layout.paragraph(" ".join(target for _, target in rng.sample(pairs, 2)))
+
+    layout.heading("Work Experience")
+    while len(layout.pages) < pages or layout.y > PAGE_HEIGHT / 2:
+        start = rng.randint(2012, 2021)
+        layout.gap()
+        layout.line(f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)}    {start} - {start + rng.randint(1, 3)}", font="F2")
+        for source, target in rng.sample(pairs, 4):
+            # Raw sentences; half of them run on into a polished one so the bullet wraps
+            layout.bullet(f"{source.rstrip('.')}, {target[0].lower()}{target[1:]}" if rng.random() < 0.5 else source)
+
+    layout.heading("Projects")
+    for source, _ in rng.sample(pairs, 3):
+        layout.bullet(source)
+
+    layout.heading("Education")
+    layout.line("B.Tech Computer Science, National Institute of Technology, 2012 - 2016")
+
+    layout.heading("Technical Skills")
+    layout.line(", ".join(rng.sample(SKILLS, 6)))
+    return layout.pages
+
+
+def make_resume_pdf(pages: int = 1, seed: int = 0, pairs: Optional[Sequence[Tuple[str, str]]] = None) -> bytes:
+    return render_pdf(make_resume(pairs or read_pairs(TRAIN_CSV), pages, seed))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 3, 8])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data", default=TRAIN_CSV)
+    parser.add_argument("--out-dir", default="synthetic_pdfs")
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    training_pairs = read_pairs(args.data)
+    for n in args.pages:
+        path = os.path.join(args.out_dir, f"resume_{n}p.pdf")
+        with open(path, "wb") as f:
+            f.write(make_resume_pdf(n, args.seed, training_pairs))
+        print(f"Wrote {path}")
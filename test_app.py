@@ -0,0 +1,117 @@
+import importlib
+import json
+import sys
+import time
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+pytest.importorskip("multipart")
+
+from pipeline import Candidate  # noqa: E402
+from sections import ENHANCE, PASS  # noqa: E402
+from test_pipeline import GOOD, FakeBackend  # noqa: E402
+
+CANDIDATES = [
+    Candidate(1, 1, "I made data pipelines using python", "experience", ENHANCE),
+    Candidate(1, 2, "Python, SQL, Kubernetes and Terraform tooling", "skills", PASS),
+    Candidate(1, 3, "I helped customers with problems", "experience", ENHANCE),
+]
+
+
+def rewrite(text, kwargs, k):
+    return GOOD.get(text, text)
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    """The app with a stub backend and PDF extraction replaced by CANDIDATES."""
+    from fastapi.testclient import TestClient
+
+    import executors
+    import inference_backends
+
+    patch = pytest.MonkeyPatch()
+    patch.setenv("ENHANCEMENT_CACHE", "0")
+    patch.setenv("JOB_STORE_PATH", str(tmp_path_factory.mktemp("jobs") / "jobs.sqlite3"))
+    patch.setattr(inference_backends, "create_backend", lambda *args, **kwargs: FakeBackend(rewrite))
+    patch.setattr(executors, "configure_torch_threads", lambda: None)
+    sys.modules.pop("app", None)
+    app = importlib.import_module("app")
+    patch.setattr(app, "extract_candidate_lines", lambda pdf, processes=None: list(CANDIDATES))
+    with TestClient(app.app) as test_client:
+        yield test_client
+    patch.undo()
+    sys.modules.pop("app", None)
+
+
+def upload(client, path):
+    return client.post(path, files={"file": ("resume.pdf", b"%PDF-1.4 stub", "application/pdf")})
+
+
+def test_upload_pdf_returns_enhanced_text(client):
+    response = upload(client, "/upload_pdf/")
+
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="enhanced_resume.txt"'
+    body = response.text
+    for candidate in CANDIDATES:
+        assert f"ORIGINAL: {candidate.text}\nENHANCED: {GOOD.get(candidate.text, candidate.text)}\n" in body
+    assert "Valid enhancements:    2 (100.0%)" in body
+
+
+def test_upload_pdf_stream_emits_pass_through_lines_first_and_stats_last(client):
+    response = upload(client, "/upload_pdf/stream")
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events[0] == {"type": "line", "index": 1, "page": 1, "line": 2, "section": "skills", "route": PASS,
+                         "original": CANDIDATES[1].text, "enhanced": CANDIDATES[1].text,
+                         "accepted": False, "tier": None, "cached": False}
+    enhanced = {e["index"]: e for e in events[1:-1]}
+    assert sorted(enhanced) == [0, 2]
+    assert all(e["accepted"] and e["tier"] == 0 for e in enhanced.values())
+    assert enhanced[2]["enhanced"] == GOOD[CANDIDATES[2].text]
+    assert events[-1]["type"] == "stats"
+    assert (events[-1]["accepted"], events[-1]["passed_through"]) == (2, 1)
+
+
+def test_upload_pdf_stream_as_server_sent_events(client):
+    response = client.post("/upload_pdf/stream?format=sse",
+                           files={"file": ("resume.pdf", b"%PDF-1.4 stub", "application/pdf")})
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    frames = [frame for frame in response.text.split("\n\n") if frame]
+    assert all(frame.startswith("data: ") for frame in frames)
+    assert json.loads(frames[-1][len("data: "):])["type"] == "stats"
+
+
+def test_upload_pdf_stream_rejects_unknown_format(client):
+    response = client.post("/upload_pdf/stream?format=xml",
+                           files={"file": ("resume.pdf", b"%PDF-1.4 stub", "application/pdf")})
+
+    assert response.status_code == 422
+
+
+def test_job_lifecycle(client):
+    submitted = upload(client, "/jobs")
+    assert submitted.status_code == 202
+    job = submitted.json()
+    assert job["status_url"] == f"/jobs/{job['job_id']}"
+
+    deadline = time.monotonic() + 10
+    while (status := client.get(job["status_url"]).json())["status"] not in ("done", "failed"):
+        assert time.monotonic() < deadline, status
+        time.sleep(0.02)
+
+    assert status["status"] == "done"
+    assert status["progress"] == {"done": 2, "total": 2}
+    result = client.get(job["result_url"])
+    assert result.status_code == 200
+    assert f"ENHANCED: {GOOD[CANDIDATES[0].text]}" in result.text
+
+
+def test_unknown_job_is_404(client):
+    assert client.get("/jobs/not-a-job").status_code == 404
+    assert client.get("/jobs/not-a-job/result").status_code == 404
@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("onnxruntime")
+pytest.importorskip("optimum.onnxruntime")
+
+from inference_backends import ONNX_MODEL_DIR, OnnxBackend, TorchBackend
+from training_data import read_sources
+
+# Number of train.csv sentences compared (the full file takes a few minutes on CPU)
+PARITY_LINES = int(os.getenv("PARITY_LINES", "64"))
+
+pytestmark = pytest.mark.skipif(
+    not os.path.isdir(ONNX_MODEL_DIR), reason=f"{ONNX_MODEL_DIR} missing - run `python export_onnx.py`"
+)
+
+
+@pytest.fixture(scope="module")
+def sentences():
+    return read_sources(limit=PARITY_LINES)
+
+
+def test_onnx_matches_torch_on_training_sentences(sentences):
+    expected = TorchBackend(quantize=False).enhance(sentences)
+    actual = OnnxBackend().enhance(sentences)
+
+    mismatches = [(s, e, a) for s, e, a in zip(sentences, expected, actual) if e != a]
+    assert not mismatches, f"{len(mismatches)}/{len(sentences)} differ, first: {mismatches[0]}"
+
@@ -0,0 +1,69 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from batch_scheduler import DynamicBatcher
+
+
+def test_results_map_back_to_callers():
+    batcher = DynamicBatcher(lambda items: [x * 2 for x in items], max_batch_size=4, max_wait_ms=5)
+    futures = batcher.submit_many(list(range(10)))
+    assert [f.result(timeout=5) for f in futures] == [x * 2 for x in range(10)]
+    batcher.close()
+    assert batcher.items_run == 10
+
+
+def test_concurrent_submissions_share_batches():
+    sizes = []
+    release = threading.Event()
+
+    def run_batch(items):
+        release.wait(timeout=5)
+        sizes.append(len(items))
+        return [x.upper() for x in items]
+
+    batcher = DynamicBatcher(run_batch, max_batch_size=8, max_wait_ms=50)
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        futures = list(pool.map(batcher.submit, ["a", "b", "c", "d", "e", "f"]))
+    release.set()
+
+    assert [f.result(timeout=5) for f in futures] == ["A", "B", "C", "D", "E", "F"]
+    batcher.close()
+    assert max(sizes) <= 8
+    assert len(sizes) < 6
+
+
+def test_errors_propagate_to_every_caller():
+    def run_batch(items):
+        raise ValueError("boom")
+
+    batcher = DynamicBatcher(run_batch, max_batch_size=2, max_wait_ms=1)
+    futures = batcher.submit_many(["x", "y"])
+    for f in futures:
+        with pytest.raises(ValueError):
+            f.result(timeout=5)
+    batcher.close()
+
+
+def test_submit_after_close_raises():
+    batcher = DynamicBatcher(lambda items: items)
+    batcher.close()
+    with pytest.raises(RuntimeError):
+        batcher.submit("late")
+
+
+def test_batches_run_on_executor():
+    seen_threads = set()
+
+    def run_batch(items):
+        seen_threads.add(threading.current_thread().name)
+        return items
+
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="inference") as pool:
+        batcher = DynamicBatcher(run_batch, max_batch_size=3, executor=pool, max_in_flight=2)
+        futures = batcher.submit_many(list(range(9)))
+        assert [f.result(timeout=5) for f in futures] == list(range(9))
+        batcher.close()
+
+    assert all(name.startswith("inference") for name in seen_threads)
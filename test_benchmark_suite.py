@@ -0,0 +1,44 @@
+import re
+
+from benchmark_suite import compare
+from synthetic_resume import make_resume, render_pdf
+
+PAIRS = [
+    ("I worked on a data analysis project", "Conducted comprehensive data analysis using Pandas and SQL."),
+    ("I built a website for a client", "Developed a responsive e-commerce website using React and Node.js."),
+    ("I fixed bugs (lots of them)", "Resolved 120+ production defects, cutting support tickets by 35%."),
+    ("I made dashboards", "Built Tableau dashboards used by 40 regional managers every week."),
+]
+
+
+def test_synthetic_resume_grows_to_requested_pages():
+    for pages in (1, 3):
+        assert len(make_resume(PAIRS, pages)) == pages
+
+
+def test_rendered_pdf_has_valid_cross_reference_table():
+    pdf = render_pdf(make_resume(PAIRS, 2))
+    assert pdf.startswith(b"%PDF-1.4") and pdf.rstrip().endswith(b"%%EOF")
+
+    startxref = int(re.search(rb"startxref\n(\d+)", pdf).group(1))
+    assert pdf[startxref:].startswith(b"xref")
+    entries = re.findall(rb"(\d{10}) 00000 n \n", pdf[startxref:])
+    for number, offset in enumerate(entries, start=1):
+        assert pdf[int(offset):].startswith(b"%d 0 obj" % number)
+
+    # Parentheses in the text are escaped inside the string operands
+    assert b"\\(lots of them\\)" in pdf
+    assert b"/Count 2" in pdf
+
+
+def test_compare_flags_only_slowdowns_beyond_tolerance():
+    def run(*rows):
+        return {"results": [{"stage": s, "pages": 1, "items": 10, "seconds": t, "per_item_ms": t * 100}
+                            for s, t in rows]}
+
+    baseline = run(("extraction", 0.10), ("filtering", 0.010), ("validation", 0.002))
+    current = run(("extraction", 0.11), ("filtering", 0.015), ("output", 0.001))
+    rows = {row["stage"]: row for row in compare(current, baseline, tolerance=0.2)}
+    assert set(rows) == {"extraction", "filtering"}
+    assert not rows["extraction"]["regressed"]
+    assert rows["filtering"]["regressed"]
@@ -0,0 +1,58 @@
+import os
+
+from bulk_enhance import Task, discover_pdfs, load_manifest, pending_tasks, plan_tasks, run_bulk, summarize
+
+
+def fake_process(task: Task):
+    """Stands in for process_task: writes the output, fails on names containing "bad"."""
+    if "bad" in os.path.basename(task.pdf):
+        return {"path": task.pdf, "output": task.output, "status": "failed", "error": "boom", "seconds": 0.0}
+    os.makedirs(os.path.dirname(task.output), exist_ok=True)
+    with open(task.output, "w") as out:
+        out.write("ORIGINAL: x\nENHANCED: y\n\n")
+    return {"path": task.pdf, "output": task.output, "status": "done", "lines": 1, "stats": {}, "seconds": 0.1}
+
+
+def make_tree(tmp_path):
+    for name in ("a.pdf", "sub/b.PDF", "sub/bad.pdf", "notes.txt"):
+        path = tmp_path / "in" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"%PDF-1.4")
+    listing = tmp_path / "list.txt"
+    listing.write_text("# extra resumes\nin/a.pdf\n\nin/sub/b.PDF\n")
+    return tmp_path / "in", listing
+
+
+def test_discovery_and_output_layout(tmp_path):
+    folder, listing = make_tree(tmp_path)
+    pdfs = discover_pdfs([str(folder), str(listing)])
+    assert [os.path.relpath(p, folder) for p in pdfs] == ["a.pdf", os.path.join("sub", "b.PDF"),
+                                                          os.path.join("sub", "bad.pdf")]
+
+    tasks = plan_tasks(pdfs, str(tmp_path / "out"))
+    assert tasks[1].output == str(tmp_path / "out" / "results" / "sub" / "b.txt")
+
+
+def test_interrupted_run_resumes_without_redoing_files(tmp_path):
+    folder, _ = make_tree(tmp_path)
+    tasks = plan_tasks(discover_pdfs([str(folder)]), str(tmp_path / "out"))
+    manifest = str(tmp_path / "out" / "manifest.jsonl")
+
+    # First run stops after one file, leaving a half-written manifest line behind
+    run_bulk(tasks[:1], manifest, workers=1, threads=1, process=fake_process, initializer=None)
+    with open(manifest, "a") as f:
+        f.write('{"path": "trunc')
+
+    todo = pending_tasks(tasks, load_manifest(manifest))
+    assert todo == tasks[1:]
+    records = run_bulk(todo, manifest, workers=2, threads=1, process=fake_process, initializer=None)
+    assert sorted(r["status"] for r in records) == ["done", "failed"]
+
+    # Only the failed file is retried; a deleted output is redone
+    os.remove(tasks[0].output)
+    retry = pending_tasks(tasks, load_manifest(manifest))
+    assert [t.pdf for t in retry] == [tasks[0].pdf, tasks[2].pdf]
+
+    summary = summarize(records, elapsed=2.0, skipped=1)
+    assert summary["done"] == 1 and summary["failed"] == 1 and summary["files_per_second"] == 0.5
+    assert set(load_manifest(manifest)) == {t.pdf for t in tasks}
@@ -0,0 +1,76 @@
+from enhancement_cache import EnhancementCache, normalize_line
+from validation import VALIDATOR_VERSION
+
+PARAMS = {"num_beams": 4, "max_length": 256}
+
+
+def test_normalize_collapses_whitespace():
+    assert normalize_line("  Developed REST   APIs\tusing Flask ") == "Developed REST APIs using Flask"
+
+
+def test_roundtrip_through_disk(tmp_path):
+    db = str(tmp_path / "cache.sqlite3")
+    cache = EnhancementCache(db, fingerprint="abc", generation_params=PARAMS)
+    assert cache.get("Developed REST APIs using Python and Flask") is None
+    cache.put("Developed REST APIs using Python and Flask", "Designed and shipped REST APIs.", True)
+    cache.close()
+
+    reopened = EnhancementCache(db, fingerprint="abc", generation_params=PARAMS)
+    hit = reopened.get("Developed  REST APIs using Python and Flask")
+    assert hit.enhanced == "Designed and shipped REST APIs."
+    assert hit.is_valid is True
+    assert reopened.stats["disk_hits"] == 1
+
+    # Same line, different model or decoding settings -> separate entry
+    other = EnhancementCache(db, fingerprint="def", generation_params=PARAMS)
+    assert other.get("Developed REST APIs using Python and Flask") is None
+    other = EnhancementCache(db, fingerprint="abc", generation_params={"num_beams": 1})
+    assert other.get("Developed REST APIs using Python and Flask") is None
+    # Verdicts from older validation rules are not reused
+    other = EnhancementCache(db, fingerprint="abc", generation_params=PARAMS, validator_version=VALIDATOR_VERSION + 1)
+    assert other.get("Developed REST APIs using Python and Flask") is None
+
+
+def test_lru_and_disk_eviction(tmp_path):
+    cache = EnhancementCache(
+        str(tmp_path / "cache.sqlite3"), fingerprint="abc", generation_params=PARAMS,
+        max_memory_entries=2, max_disk_entries=3,
+    )
+    for i in range(5):
+        cache.put(f"line number {i}", f"enhanced {i}", i % 2 == 0)
+
+    assert len(cache._memory) == 2
+    (rows,) = cache._db.execute("SELECT COUNT(*) FROM enhancements").fetchone()
+    assert rows == 3
+    assert cache.get("line number 0") is None
+    assert cache.get("line number 4").is_valid is True
+    assert cache.stats["memory_hits"] == 1
+    assert cache.stats["misses"] == 1
+
+
+def test_disk_tier_is_trimmed_every_percent_of_its_limit(tmp_path):
+    cache = EnhancementCache(
+        str(tmp_path / "cache.sqlite3"), fingerprint="abc", generation_params=PARAMS, max_disk_entries=200,
+    )
+    statements = []
+    cache._db.set_trace_callback(statements.append)
+    for i in range(250):
+        cache.put(f"line number {i}", f"enhanced {i}", True)
+
+    # One count per 2 writes (1% of 200), not one per write
+    assert sum("COUNT(*)" in sql for sql in statements) == 125
+    (rows,) = cache._db.execute("SELECT COUNT(*) FROM enhancements").fetchone()
+    assert rows == 200
+
+
+def test_disk_errors_become_misses_and_skipped_writes(tmp_path):
+    db = str(tmp_path / "cache.sqlite3")
+    cache = EnhancementCache(db, fingerprint="abc", generation_params=PARAMS, max_memory_entries=1)
+    cache.put("line number 0", "enhanced 0", True)
+    cache.put("line number 1", "enhanced 1", True)  # pushes line 0 out of memory
+
+    cache._db.close()  # every further SQLite call now raises sqlite3.ProgrammingError
+    assert cache.get_many(["line number 0", "line number 1"]) == [None, ("enhanced 1", True)]
+    cache.put_many([("line number 2", "enhanced 2", False)])
+    assert cache.get("line number 2") == ("enhanced 2", False)
+    assert cache.stats["disk_errors"] == 2
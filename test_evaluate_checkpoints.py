@@ -0,0 +1,39 @@
+import pytest
+
+from evaluate_checkpoints import eval_split, find_checkpoints, in_eval_split, rouge_l, score
+
+
+def test_checkpoints_ordered_by_step_then_final(tmp_path):
+    for name in ("checkpoint-1000", "checkpoint-500", "checkpoint-568", "runs", "checkpoint-9"):
+        (tmp_path / name).mkdir()
+        if name != "checkpoint-9":  # no adapter weights: skipped
+            (tmp_path / name / "adapter_model.safetensors").write_bytes(b"w")
+    (tmp_path / "adapter_model.safetensors").write_bytes(b"w")
+
+    names = [name for name, _ in find_checkpoints(str(tmp_path))]
+    assert names == ["checkpoint-500", "checkpoint-568", "checkpoint-1000", "final"]
+
+
+def test_eval_split_is_stable_and_roughly_sized():
+    pairs = [(f"I worked on project number {i}", f"Led project {i}") for i in range(2000)]
+    split = eval_split(pairs, 0.1)
+    assert 150 < len(split) < 250
+    assert split == eval_split(list(reversed(pairs)), 0.1)[::-1]
+    # Growing the fraction only adds sentences
+    assert set(split) <= set(eval_split(pairs, 0.2))
+    assert in_eval_split("  Same Sentence ", 0.5) == in_eval_split("same sentence", 0.5)
+
+
+def test_rouge_l():
+    assert rouge_l("the cat sat on the mat", "the cat is on the mat") == pytest.approx(5 / 6)
+    assert rouge_l("Identical text.", "identical TEXT") == 1.0
+    assert rouge_l("", "anything") == 0.0
+    assert rouge_l("nothing shared", "entirely different") == 0.0
+
+
+def test_score_uses_validator_and_reference():
+    pairs = [("I did data analysis", "Conducted data analysis with SQL")]
+    result = score(pairs, ["Conducted comprehensive data analysis with SQL and Pandas"])
+    assert result["acceptance_rate"] == 1.0
+    assert 0 < result["rouge_l"] < 1
+    assert result["mean_output_words"] == 8
@@ -1,10 +1,8 @@
 # test_gramformer.py
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
-import torch
+from model_loading import MODEL_DIR, load_model, load_tokenizer
 
-MODEL_DIR = "gramformer_lora"
-tokenizer = AutoTokenizer.from_pretrained(MODEL_DIR)
-model = AutoModelForSeq2SeqLM.from_pretrained(MODEL_DIR)
+tokenizer = load_tokenizer(MODEL_DIR)
+model = load_model(MODEL_DIR)
 
 def enhance(text):
     inp = "enhance: " + text.strip()
@@ -0,0 +1,32 @@
+import json
+import logging
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+
+from instrumentation import STAGE_SECONDS, JsonFormatter, metrics_payload, stage_timer
+
+
+def test_stage_timer_observes_one_sample():
+    before = STAGE_SECONDS.labels("filter")._sum.get()
+    with stage_timer("filter"):
+        sum(range(1000))
+    assert STAGE_SECONDS.labels("filter")._sum.get() > before
+
+
+def test_json_formatter_includes_extra_fields():
+    record = logging.makeLogRecord({"name": "resume_enhancer", "levelname": "INFO", "msg": "resume statistics",
+                                    "processed": 4, "accepted": 3})
+    event = json.loads(JsonFormatter().format(record))
+    assert event["event"] == "resume statistics"
+    assert event["processed"] == 4 and event["accepted"] == 3
+    assert "msg" not in event and "args" not in event
+
+
+def test_metrics_payload_exports_every_metric():
+    payload = metrics_payload().decode()
+    for name in ("resume_stage_seconds", "resume_input_tokens", "resume_output_tokens", "resume_overlong_inputs_total",
+                 "resume_cache_lookups_total", "resume_lines_per_resume", "resume_validations_total"):
+        assert name in payload
+    assert 'stage="generate"' in payload
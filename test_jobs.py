@@ -0,0 +1,150 @@
+import asyncio
+
+import pytest
+
+from jobs import JobManager, JobQueueFull
+
+
+async def fake_process(pdf_bytes, progress):
+    lines = pdf_bytes.decode().split()
+    for done in range(1, len(lines) + 1):
+        await asyncio.sleep(0)
+        progress(done, len(lines))
+    if "boom" in lines:
+        raise ValueError("bad pdf")
+    return " ".join(lines).upper(), {"processed": len(lines)}
+
+
+async def wait_finished(manager, job):
+    while manager.get(job.id).finished is None:
+        await asyncio.sleep(0.001)
+    return manager.get(job.id)
+
+
+def test_job_runs_to_completion_with_progress():
+    async def scenario():
+        manager = JobManager(fake_process, workers=1)
+        await manager.start()
+        job = manager.submit(b"built three apis")
+        assert job.status == "queued"
+        job = await wait_finished(manager, job)
+        await manager.stop()
+        return job
+
+    job = asyncio.run(scenario())
+    assert job.status == "done"
+    assert job.result == "BUILT THREE APIS"
+    assert job.to_dict()["progress"] == {"done": 3, "total": 3}
+    assert job.pdf_bytes is None
+
+
+def test_failures_are_reported():
+    async def scenario():
+        manager = JobManager(fake_process, workers=1)
+        await manager.start()
+        job = await wait_finished(manager, manager.submit(b"boom"))
+        await manager.stop()
+        return job
+
+    job = asyncio.run(scenario())
+    assert job.status == "failed"
+    assert "bad pdf" in job.error
+
+
+def test_bounded_queue_rejects_when_full():
+    async def scenario():
+        release = asyncio.Event()
+
+        async def blocked(pdf_bytes, progress):
+            await release.wait()
+            return "", {}
+
+        manager = JobManager(blocked, workers=1, max_queued=2)
+        await manager.start()
+        first = manager.submit(b"a")
+        await asyncio.sleep(0.01)  # worker picks up the first job
+        manager.submit(b"b")
+        manager.submit(b"c")
+        with pytest.raises(JobQueueFull):
+            manager.submit(b"d")
+        release.set()
+        await wait_finished(manager, first)
+        await manager.stop()
+
+    asyncio.run(scenario())
+
+
+def test_finished_jobs_expire_after_ttl():
+    async def scenario():
+        manager = JobManager(fake_process, workers=1, result_ttl=10)
+        await manager.start()
+        job = await wait_finished(manager, manager.submit(b"x y z"))
+        await manager.stop()
+        assert manager.expire(now=job.finished + 5) == 0
+        assert manager.expire(now=job.finished + 11) == 1
+        assert manager.get(job.id) is None
+
+    asyncio.run(scenario())
+
+
+def test_stop_drains_running_jobs_before_cancelling():
+    async def scenario():
+        async def slow(pdf_bytes, progress):
+            await asyncio.sleep(0.05)
+            return "ok", {}
+
+        manager = JobManager(slow, workers=1)
+        await manager.start()
+        first, second = manager.submit(b"a"), manager.submit(b"b")
+        await manager.stop(drain_timeout=5)
+        return manager.get(first.id), manager.get(second.id)
+
+    first, second = asyncio.run(scenario())
+    assert first.status == second.status == "done"
+
+
+def test_stop_fails_running_and_queued_jobs_so_they_expire(tmp_path):
+    from jobs import JobStore
+
+    async def scenario():
+        async def forever(pdf_bytes, progress):
+            await asyncio.Event().wait()
+
+        manager = JobManager(forever, workers=1, store=JobStore(str(tmp_path / "jobs.sqlite3")), result_ttl=10)
+        await manager.start()
+        running = manager.submit(b"a")
+        await asyncio.sleep(0.01)  # worker picks up the first job
+        queued = manager.submit(b"b")
+        await manager.stop()
+        return manager, [manager.store.load(job.id) for job in (running, queued)]
+
+    manager, jobs = asyncio.run(scenario())
+    for job in jobs:
+        assert job.status == "failed" and job.error.startswith("cancelled")
+        assert job.finished is not None
+    assert manager.expire(now=max(job.finished for job in jobs) + 11) == 2
+
+
+def test_shared_store_lets_another_process_see_the_job(tmp_path):
+    from jobs import JobStore
+
+    db = str(tmp_path / "jobs.sqlite3")
+
+    async def scenario():
+        # Two managers on one store stand in for two uvicorn workers
+        owner = JobManager(fake_process, workers=1, store=JobStore(db), result_ttl=10)
+        other = JobManager(fake_process, workers=1, store=JobStore(db), result_ttl=10)
+        await owner.start()
+        job = owner.submit(b"built three apis")
+        assert other.get(job.id).status in ("queued", "running")
+        await wait_finished(owner, job)
+        await owner.stop()
+        return other, job.id
+
+    other, job_id = asyncio.run(scenario())
+    seen = other.get(job_id)
+    assert seen.status == "done" and seen.result == "BUILT THREE APIS"
+    assert seen.to_dict()["progress"] == {"done": 3, "total": 3}
+    assert seen.stats == {"processed": 3}
+    assert other.expire(now=seen.finished + 11) == 1
+    assert other.get(job_id) is None
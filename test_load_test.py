@@ -0,0 +1,91 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from load_test import multipart_body, parse_mix, run_load, summarize
+
+
+class FakeUpload(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if b"slow" in body:
+            time.sleep(0.1)
+        status = 500 if b"broken" in body else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+def serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeUpload)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_helpers():
+    assert parse_mix("1:0.6,3:0.3,8") == [(1, 0.6), (3, 0.3), (8, 1.0)]
+    body, content_type = multipart_body("r.pdf", b"%PDF-1.4")
+    boundary = content_type.split("boundary=")[1]
+    assert body.startswith(f"--{boundary}\r\n".encode()) and body.endswith(f"--{boundary}--\r\n".encode())
+
+
+def test_closed_and_open_loop_runs_count_errors():
+    server = serve()
+    port = server.server_address[1]
+    pdfs = {"good": b"%PDF fine", "bad": b"%PDF broken"}
+    try:
+        closed = run_load(port, pdfs, [3, 1], concurrency=3, rate=None, requests=20, duration=0, timeout=5, seed=1)
+        opened = run_load(port, pdfs, [1, 0], concurrency=2, rate=200.0, requests=10, duration=0, timeout=5, seed=1)
+    finally:
+        server.shutdown()
+
+    summary = summarize(closed, elapsed=1.0)
+    assert summary["requests"] == 20
+    assert summary["errors"] == sum(r["pdf"] == "bad" for r in closed)
+    assert summary["error_kinds"] in ([], ["HTTP 500"])
+    assert summarize(opened, elapsed=1.0)["succeeded"] == 10
+
+
+def test_open_loop_latency_includes_waiting_for_a_client():
+    server = serve()
+    try:
+        results = run_load(server.server_address[1], {"slow": b"%PDF slow"}, [1], concurrency=1, rate=1000.0,
+                           requests=5, duration=0, timeout=5, seed=1)
+    finally:
+        server.shutdown()
+
+    # All five arrive within a few ms but one client serves them 0.1s apart
+    latencies = sorted(r["latency"] for r in results)
+    assert latencies[-1] >= 0.45
+
+
+def test_shared_mapping_is_split_in_pss(tmp_path):
+    """A file mapped by two processes counts fully in each RSS but only half in each PSS."""
+    from measure_memory import tree_memory
+
+    path = tmp_path / "weights.bin"
+    path.write_bytes(os.urandom(32 * 2**20))
+    script = (
+        "import mmap, sys, time\n"
+        "f = open(sys.argv[1], 'rb'); m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)\n"
+        "sum(m[i] for i in range(0, len(m), 4096)); print('ready', flush=True); time.sleep(30)\n"
+    )
+    children = [subprocess.Popen([sys.executable, "-c", script, str(path)], stdout=subprocess.PIPE) for _ in range(2)]
+    try:
+        for child in children:
+            assert child.stdout.readline().strip() == b"ready"
+        memory = tree_memory(os.getpid())
+        workers = [p for p in memory["processes"] if p["pid"] in {c.pid for c in children}]
+        assert all(p["rss"] > 32 for p in workers)
+        assert all(p["pss"] < p["rss"] - 12 for p in workers)
+    finally:
+        for child in children:
+            child.kill()
+            child.wait()
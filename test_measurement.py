@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+
+from measurement import peak_rss_mb, percentile, process_tree, read_memory, read_process
+
+
+def test_percentile():
+    assert percentile([5, 1, 3, 2, 4], 50) == 3
+    assert percentile([5, 1, 3, 2, 4], 100) == 5
+    assert percentile([], 99) == 0.0
+
+
+def test_proc_sampling_sees_children():
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(5)"])
+    try:
+        assert child.pid in process_tree(os.getpid())
+        cpu, rss = read_process(os.getpid())
+        assert cpu > 0 and rss > 0
+        memory = read_memory(os.getpid())
+        assert 0 < memory["uss"] <= memory["pss"] <= memory["rss"]
+        # The peak can only be at or above the current resident size
+        assert peak_rss_mb() >= rss / 2**20 * 0.99
+    finally:
+        child.kill()
+        child.wait()
@@ -0,0 +1,21 @@
+import json
+
+from enhancement_cache import model_fingerprint
+from model_loading import ARTIFACT_INFO, MERGED_WEIGHTS, active_model_dir
+
+
+def test_auto_mode_ignores_a_stale_merged_model(tmp_path):
+    adapter, merged = tmp_path / "lora", tmp_path / "merged"
+    adapter.mkdir()
+    merged.mkdir()
+    (adapter / "adapter_model.safetensors").write_bytes(b"adapter v1")
+    (merged / MERGED_WEIGHTS).write_bytes(b"merged v1")
+    (merged / ARTIFACT_INFO).write_text(json.dumps({"source_fingerprint": model_fingerprint(str(adapter))}))
+    assert active_model_dir(str(adapter), str(merged)) == str(merged)
+
+    # Retrained adapter: the export no longer matches it
+    (adapter / "adapter_model.safetensors").write_bytes(b"adapter v2")
+    assert active_model_dir(str(adapter), str(merged)) == str(adapter)
+
+    # Merged artifact shipped without the adapter it came from
+    assert active_model_dir(str(tmp_path / "missing"), str(merged)) == str(merged)
@@ -0,0 +1,83 @@
+from pdf_layout import reconstruct_items
+
+CHAR_W, SPACE_W, LINE_H = 5.0, 3.0, 10.0
+PAGE_W = 600.0
+
+
+def words_at(x0, top, text):
+    """pdfplumber-style word dicts for one physical line starting at (x0, top)."""
+    words = []
+    for token in text.split():
+        x1 = x0 + CHAR_W * len(token)
+        words.append({"text": token, "x0": x0, "x1": x1, "top": top, "bottom": top + LINE_H})
+        x0 = x1 + SPACE_W
+    return words
+
+
+def page(*lines):
+    return [w for x0, top, text in lines for w in words_at(x0, top, text)]
+
+
+def texts(words):
+    return [item.text for item in reconstruct_items(words, PAGE_W)]
+
+
+# Fills the line from x=40 to about x=560, the right edge of the text column
+LONG = "Designed and shipped a payment reconciliation service handling two million events"
+
+
+def test_wrapped_bullets_are_merged():
+    words = page(
+        (40, 100, "EXPERIENCE"),
+        (40, 114, "• " + LONG),
+        (48, 126, "per day with exactly-once delivery"),
+        (40, 140, "• Mentored two interns"),
+        (40, 154, "• " + LONG),
+        (48, 166, "across three regions"),
+    )
+    items = reconstruct_items(words, PAGE_W)
+    assert [item.text for item in items] == [
+        "EXPERIENCE",
+        "• " + LONG + " per day with exactly-once delivery",
+        "• Mentored two interns",
+        "• " + LONG + " across three regions",
+    ]
+    assert [item.lines for item in items] == [1, 2, 1, 2]
+
+
+def test_short_lines_and_gaps_are_not_merged():
+    assert texts(page(
+        (40, 100, "Python, FastAPI, PostgreSQL"),
+        (40, 112, "Docker, Kubernetes, Terraform"),
+        (40, 130, LONG),
+        (40, 160, "after a paragraph break"),
+    )) == ["Python, FastAPI, PostgreSQL", "Docker, Kubernetes, Terraform", LONG, "after a paragraph break"]
+
+
+def test_hanging_indent_must_match_bullet_text():
+    # The next line starts under the glyph, not under the text: a new item
+    assert texts(page((40, 100, "• " + LONG), (40, 112, "Unrelated line below"))) == [
+        "• " + LONG, "Unrelated line below"]
+
+
+def test_hyphenated_wrap_is_joined():
+    assert texts(page((40, 100, LONG + " de-"), (40, 112, "duplication jobs"))) == [
+        LONG + " de-duplication jobs"]
+
+
+def test_two_columns_are_read_separately():
+    sidebar = ["SKILLS", "Python", "SQL", "Docker"]
+    main = [
+        "Built data pipelines for a logistics",
+        "platform processing 5TB daily",
+        "Reduced cloud spend by 30 percent",
+    ]
+    lines = [(40, 100, "Alex Carter - Backend Engineer")]
+    for i in range(4):
+        lines.append((40, 120 + 12 * i, sidebar[i]))
+        if i < 3:
+            lines.append((250, 120 + 12 * i, main[i]))
+    assert texts(page(*lines)) == [
+        "Alex Carter - Backend Engineer", "SKILLS", "Python", "SQL", "Docker",
+        main[0] + " " + main[1], main[2],
+    ]
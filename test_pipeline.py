@@ -0,0 +1,129 @@
+import re
+from types import SimpleNamespace
+
+import pipeline
+from pipeline import Candidate, enhance_lines, enhance_tiered, format_output, new_stats, route_candidates
+from sections import DROP, ENHANCE, PASS
+from validation import NO_CHANGE
+
+EOS, PAD = 1, 0
+
+
+class FakeBackend:
+    """
+    Word-level stand-in for InferenceBackend. generate() "decodes" each input
+    back to its text (task prefix removed) and returns rewrite(text, kwargs, k)
+    for each of the num_return_sequences candidates k, next to each other like
+    transformers does. Every batch's input lengths are recorded in `calls`.
+    """
+
+    def __init__(self, rewrite=None):
+        self.tokenizer = SimpleNamespace(eos_token_id=EOS, pad_token_id=PAD)
+        self.rewrite = rewrite or (lambda text, kwargs, k: f"{text} #{k}")
+        self.vocab, self.words = {}, {}
+        self.calls = []
+
+    def tokenize_with_offsets(self, texts):
+        encoded, offsets = [], []
+        for text in texts:
+            ids, spans = [], []
+            for match in re.finditer(r"\S+", text):
+                ids.append(self.vocab.setdefault(match.group(), len(self.vocab) + 2))
+                self.words[ids[-1]] = match.group()
+                spans.append(match.span())
+            encoded.append(ids + [EOS])
+            offsets.append(spans + [(0, 0)])
+        return encoded, offsets
+
+    def generate(self, input_ids, **kwargs):
+        self.calls.append((kwargs.get("num_beams", 1), [len(ids) for ids in input_ids]))
+        sequences = []
+        for ids in input_ids:
+            text = " ".join(self.words[i] for i in ids if i != EOS)
+            text = text[len(pipeline.TASK_PREFIX):] if text.startswith(pipeline.TASK_PREFIX.strip()) else text
+            sequences.extend(self.rewrite(text, kwargs, k) for k in range(kwargs.get("num_return_sequences", 1)))
+        return sequences
+
+    def decode(self, sequences):
+        return list(sequences)
+
+    def count_tokens(self, sequences):
+        return [len(s.split()) for s in sequences]
+
+
+def test_enhance_lines_batches_by_length_and_keeps_input_order():
+    backend = FakeBackend()
+    texts = [" ".join(["word"] * n) + f" line{n}" for n in (9, 2, 14, 5, 1, 7, 3, 12, 4, 6)]
+    results = enhance_lines(backend, texts, {"num_beams": 2, "num_return_sequences": 2})
+
+    assert results == [[f"{t} #0", f"{t} #1"] for t in texts]
+    # Shortest inputs first, in batches of GEN_BATCH_SIZE
+    assert [len(lengths) for _, lengths in backend.calls] == [8, 2]
+    flat = [n for _, lengths in backend.calls for n in lengths]
+    assert flat == sorted(flat)
+
+
+def test_enhance_lines_joins_candidate_k_of_every_piece():
+    sentence = "Designed and shipped a reporting service used by every regional sales team each week."
+    long_line = " ".join([sentence] * 20)  # ~300 words, over MAX_INPUT_TOKENS
+    backend = FakeBackend(lambda text, kwargs, k: text.upper() if k else text.lower())
+    (candidates,) = enhance_lines(backend, [long_line], {"num_beams": 2, "num_return_sequences": 2})
+
+    assert sum(len(lengths) for _, lengths in backend.calls) > 1
+    assert all(n <= pipeline.MAX_INPUT_TOKENS for _, lengths in backend.calls for n in lengths)
+    assert candidates == [long_line.lower(), long_line.upper()]
+
+
+GOOD = {
+    "I made data pipelines using python": "Developed scalable data pipelines in Python, cutting processing time by 30%.",
+    "I helped customers with problems": "Resolved customer escalations and improved satisfaction scores by 15%.",
+}
+
+
+def test_enhance_tiered_escalates_only_rejected_lines():
+    easy, hard, hopeless = "I made data pipelines using python", "I helped customers with problems", "I did stuff at work"
+
+    def rewrite(text, kwargs, k):
+        if kwargs.get("num_beams", 1) == 1:
+            return GOOD[text] if text == easy else text  # greedy: unchanged output is rejected
+        return GOOD[text] if text == hard and k == 2 else text  # beam search: only the third hypothesis is good
+
+    backend = FakeBackend(rewrite)
+    results = enhance_tiered(backend, [easy, hard, hopeless])
+
+    assert results[0] == pipeline.Enhancement(GOOD[easy], True, 0, False)
+    assert results[1] == pipeline.Enhancement(GOOD[hard], True, 1, False)
+    assert not results[2].is_valid and results[2].tier == len(pipeline.DECODING_TIERS) - 1
+    assert results[2].reason == NO_CHANGE
+    # Tier 1 (beam search) only saw the two lines greedy decoding failed on
+    assert [len(lengths) for beams, lengths in backend.calls if beams > 1] == [2]
+
+
+def test_route_candidates_and_output():
+    candidates = [
+        Candidate(1, 1, "Led the migration of billing to a new platform", "experience", ENHANCE),
+        Candidate(1, 2, "Python, SQL, Kubernetes and Terraform tooling", "skills", PASS),
+        Candidate(1, 3, "Enjoy hiking and photography on weekends", "hobbies", DROP),
+        Candidate(1, 4, "Built dashboards for the finance team quarterly", "experience", ENHANCE, merged=2),
+        Candidate(1, 5, "Volunteer coordinator for the local food bank drive", "hobbies", DROP, merged=1),
+    ]
+    stats = new_stats()
+    kept, to_enhance = route_candidates(stats, candidates)
+
+    assert [c.line for c in kept] == [1, 2, 4]
+    assert to_enhance == [0, 2]
+    assert (stats["dropped"], stats["passed_through"], stats["generations_saved"]) == (2, 1, 3)
+    # Only wrapped lines of the lines sent to the model count as merged
+    assert stats["lines_merged"] == 2
+
+    results = [pipeline.Enhancement("Led a billing platform migration for 2M accounts.", True, 0, False),
+               None,
+               pipeline.Enhancement("rejected text", False, 1, False)]
+    chunks = format_output(stats, kept, results)
+    assert chunks[0] == ("ORIGINAL: Led the migration of billing to a new platform\n"
+                         "ENHANCED: Led a billing platform migration for 2M accounts.\n\n")
+    # Passed-through and rejected lines ship as written
+    assert chunks[1].endswith("ENHANCED: Python, SQL, Kubernetes and Terraform tooling\n\n")
+    assert chunks[2].endswith("ENHANCED: Built dashboards for the finance team quarterly\n\n")
+    assert "ENHANCEMENT STATISTICS" in chunks[-1] and "Wrapped lines merged:  2" in chunks[-1]
+    assert (stats["processed"], stats["accepted"], stats["rejected"]) == (2, 1, 1)
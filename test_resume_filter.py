@@ -1,4 +1,5 @@
-from resume_filter import filter_resume_text
+from legacy_reference import STRUCTURAL_LINES, legacy_filter_resume_text, legacy_is_relevant_chunk, synthetic_resume_lines
+from resume_filter import filter_resume_text, is_relevant_chunk, relevant_chunk_flags
 
 
 def test_filter_basic():
@@ -29,8 +30,23 @@ def test_filter_basic():
     assert "Technical developer with strong experience" in cleaned
 
 
+def test_relevant_chunk_flags_match_original():
+    lines = STRUCTURAL_LINES + synthetic_resume_lines(3000)
+    expected = [legacy_is_relevant_chunk(line) for line in lines]
+    assert [is_relevant_chunk(line) for line in lines] == expected
+    assert relevant_chunk_flags(lines) == expected
+    for min_words in (0, 1, 5):
+        assert relevant_chunk_flags(lines, min_words) == [legacy_is_relevant_chunk(l, min_words) for l in lines]
+
+
+def test_filter_resume_text_matches_original():
+    lines = STRUCTURAL_LINES + synthetic_resume_lines(2000, seed=1)
+    for start in range(0, len(lines), 40):
+        document = "\n".join(lines[start:start + 40])
+        assert filter_resume_text(document) == legacy_filter_resume_text(document)
+
+
 if __name__ == "__main__":
     # Quick manual run
     test_filter_basic()
     print("resume_filter test passed")
-
@@ -0,0 +1,55 @@
+import pytest
+
+from sections import DROP, ENHANCE, PASS, PREAMBLE, SectionTracker, label_sections, load_policy, route_for
+
+
+RESUME = [
+    "Alex Carter",
+    "Email: alex.carter@example.com",
+    "PROFESSIONAL SUMMARY",
+    "Backend developer with four years of experience building APIs",
+    "Work Experience:",
+    "Built payment services handling 2M requests a day",
+    "Education",
+    "B.Tech Computer Science, 2016 - 2020",
+    "Skills -",
+    "Python, FastAPI, PostgreSQL, Docker",
+    "Hobbies",
+    "Chess and long-distance running",
+]
+
+
+def test_lines_are_labelled_with_current_section():
+    assert label_sections(RESUME) == [
+        PREAMBLE, PREAMBLE,
+        "summary", "summary",
+        "experience", "experience",
+        "education", "education",
+        "skills", "skills",
+        "hobbies", "hobbies",
+    ]
+
+
+def test_inline_labels_do_not_open_sections():
+    tracker = SectionTracker()
+    tracker.observe("Experience")
+    assert tracker.observe("Skills: Python, SQL") == "experience"
+    assert tracker.observe("Education details available on request") == "experience"
+
+
+def test_default_routes():
+    assert route_for("experience") == ENHANCE
+    assert route_for(PREAMBLE) == PASS
+    assert route_for("education") == PASS
+    assert route_for("hobbies") == DROP
+    # Sections without a policy entry keep the old behaviour
+    assert route_for("volunteering") == ENHANCE
+
+
+def test_policy_overrides_and_validation():
+    policy = load_policy({"education": DROP, "skills": ENHANCE})
+    assert route_for("education", policy) == DROP
+    assert route_for("skills", policy) == ENHANCE
+    assert route_for("summary", policy) == ENHANCE
+    with pytest.raises(ValueError):
+        load_policy({"education": "rewrite"})
@@ -0,0 +1,74 @@
+import re
+
+from segmentation import join_segments, segment_line
+
+PREFIX = "enhance: "
+EOS = 1
+
+
+class PieceTokenizer:
+    """SentencePiece-like: words become pieces of up to 4 chars, the first carrying the preceding space ("▁")."""
+
+    def __init__(self):
+        self.vocab = {}
+
+    def __call__(self, text):
+        ids, offsets = [], []
+        for match in re.finditer(r"\s*\S{1,4}", text):
+            piece = "▁" + match.group().lstrip() if match.group()[0].isspace() or match.start() == 0 else match.group()
+            ids.append(self.vocab.setdefault(piece, len(self.vocab) + 2))
+            offsets.append(match.span())
+        return ids + [EOS], offsets + [(0, 0)]
+
+
+SUMMARY = (
+    "Backend engineer with six years of experience designing payment platforms. "
+    "Led a team of five engineers, mentoring two interns and owning the on-call rotation. "
+    "Migrated the monolith to event-driven services using Kafka, cutting p99 latency by 40%. "
+    "Introduced contract testing, which reduced integration incidents and sped up releases."
+)
+
+
+def segments_for(line, max_tokens, tokenizer=None):
+    tokenizer = tokenizer or PieceTokenizer()
+    text = PREFIX + line
+    ids, offsets = tokenizer(text)
+    return tokenizer, ids, segment_line(text, ids, offsets, len(PREFIX), max_tokens, EOS)
+
+
+def test_short_line_is_one_unchanged_segment():
+    _, ids, segments = segments_for("Built REST APIs with FastAPI", 128)
+    assert len(segments) == 1
+    assert segments[0].text == "Built REST APIs with FastAPI"
+    assert segments[0].input_ids == ids
+
+
+def test_long_line_is_cut_at_sentences_within_budget():
+    _, ids, segments = segments_for(SUMMARY, 40)
+    assert len(ids) > 40 and len(segments) > 1
+    assert all(len(s.input_ids) <= 40 for s in segments)
+    # Nothing is lost and the order is kept
+    assert join_segments([s.text for s in segments]) == SUMMARY
+    # Sentences that fit on their own are never split
+    assert all(s.text.endswith(".") for s in segments)
+
+
+def test_overlong_sentence_falls_back_to_clauses():
+    _, _, segments = segments_for(SUMMARY, 24)
+    assert all(len(s.input_ids) <= 24 for s in segments)
+    assert join_segments([s.text for s in segments]) == SUMMARY
+    assert any(s.text.endswith(",") for s in segments)
+
+
+def test_piece_ids_match_tokenizing_the_piece_alone():
+    tokenizer, _, segments = segments_for(SUMMARY, 40)
+    for segment in segments:
+        standalone, _ = tokenizer(PREFIX + segment.text)
+        assert segment.input_ids == standalone
+
+
+def test_unbreakable_text_is_cut_rather_than_truncated():
+    line = "x" * 400
+    _, _, segments = segments_for(line, 32)
+    assert all(len(s.input_ids) <= 32 for s in segments)
+    assert "".join(s.text for s in segments) == line
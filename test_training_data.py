@@ -0,0 +1,20 @@
+from training_data import cache_key, file_digest, read_pairs
+
+
+def test_read_pairs_skips_incomplete_rows(tmp_path):
+    csv_path = tmp_path / "train.csv"
+    csv_path.write_text("source,target\n i did stuff ,Delivered results\nno target,\n,no source\n")
+    assert read_pairs(str(csv_path)) == [("i did stuff", "Delivered results")]
+
+
+def test_cache_key_follows_file_contents_and_settings(tmp_path):
+    csv_path = tmp_path / "train.csv"
+    csv_path.write_text("source,target\na,b\n")
+    before = cache_key(file_digest(str(csv_path)), "t5-small", "128")
+    assert cache_key(file_digest(str(csv_path)), "t5-small", "128") == before
+    assert cache_key(file_digest(str(csv_path)), "t5-small", "64") != before
+
+    csv_path.write_text("source,target\na,c\n")
+    assert cache_key(file_digest(str(csv_path)), "t5-small", "128") != before
+    # Parts are separated, so shifting text between them changes the key
+    assert cache_key("ab", "c") != cache_key("a", "bc")
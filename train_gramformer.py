@@ -1,11 +1,16 @@
 # train_gramformer.py
+import json
 import os
+import time
 import pandas as pd
-from datasets import Dataset
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM, Seq2SeqTrainer, Seq2SeqTrainingArguments, DataCollatorForSeq2Seq
+from datasets import Dataset, load_from_disk
+from datasets.fingerprint import Hasher
+from transformers import AutoTokenizer, AutoModelForSeq2SeqLM, Seq2SeqTrainer, Seq2SeqTrainingArguments, DataCollatorForSeq2Seq, TrainerCallback
 import torch
 from peft import get_peft_config, get_peft_model, LoraConfig, TaskType
 
+from training_data import cache_key, file_digest
+
 # -------- CONFIG --------
 DATA_PATH = "data/overall_ds.csv"
 MODEL_NAME = "t5-small"        # small & fast; replace with larger if you have GPU
@@ -14,6 +19,13 @@ EPOCHS = 4
 BATCH_SIZE = 8                 # lower if you run out of memory
 LR = 3e-4
 MAX_LEN = 128
+TASK_PREFIX = "enhance: "
+# The tokenized dataset is cached on disk under TOKENIZED_CACHE_DIR, keyed by the
+# CSV contents, the tokenizer and the settings above
+TOKENIZED_CACHE_DIR = os.getenv("TOKENIZED_CACHE_DIR", "data/tokenized_cache")
+# "dynamic": pad each batch to its longest example and group similar lengths into batches;
+# "max_length": the previous setup (every example padded to MAX_LEN, random batches), for comparison
+PADDING = os.getenv("TRAIN_PADDING", "dynamic")
 
 # -------- load csv and normalize columns ----------
 df = pd.read_csv(DATA_PATH, encoding="ISO-8859-1")
@@ -25,29 +37,47 @@ df = df.rename(columns={
 df = df.dropna(subset=["source","target"]).reset_index(drop=True)
 
 # Add task prefix for T5 style
-df["source"] = "enhance: " + df["source"].astype(str).str.strip()
+df["source"] = TASK_PREFIX + df["source"].astype(str).str.strip()
 
 # convert pandas to HF dataset
-dataset = Dataset.from_pandas(df)
+dataset = Dataset.from_pandas(df[["source", "target"]])
 
 # -------- tokenizer & model ----------
 tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
 model = AutoModelForSeq2SeqLM.from_pretrained(MODEL_NAME)
 
-# -------- preprocess (non-batched to avoid nested lists issues) ----------
-def preprocess(example):
-    inp = tokenizer(example["source"], truncation=True, padding="max_length", max_length=MAX_LEN)
-    with tokenizer.as_target_tokenizer():
-        labels = tokenizer(example["target"], truncation=True, padding="max_length", max_length=MAX_LEN)
-    # convert pad token ids in labels to -100 for loss ignoring
-    labels_ids = [(lid if lid != tokenizer.pad_token_id else -100) for lid in labels["input_ids"]]
-    inp["labels"] = labels_ids
-    return inp
+# -------- preprocess (batched, cached) ----------
+# Padding is left to the data collator, which pads each batch only to its longest
+# example (labels with -100 so padding is ignored by the loss). One process: the
+# fast tokenizer already works on whole batches, and at ~1k rows worker startup
+# would cost more than it saves
+pad_to = "max_length" if PADDING == "max_length" else False
 
-dataset = dataset.map(preprocess)
+def preprocess(batch):
+    inp = tokenizer(batch["source"], truncation=True, padding=pad_to, max_length=MAX_LEN)
+    labels = tokenizer(text_target=batch["target"], truncation=True, padding=pad_to, max_length=MAX_LEN)
+    if pad_to:
+        # convert pad token ids in labels to -100 for loss ignoring
+        inp["labels"] = [[(lid if lid != tokenizer.pad_token_id else -100) for lid in ids] for ids in labels["input_ids"]]
+    else:
+        inp["labels"] = labels["input_ids"]
+    return inp
 
-# remove unnecessary columns, keep only features needed
-dataset = dataset.remove_columns([c for c in dataset.column_names if c not in ["input_ids","attention_mask","labels"]])
+tokenized_path = os.path.join(TOKENIZED_CACHE_DIR, cache_key(
+    file_digest(DATA_PATH), Hasher.hash(tokenizer), TASK_PREFIX, str(MAX_LEN), PADDING,
+))
+if os.path.isdir(tokenized_path):
+    dataset = load_from_disk(tokenized_path)
+    print("Loaded tokenized dataset from", tokenized_path)
+else:
+    start = time.perf_counter()
+    dataset = dataset.map(
+        preprocess,
+        batched=True,
+        remove_columns=dataset.column_names,  # keep only input_ids, attention_mask, labels
+    )
+    dataset.save_to_disk(tokenized_path)
+    print(f"Tokenized {len(dataset)} examples in {time.perf_counter() - start:.1f}s, cached in {tokenized_path}")
 
 # -------- PEFT LoRA config (efficient fine-tuning) ----------
 peft_config = LoraConfig(
@@ -71,20 +101,41 @@ training_args = Seq2SeqTrainingArguments(
     fp16=torch.cuda.is_available(),   # use fp16 if GPU available
     predict_with_generate=True,
     remove_unused_columns=False,
+    # Batches of similar-length examples, so dynamic padding has little left to pad
+    group_by_length=PADDING != "max_length",
 )
 
 data_collator = DataCollatorForSeq2Seq(tokenizer, model=model, label_pad_token_id=-100)
 
+class EpochTimer(TrainerCallback):
+    """Wall-clock seconds per training epoch, to compare padding setups (TRAIN_PADDING)."""
+
+    def __init__(self):
+        self.seconds = []
+
+    def on_epoch_begin(self, args, state, control, **kwargs):
+        self.start = time.perf_counter()
+
+    def on_epoch_end(self, args, state, control, **kwargs):
+        self.seconds.append(time.perf_counter() - self.start)
+        print(f"Epoch {len(self.seconds)}: {self.seconds[-1]:.1f}s (padding={PADDING})")
+
+epoch_timer = EpochTimer()
+
 trainer = Seq2SeqTrainer(
     model=model,
     args=training_args,
     train_dataset=dataset,
     tokenizer=tokenizer,
     data_collator=data_collator,
+    callbacks=[epoch_timer],
 )
 
 # -------- train ----------
 trainer.train()
+with open(os.path.join(OUTPUT_DIR, "epoch_times.json"), "w") as f:
+    json.dump({"padding": PADDING, "device": "cuda" if torch.cuda.is_available() else "cpu",
+               "examples": len(dataset), "batch_size": BATCH_SIZE, "epoch_seconds": epoch_timer.seconds}, f, indent=2)
 # save peft adapter + base tokenizer/config
 model.save_pretrained(OUTPUT_DIR)
 tokenizer.save_pretrained(OUTPUT_DIR)
@@ -0,0 +1,38 @@
+import csv
+import hashlib
+from typing import List, Optional, Tuple
+
+TRAIN_CSV = "data/train.csv"
+
+
+def read_pairs(path: str = TRAIN_CSV, limit: Optional[int] = None) -> List[Tuple[str, str]]:
+    """Reads (source, target) rows from a train.csv-style file, skipping incomplete rows."""
+    with open(path, encoding="utf-8") as f:
+        pairs = [
+            (row["source"].strip(), row["target"].strip())
+            for row in csv.DictReader(f)
+            if row.get("source") and row.get("target")
+        ]
+    return pairs[:limit] if limit else pairs
+
+
+def read_sources(path: str = TRAIN_CSV, limit: Optional[int] = None) -> List[str]:
+    """The raw, un-enhanced sentences of a train.csv-style file."""
+    return [source for source, _ in read_pairs(path, limit)]
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """sha256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(*parts: str) -> str:
+    """Short, stable name for a cache entry derived from everything that shapes its contents."""
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+__all__ = ["TRAIN_CSV", "cache_key", "file_digest", "read_pairs", "read_sources"]
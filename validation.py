@@ -0,0 +1,168 @@
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Rejection reasons reported in ValidationResult.reason
+NO_CHANGE = "no_change"
+MINIMAL_MODIFICATION = "minimal_modification"
+REPETITION = "repetition"
+DUPLICATE_LIST_ITEM = "duplicate_list_item"
+REPEATED_TERM = "repeated_term"
+TOO_SHORT = "too_short"
+TOO_LONG = "too_long"
+
+REJECTION_REASONS = (
+    NO_CHANGE,
+    MINIMAL_MODIFICATION,
+    REPETITION,
+    DUPLICATE_LIST_ITEM,
+    REPEATED_TERM,
+    TOO_SHORT,
+    TOO_LONG,
+)
+
+# Version of the rules in check_enhancement. Cached verdicts are keyed by it (see
+# EnhancementCache), so bump it whenever a rule changes to have them re-validated
+VALIDATOR_VERSION = 1
+
+
+class ValidationResult(NamedTuple):
+    is_valid: bool
+    reason: Optional[str] = None  # one of REJECTION_REASONS when rejected
+    detail: str = ""
+
+
+ACCEPTED = ValidationResult(True)
+
+
+def _find_repeated_phrase(words: List[str]) -> Optional[str]:
+    """
+    Returns the first 4-word phrase (longer than 15 chars) that occurs again
+    later in the text, or None.
+
+    Equivalent to testing `phrase in ' '.join(words[i+4:])` for every i. Since
+    words contain no spaces, a substring hit lines up with four consecutive
+    words whose middle two equal the phrase's, the first ending with and the
+    last starting with the phrase's outer words. So every window of four words
+    is hashed once under each (suffix, middle, middle, prefix) form whose outer
+    parts are themselves words of the text, keeping the last position of each;
+    a phrase repeats if that position is at least four words after it.
+    """
+    vocabulary = set(words)
+    suffixes = {w: [w[k:] for k in range(len(w)) if w[k:] in vocabulary] for w in vocabulary}
+    prefixes = {w: [w[:k] for k in range(1, len(w) + 1) if w[:k] in vocabulary] for w in vocabulary}
+
+    last: Dict[Tuple[str, str, str, str], int] = {}
+    for j in range(len(words) - 3):
+        second, third = words[j + 1], words[j + 2]
+        for first in suffixes[words[j]]:
+            for fourth in prefixes[words[j + 3]]:
+                last[(first, second, third, fourth)] = j
+
+    for i in range(len(words) - 7):
+        phrase = tuple(words[i:i + 4])
+        # Only check substantial phrases
+        if sum(len(word) for word in phrase) + 3 <= 15:
+            continue
+        if last.get(phrase, -1) >= i + 4:
+            return " ".join(phrase)
+    return None
+
+
+def check_enhancement(original: str, enhanced: str) -> ValidationResult:
+    """
+    Validates if the enhanced text is actually an improvement.
+    Rejected (with the reason) if:
+    - Enhanced is identical or too similar to original
+    - Enhanced contains repetitive patterns
+    - Enhanced is suspiciously short or long
+    """
+    original_clean = original.strip().lower()
+    enhanced_clean = enhanced.strip().lower()
+
+    # Check 1: No change or minimal change
+    if original_clean == enhanced_clean:
+        return ValidationResult(False, NO_CHANGE, "No change from original")
+
+    # Check 2: Enhanced text is just a substring or slightly modified
+    if original_clean in enhanced_clean and len(enhanced_clean) < len(original_clean) * 1.2:
+        return ValidationResult(False, MINIMAL_MODIFICATION, "Minimal modification")
+
+    # Check 3: Detect repetitive patterns (same 4+ word phrase repeated)
+    words = enhanced_clean.split()
+    if len(words) > 6:
+        phrase = _find_repeated_phrase(words)
+        if phrase is not None:
+            return ValidationResult(False, REPETITION, f"Contains repetition - '{phrase}' appears multiple times")
+
+    # Check 4: Detect comma-separated list repetitions (like "CSS, HTML, CSS, HTML")
+    if ',' in enhanced:
+        # Remove "and" from last item if present
+        items = [item.strip().lower().replace(' and ', '').strip() for item in enhanced.split(',')]
+        counts = Counter(items)
+        if len(counts) != len(items):
+            duplicate = next(item for item in items if counts[item] > 1)
+            return ValidationResult(False, DUPLICATE_LIST_ITEM, f"Duplicate items in list: {duplicate}")
+
+    # Check 4b: Detect repeated technical terms (words before parentheses)
+    # Look for patterns like "Python (...)" appearing multiple times
+    words_before_paren = []
+    for i, word in enumerate(words):
+        if '(' in word or (i < len(words) - 1 and words[i + 1].startswith('(')):
+            clean = word.replace(':', '').replace(',', '').replace('-', '').strip()
+            if clean and not clean.startswith('('):
+                words_before_paren.append(clean)
+    if words_before_paren and len(words_before_paren) != len(set(words_before_paren)):
+        return ValidationResult(False, REPEATED_TERM, "Repeated technical term before parentheses")
+
+    # Check 5: Too short (less than 10 chars) or suspiciously long (>6x original)
+    if len(enhanced.strip()) < 10:
+        return ValidationResult(False, TOO_SHORT, "Enhanced text too short")
+
+    # Be more lenient with length - training data shows good enhancements can be 5-6x longer
+    if len(enhanced) > len(original) * 6:
+        return ValidationResult(
+            False, TOO_LONG, f"Enhanced text suspiciously long ({len(enhanced)} vs {len(original)} chars)"
+        )
+
+    # All checks passed
+    return ACCEPTED
+
+
+def is_valid_enhancement(original: str, enhanced: str) -> bool:
+    """Boolean form of check_enhancement."""
+    return check_enhancement(original, enhanced).is_valid
+
+
+def validate_batch(pairs: Iterable[Tuple[str, str]]) -> List[ValidationResult]:
+    """Validates many (original, enhanced) pairs; one ValidationResult per pair, in order."""
+    return [check_enhancement(original, enhanced) for original, enhanced in pairs]
+
+
+def select_enhancement(original: str, candidates: List[str]) -> Tuple[str, ValidationResult]:
+    """
+    Picks the best valid candidate for `original`.
+
+    Candidates are expected in model score order (as returned by beam search),
+    so the first one that passes validation wins. If none does, the top
+    candidate is returned with its rejected verdict so callers can fall back
+    and report why.
+    """
+    candidates = [c for c in dict.fromkeys(candidates) if c]
+    if not candidates:
+        return "", ValidationResult(False)
+    verdicts = validate_batch((original, c) for c in candidates)
+    for candidate, result in zip(candidates, verdicts):
+        if result.is_valid:
+            return candidate, result
+    return candidates[0], verdicts[0]
+
+
+__all__ = [
+    "REJECTION_REASONS",
+    "VALIDATOR_VERSION",
+    "ValidationResult",
+    "check_enhancement",
+    "is_valid_enhancement",
+    "select_enhancement",
+    "validate_batch",
+]